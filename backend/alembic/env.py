@@ -12,6 +12,7 @@ sys.path.append(str(Path(__file__).parent.parent))
 # Import your models
 from app.database import Base
 from app.models import *  # This imports all models
+from app.services.partition_service import PARTITIONED_TABLES
 
 # this is the Alembic Config object
 config = context.config
@@ -30,6 +31,12 @@ config.set_main_option("sqlalchemy.url", sync_database_url)
 # Model metadata
 target_metadata = Base.metadata
 
+def include_name(name, type_, parent_names):
+    """Leave the monthly partitions (and detached archives) out of autogenerate"""
+    if type_ == "table" and name not in target_metadata.tables:
+        return not any(name.startswith(f"{table}_") for table in PARTITIONED_TABLES)
+    return True
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
     url = config.get_main_option("sqlalchemy.url")
@@ -53,7 +60,8 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection, target_metadata=target_metadata,
+            include_name=include_name
         )
 
         with context.begin_transaction():
@@ -0,0 +1,50 @@
+"""Add regrade jobs
+
+Revision ID: b3c1d2e4f5a6
+Revises: 9f7af4359136
+Create Date: 2026-10-17 22:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3c1d2e4f5a6'
+down_revision: Union[str, Sequence[str], None] = '9f7af4359136'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('regrade_jobs',
+    sa.Column('question_ids', sa.JSON(), nullable=False),
+    sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='regradestatus'), nullable=False),
+    sa.Column('last_response_id', sa.Integer(), nullable=False),
+    sa.Column('total_responses', sa.Integer(), nullable=False),
+    sa.Column('processed_responses', sa.Integer(), nullable=False),
+    sa.Column('changed_responses', sa.Integer(), nullable=False),
+    sa.Column('sessions_rebuilt', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('requested_by', sa.Integer(), nullable=True),
+    sa.Column('started_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['requested_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_regrade_jobs_id'), 'regrade_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_regrade_jobs_status'), 'regrade_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_regrade_jobs_status'), table_name='regrade_jobs')
+    op.drop_index(op.f('ix_regrade_jobs_id'), table_name='regrade_jobs')
+    op.drop_table('regrade_jobs')
+    sa.Enum(name='regradestatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,189 @@
+"""Partition audit_log and user_responses by month
+
+Revision ID: c4e5f6a7b8c9
+Revises: b3c1d2e4f5a6
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e5f6a7b8c9'
+down_revision: Union[str, Sequence[str], None] = 'b3c1d2e4f5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Monthly partitions created ahead of today; scripts/manage_partitions.py
+# keeps extending the window afterwards
+MONTHS_AHEAD = 3
+
+USER_RESPONSE_COLUMNS = (
+    "id, session_id, question_id, response_time, time_spent_seconds, dont_know, score_earned"
+)
+AUDIT_LOG_COLUMNS = (
+    "id, user_id, action, entity_type, entity_id, old_values, new_values, "
+    "ip_address, user_agent, created_at"
+)
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _set_aside(table: str, constraints: Sequence[str], indexes: Sequence[str]) -> None:
+    """Rename a table and its constraint/index names so the new table can reuse them"""
+    op.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
+    for name in constraints:
+        op.execute(f"ALTER TABLE {table}_old RENAME CONSTRAINT {name} TO {name}_old")
+    for name in indexes:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_old")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+
+
+def _create_partitions(table: str, key: str) -> None:
+    """Monthly partitions covering existing rows up to MONTHS_AHEAD, plus a default"""
+    oldest = op.get_bind().execute(
+        sa.text(f"SELECT min({key}) FROM {table}_old")
+    ).scalar()
+    this_month = date.today().replace(day=1)
+    month = min(oldest.date().replace(day=1), this_month) if oldest else this_month
+    last = _add_months(this_month, MONTHS_AHEAD)
+    while month <= last:
+        following = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{month}') TO ('{following}')"
+        )
+        month = following
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def _move_rows(table: str, columns: str) -> None:
+    op.execute(f"INSERT INTO {table} ({columns}) SELECT {columns} FROM {table}_old")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.drop_table(f"{table}_old")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A foreign key to a partitioned table must cover its whole primary key
+    op.drop_constraint(
+        'response_answers_user_response_id_fkey', 'response_answers', type_='foreignkey'
+    )
+
+    _set_aside(
+        'user_responses',
+        ['user_responses_pkey', 'unique_session_question',
+         'user_responses_question_id_fkey', 'user_responses_session_id_fkey'],
+        ['ix_user_responses_id']
+    )
+    op.create_table('user_responses',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('user_responses_id_seq')"), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('response_time', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('time_spent_seconds', sa.Integer(), nullable=False),
+    sa.Column('dont_know', sa.Boolean(), nullable=False),
+    sa.Column('score_earned', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], name='user_responses_question_id_fkey'),
+    sa.ForeignKeyConstraint(['session_id'], ['assessment_sessions.id'], name='user_responses_session_id_fkey'),
+    sa.PrimaryKeyConstraint('id', 'response_time'),
+    sa.UniqueConstraint('session_id', 'question_id', 'response_time', name='unique_session_question'),
+    postgresql_partition_by='RANGE (response_time)'
+    )
+    op.create_index(op.f('ix_user_responses_id'), 'user_responses', ['id'], unique=False)
+    _create_partitions('user_responses', 'response_time')
+    _move_rows('user_responses', USER_RESPONSE_COLUMNS)
+
+    _set_aside(
+        'audit_log',
+        ['audit_log_pkey', 'audit_log_user_id_fkey'],
+        ['ix_audit_log_created_at', 'ix_audit_log_id']
+    )
+    op.create_table('audit_log',
+    sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('audit_log_id_seq')"), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(length=100), nullable=False),
+    sa.Column('entity_type', sa.String(length=50), nullable=True),
+    sa.Column('entity_id', sa.Integer(), nullable=True),
+    sa.Column('old_values', sa.JSON(), nullable=True),
+    sa.Column('new_values', sa.JSON(), nullable=True),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.Column('user_agent', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='audit_log_user_id_fkey'),
+    sa.PrimaryKeyConstraint('id', 'created_at'),
+    postgresql_partition_by='RANGE (created_at)'
+    )
+    op.create_index(op.f('ix_audit_log_created_at'), 'audit_log', ['created_at'], unique=False)
+    op.create_index(op.f('ix_audit_log_id'), 'audit_log', ['id'], unique=False)
+    _create_partitions('audit_log', 'created_at')
+    _move_rows('audit_log', AUDIT_LOG_COLUMNS)
+
+
+def downgrade() -> None:
+    """Downgrade schema.
+
+    Only rows of attached partitions are copied back; detached partitions
+    are left alone as standalone tables.
+    """
+    _set_aside(
+        'audit_log',
+        ['audit_log_pkey', 'audit_log_user_id_fkey'],
+        ['ix_audit_log_created_at', 'ix_audit_log_id']
+    )
+    op.create_table('audit_log',
+    sa.Column('id', sa.BigInteger(), server_default=sa.text("nextval('audit_log_id_seq')"), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(length=100), nullable=False),
+    sa.Column('entity_type', sa.String(length=50), nullable=True),
+    sa.Column('entity_id', sa.Integer(), nullable=True),
+    sa.Column('old_values', sa.JSON(), nullable=True),
+    sa.Column('new_values', sa.JSON(), nullable=True),
+    sa.Column('ip_address', sa.String(length=45), nullable=True),
+    sa.Column('user_agent', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], name='audit_log_user_id_fkey'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_audit_log_created_at'), 'audit_log', ['created_at'], unique=False)
+    op.create_index(op.f('ix_audit_log_id'), 'audit_log', ['id'], unique=False)
+    _move_rows('audit_log', AUDIT_LOG_COLUMNS)
+
+    _set_aside(
+        'user_responses',
+        ['user_responses_pkey', 'unique_session_question',
+         'user_responses_question_id_fkey', 'user_responses_session_id_fkey'],
+        ['ix_user_responses_id']
+    )
+    op.create_table('user_responses',
+    sa.Column('id', sa.Integer(), server_default=sa.text("nextval('user_responses_id_seq')"), nullable=False),
+    sa.Column('session_id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('response_time', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('time_spent_seconds', sa.Integer(), nullable=False),
+    sa.Column('dont_know', sa.Boolean(), nullable=False),
+    sa.Column('score_earned', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], name='user_responses_question_id_fkey'),
+    sa.ForeignKeyConstraint(['session_id'], ['assessment_sessions.id'], name='user_responses_session_id_fkey'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('session_id', 'question_id', name='unique_session_question')
+    )
+    op.create_index(op.f('ix_user_responses_id'), 'user_responses', ['id'], unique=False)
+    _move_rows('user_responses', USER_RESPONSE_COLUMNS)
+
+    # Answers of responses in dropped or detached partitions cannot be kept
+    op.execute(
+        "DELETE FROM response_answers ra WHERE NOT EXISTS "
+        "(SELECT 1 FROM user_responses ur WHERE ur.id = ra.user_response_id)"
+    )
+    op.create_foreign_key(
+        'response_answers_user_response_id_fkey', 'response_answers',
+        'user_responses', ['user_response_id'], ['id']
+    )
@@ -0,0 +1,91 @@
+"""Add composite and partial indexes for the service query paths
+
+Revision ID: d5f6a7b8c9d0
+Revises: c4e5f6a7b8c9
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f6a7b8c9d0'
+down_revision: Union[str, Sequence[str], None] = 'c4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial predicate) on regular tables, built
+# CONCURRENTLY so writes are not blocked.
+# user_responses.session_id and response_answers.user_response_id are
+# already the leading columns of unique_session_question and
+# unique_response_answer.
+INDEXES = [
+    ('ix_questions_active_lookup', 'questions',
+     ['sub_theme_id', 'difficulty_level', 'question_type', 'id'], 'is_active'),
+    ('ix_answer_options_question_id', 'answer_options', ['question_id', 'display_order'], None),
+    ('ix_sub_themes_category_id', 'sub_themes', ['category_id', 'display_order'], None),
+    ('ix_question_tag_mapping_tag_id', 'question_tag_mapping', ['tag_id'], None),
+    ('ix_response_answers_answer_option_id', 'response_answers', ['answer_option_id'], None),
+]
+
+# Superseded by ix_questions_active_lookup
+SINGLE_COLUMN_INDEXES = [
+    ('ix_questions_is_active', 'questions', ['is_active']),
+    ('ix_questions_question_type', 'questions', ['question_type']),
+]
+
+
+def _partitions(table: str) -> list:
+    return list(op.get_bind().execute(sa.text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = CAST(:table AS regclass) AND c.relkind = 'r'"
+    ), {"table": table}).scalars())
+
+
+def _create_partitioned_index(name: str, table: str, columns: Sequence[str]) -> None:
+    """Index every partition concurrently, then attach them to a parent index
+
+    CREATE INDEX on a partitioned table cannot run CONCURRENTLY and would
+    lock all partitions for the whole build.
+    """
+    column_list = ", ".join(columns)
+    op.execute(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY {table} ({column_list})")
+    for partition in _partitions(table):
+        partition_index = f"{partition}_{'_'.join(columns)}_idx"[:63]
+        op.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {partition_index} "
+            f"ON {partition} ({column_list})"
+        )
+        op.execute(f"ALTER INDEX {name} ATTACH PARTITION {partition_index}")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+        _create_partitioned_index(
+            'ix_user_responses_question_id', 'user_responses', ['question_id', 'id']
+        )
+        for name, table, _ in SINGLE_COLUMN_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in SINGLE_COLUMN_INDEXES:
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True, if_not_exists=True
+            )
+        op.drop_index('ix_user_responses_question_id', table_name='user_responses', if_exists=True)
+        for name, table, _, _ in INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
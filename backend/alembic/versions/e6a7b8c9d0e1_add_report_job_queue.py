@@ -0,0 +1,68 @@
+"""Turn assessment_reports into a report job queue
+
+Revision ID: e6a7b8c9d0e1
+Revises: d5f6a7b8c9d0
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6a7b8c9d0e1'
+down_revision: Union[str, Sequence[str], None] = 'd5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+report_status = sa.Enum('PENDING', 'RUNNING', 'COMPLETED', 'FAILED', name='reportstatus')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    report_status.create(op.get_bind(), checkfirst=True)
+    # Reports that already exist were generated synchronously
+    op.add_column('assessment_reports', sa.Column('status', report_status, server_default='COMPLETED', nullable=False))
+    op.alter_column('assessment_reports', 'status', server_default=None)
+    op.add_column('assessment_reports', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.alter_column('assessment_reports', 'attempts', server_default=None)
+    op.add_column('assessment_reports', sa.Column('error', sa.Text(), nullable=True))
+    op.add_column('assessment_reports', sa.Column('requested_by', sa.Integer(), nullable=True))
+    op.add_column('assessment_reports', sa.Column('started_at', sa.DateTime(), nullable=True))
+    op.add_column('assessment_reports', sa.Column('finished_at', sa.DateTime(), nullable=True))
+    op.alter_column('assessment_reports', 'generated_at', nullable=True, server_default=None)
+    op.add_column('assessment_reports', sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+    op.add_column('assessment_reports', sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False))
+    op.create_foreign_key(
+        'assessment_reports_requested_by_fkey', 'assessment_reports', 'users',
+        ['requested_by'], ['id']
+    )
+    op.create_unique_constraint(
+        'unique_session_report_type', 'assessment_reports', ['session_id', 'report_type']
+    )
+    op.create_index(
+        'ix_assessment_reports_queue', 'assessment_reports', ['id'], unique=False,
+        postgresql_where=sa.text("status IN ('PENDING', 'RUNNING')")
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_assessment_reports_queue', table_name='assessment_reports')
+    op.drop_constraint('unique_session_report_type', 'assessment_reports', type_='unique')
+    op.drop_constraint('assessment_reports_requested_by_fkey', 'assessment_reports', type_='foreignkey')
+    op.drop_column('assessment_reports', 'updated_at')
+    op.drop_column('assessment_reports', 'created_at')
+    op.execute("UPDATE assessment_reports SET generated_at = now() WHERE generated_at IS NULL")
+    op.alter_column(
+        'assessment_reports', 'generated_at', nullable=False, server_default=sa.text('now()')
+    )
+    op.drop_column('assessment_reports', 'finished_at')
+    op.drop_column('assessment_reports', 'started_at')
+    op.drop_column('assessment_reports', 'requested_by')
+    op.drop_column('assessment_reports', 'error')
+    op.drop_column('assessment_reports', 'attempts')
+    op.drop_column('assessment_reports', 'status')
+    report_status.drop(op.get_bind(), checkfirst=True)
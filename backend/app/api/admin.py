@@ -0,0 +1,159 @@
+from typing import Annotated, List, Optional
+from fastapi import APIRouter, Depends, BackgroundTasks, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, engine
+from app.schemas import (
+    UserResponse, UserStatusUpdate, UserRoleUpdate,
+    RegradeJobCreate, RegradeJobResponse
+)
+from app.services.auth_service import AuthService
+from app.core.dependencies import get_admin_user
+from app.core.user_cache import user_auth_cache
+from app.core.password_hasher import password_hasher
+from app.core.revocation import token_denylist
+from app.core.audit import audit_writer
+from app.services.artifact_store import artifact_store
+from app.cache import cache_stats
+from app.db_metrics import pool_stats
+from app.services.response_buffer import response_buffer
+from app.services.regrade_service import RegradeService
+from app.services.question_pool import question_pool
+from app.services.question_payloads import question_payloads
+from app.models import User, RegradeStatus
+
+router = APIRouter()
+
+@router.put("/users/{user_id}/status", response_model=UserResponse)
+async def set_user_status(
+    user_id: int,
+    status_data: UserStatusUpdate,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """Activate or deactivate a user (Admin only)"""
+    return await AuthService.set_user_active(
+        db, user_id, status_data.is_active
+    )
+
+@router.put("/users/{user_id}/role", response_model=UserResponse)
+async def set_user_role(
+    user_id: int,
+    role_data: UserRoleUpdate,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """Change a user's role (Admin only)"""
+    return await AuthService.set_user_role(db, user_id, role_data.role)
+
+@router.get("/stats/user-cache")
+async def get_user_cache_stats(
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """Hit/miss counters of this worker's authenticated user cache (Admin only)"""
+    return user_auth_cache.stats()
+
+@router.get("/stats/token-denylist")
+async def get_token_denylist_stats(
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """Sync position and bloom filter size of this worker's token denylist (Admin only)"""
+    return token_denylist.stats()
+
+@router.get("/stats/cache")
+async def get_cache_stats(
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """Hit/miss counters of this worker's shared cache namespaces (Admin only)"""
+    return cache_stats()
+
+@router.get("/stats/response-buffer")
+async def get_response_buffer_stats(
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """Pending and flushed answer counts of this worker's buffer (Admin only)"""
+    return response_buffer.stats()
+
+@router.get("/stats/password-hasher")
+async def get_password_hasher_stats(
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """bcrypt pool saturation and latency of this worker (Admin only)"""
+    return password_hasher.stats()
+
+@router.get("/stats/question-pool")
+async def get_question_pool_stats(
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """Size of this worker's in-memory question pools (Admin only)"""
+    return question_pool.stats()
+
+@router.get("/stats/question-payloads")
+async def get_question_payload_stats(
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """Hit/miss counters of this worker's pre-rendered question payloads (Admin only)"""
+    return question_payloads.stats()
+
+@router.get("/stats/db-pool")
+async def get_db_pool_stats(
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """Connection pool occupancy and checkout wait times of this worker (Admin only)"""
+    return pool_stats(engine)
+
+@router.get("/stats/audit")
+async def get_audit_stats(
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """Queue depth, write and spill counters of this worker's audit writer (Admin only)"""
+    return audit_writer.stats()
+
+@router.get("/stats/artifacts")
+async def get_artifact_stats(
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """Size and hit/eviction counters of this worker's report artifact store (Admin only)"""
+    return artifact_store.stats()
+
+@router.post("/regrade-jobs", response_model=RegradeJobResponse, status_code=202)
+async def create_regrade_job(
+    job_data: RegradeJobCreate,
+    background_tasks: BackgroundTasks,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """Re-grade every stored response to the given questions (Admin only)"""
+    job = await RegradeService.create_job(db, job_data.question_ids, admin_user.id)
+    background_tasks.add_task(RegradeService.run_job, job.id)
+    return job
+
+@router.get("/regrade-jobs", response_model=List[RegradeJobResponse])
+async def get_regrade_jobs(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    admin_user: Annotated[User, Depends(get_admin_user)],
+    status: Optional[RegradeStatus] = None,
+    limit: int = Query(50, ge=1, le=500)
+):
+    """List re-grade jobs, most recent first (Admin only)"""
+    return await RegradeService.get_jobs(db, status, limit)
+
+@router.get("/regrade-jobs/{job_id}", response_model=RegradeJobResponse)
+async def get_regrade_job(
+    job_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """Progress of a re-grade job (Admin only)"""
+    return await RegradeService.get_job(db, job_id)
+
+@router.post("/regrade-jobs/{job_id}/resume", response_model=RegradeJobResponse, status_code=202)
+async def resume_regrade_job(
+    job_id: int,
+    background_tasks: BackgroundTasks,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    admin_user: Annotated[User, Depends(get_admin_user)]
+):
+    """Resume a failed or interrupted re-grade job from its checkpoint (Admin only)"""
+    job = await RegradeService.get_job(db, job_id)
+    background_tasks.add_task(RegradeService.run_job, job.id)
+    return job
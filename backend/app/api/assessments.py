@@ -0,0 +1,152 @@
+from typing import Annotated
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.schemas import (
+    AssessmentStart, AnswerSubmit, AssessmentProgress, AssessmentComplete,
+    ReportRequest, AssessmentReportResponse
+)
+from app.services.assessment_service import AssessmentService
+from app.services.report_service import ReportService
+from app.services.artifact_store import artifact_store
+from app.core.dependencies import get_current_active_user
+from app.core.responses import ArtifactFileResponse
+from app.config import get_settings
+from app.models import User, ReportType, ReportStatus
+
+router = APIRouter()
+settings = get_settings()
+
+# Progress bodies are pre-serialized by AssessmentService; response_model
+# only documents them
+def _progress_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
+
+@router.post("/", response_model=AssessmentProgress)
+async def start_assessment(
+    start_data: AssessmentStart,
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)]
+):
+    """Start a new assessment"""
+    return _progress_response(await AssessmentService.start_assessment(
+        db,
+        current_user.id,
+        start_data,
+        ip_address=request.client.host if request.client else None,
+        user_agent=request.headers.get("user-agent")
+    ))
+
+@router.get("/{session_id}", response_model=AssessmentProgress)
+async def get_assessment_progress(
+    session_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)]
+):
+    """Get progress and the current question of an assessment"""
+    return _progress_response(
+        await AssessmentService.get_progress(db, session_id, current_user.id)
+    )
+
+@router.post("/{session_id}/answers", response_model=AssessmentProgress)
+async def submit_answer(
+    session_id: int,
+    answer: AnswerSubmit,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)]
+):
+    """Submit the answer to the current question"""
+    return _progress_response(await AssessmentService.submit_answer(
+        db, session_id, current_user.id, answer
+    ))
+
+@router.post("/{session_id}/complete", response_model=AssessmentComplete)
+async def complete_assessment(
+    session_id: int,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)]
+):
+    """Finish an assessment"""
+    return await AssessmentService.complete_assessment(
+        db, session_id, current_user.id
+    )
+
+def _report_location(session_id: int, report_type: ReportType) -> str:
+    return f"/api/assessments/{session_id}/reports/{report_type.value}"
+
+@router.post(
+    "/{session_id}/reports",
+    response_model=AssessmentReportResponse,
+    status_code=status.HTTP_202_ACCEPTED
+)
+async def request_report(
+    session_id: int,
+    report_request: ReportRequest,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)]
+):
+    """Queue a report of a completed assessment; poll the Location to fetch it"""
+    report = await ReportService.request_report(
+        db, session_id, report_request.report_type, current_user,
+        regenerate=report_request.regenerate
+    )
+    response.headers["Location"] = _report_location(session_id, report.report_type)
+    return report
+
+@router.get("/{session_id}/reports/{report_type}", response_model=AssessmentReportResponse)
+async def get_report(
+    session_id: int,
+    report_type: ReportType,
+    response: Response,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)],
+    wait: float = Query(0, ge=0, le=settings.report_long_poll_max_seconds)
+):
+    """Get a report; ``wait`` long-polls until it is built (202 while it is not)"""
+    report = await ReportService.get_report(
+        db, session_id, report_type, current_user, wait=wait
+    )
+    if report.status not in (ReportStatus.COMPLETED, ReportStatus.FAILED):
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers["Retry-After"] = str(max(int(settings.report_poll_interval_seconds), 1))
+    return report
+
+@router.get("/{session_id}/reports/{report_type}/pdf", response_class=FileResponse)
+async def download_report_pdf(
+    session_id: int,
+    report_type: ReportType,
+    request: Request,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[User, Depends(get_current_active_user)]
+):
+    """Download a completed report as PDF (ETag, Range and If-Range supported)"""
+    report = await ReportService.get_completed_report(db, session_id, report_type, current_user)
+    # Content-addressed: the key changes whenever the bytes could
+    key = ReportService.pdf_key(report)
+    headers = {
+        "ETag": f'"{key}"',
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    if any(tag.strip().removeprefix("W/") in (headers["ETag"], "*") for tag in if_none_match.split(",")):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    path = await ReportService.get_report_pdf(db, report, key)
+
+    filename = f"assessment-{session_id}-{report_type.value}.pdf"
+    if settings.artifact_accel_redirect_prefix:
+        # nginx streams the file itself with sendfile
+        relative = path.relative_to(artifact_store.root).as_posix()
+        headers["X-Accel-Redirect"] = settings.artifact_accel_redirect_prefix.rstrip("/") + "/" + relative
+        headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return Response(media_type="application/pdf", headers=headers)
+    return ArtifactFileResponse(
+        path,
+        recreate=lambda: ReportService.render_pdf(report, key),
+        media_type="application/pdf",
+        filename=filename,
+        headers=headers
+    )
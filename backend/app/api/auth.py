@@ -1,12 +1,15 @@
-from typing import Annotated
+from typing import Annotated, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas import UserCreate, UserResponse, Token
 from app.services.auth_service import AuthService
-from app.core.dependencies import get_current_user
+from app.core.dependencies import get_current_user, oauth2_scheme
 from app.core.security import verify_token, create_tokens
+from app.core.revocation import token_denylist
+from app.core.audit import record_audit
+from app.metrics import AUTH_LOGINS, AUTH_TOKEN_REFRESHES
 from app.models import User
 
 router = APIRouter()
@@ -33,6 +36,8 @@ async def login(
     )
     
     if not user:
+        AUTH_LOGINS.labels("failure").inc()
+        record_audit("auth.login_failed", "user", new_values={"username": form_data.username})
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -40,11 +45,14 @@ async def login(
         )
     
     if not user.is_active:
+        AUTH_LOGINS.labels("inactive").inc()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
     
+    AUTH_LOGINS.labels("success").inc()
+    record_audit("auth.login", "user", user.id, user_id=user.id)
     return await AuthService.create_tokens_for_user(user)
 
 @router.post("/refresh", response_model=Token)
@@ -52,10 +60,16 @@ async def refresh_token(
     refresh_token: str,
     db: Annotated[AsyncSession, Depends(get_db)]
 ):
-    """Refresh access token using refresh token"""
+    """Refresh access token using refresh token
+
+    Refresh tokens are single use: each refresh revokes the presented one
+    and issues a new pair in the same family. Presenting an already used
+    refresh token means it leaked, so the whole family is revoked.
+    """
     # Verify refresh token
     payload = verify_token(refresh_token, token_type="refresh")
-    if payload is None:
+    if payload is None or await token_denylist.is_family_revoked(payload):
+        AUTH_TOKEN_REFRESHES.labels("invalid").inc()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid refresh token"
@@ -65,27 +79,44 @@ async def refresh_token(
     username = payload.get("username")
     
     if not user_id or not username:
+        AUTH_TOKEN_REFRESHES.labels("invalid").inc()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token payload"
         )
     
+    # Rotate: the first use wins, any later one is a replay
+    if not await token_denylist.revoke_token(payload):
+        await token_denylist.revoke_family(payload)
+        AUTH_TOKEN_REFRESHES.labels("reused").inc()
+        record_audit("auth.refresh_reused", "user", int(user_id), user_id=int(user_id))
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token already used"
+        )
+    
     # Create new tokens
-    token_dict = create_tokens(int(user_id), username)
+    token_dict = create_tokens(int(user_id), username, family=payload.get("fam"))
+    AUTH_TOKEN_REFRESHES.labels("success").inc()
     return Token(**token_dict)
 
 @router.get("/me", response_model=UserResponse)
 async def get_me(
-    current_user: Annotated[User, Depends(get_current_user)]
+    current_user: Annotated[User, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)]
 ):
     """Get current user info"""
-    return current_user
+    # current_user may be a cached snapshot, so load the full row
+    return await AuthService.get_user(db, current_user.id)
 
 @router.post("/logout")
-async def logout():
-    """Logout (client should discard tokens)"""
-    # In a more complex system, you might want to:
-    # - Add the token to a blacklist
-    # - Clear server-side sessions
-    # - Log the logout event
+async def logout(
+    token: Annotated[Optional[str], Depends(oauth2_scheme)]
+):
+    """Logout: revoke the access token and every token refreshed from the same login"""
+    payload = verify_token(token, token_type="access") if token else None
+    if payload is not None and payload.get("sub"):
+        await token_denylist.revoke_token(payload)
+        await token_denylist.revoke_family(payload)
+        record_audit("auth.logout", "user", int(payload["sub"]), user_id=int(payload["sub"]))
     return {"message": "Successfully logged out"}
\ No newline at end of file
@@ -0,0 +1,34 @@
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, Header, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db
+from app.services.catalog_service import CatalogService
+
+router = APIRouter()
+
+@router.get("/")
+async def get_catalog(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    if_none_match: Annotated[Optional[str], Header()] = None
+):
+    """Get the whole Category -> SubTheme tree with question counts (Public)
+
+    Served from a pre-serialized snapshot; a matching If-None-Match
+    returns 304 without touching the database.
+    """
+    snapshot = await CatalogService.get_snapshot(db)
+    headers = {
+        "ETag": snapshot.etag,
+        "Cache-Control": "public, max-age=0, must-revalidate",
+    }
+
+    if if_none_match and snapshot.etag in [
+        tag.strip() for tag in if_none_match.split(",")
+    ]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(
+        content=snapshot.body,
+        media_type="application/json",
+        headers=headers
+    )
@@ -1,4 +1,4 @@
-from typing import List, Annotated
+from typing import List, Annotated, Union
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
@@ -7,6 +7,7 @@ from app.schemas import (
     CategoryWithSubThemes, PaginationParams
 )
 from app.services.category_service import CategoryService
+from app.core.responses import ORJSONResponse
 from app.core.dependencies import get_admin_user, get_current_user
 from app.models import User
 
@@ -21,17 +22,18 @@ async def create_category(
     """Create a new category (Admin only)"""
     return await CategoryService.create_category(db, category_data)
 
-@router.get("/", response_model=List[CategoryResponse])
+@router.get("/", response_model=List[Union[CategoryWithSubThemes, CategoryResponse]])
 async def get_categories(
     db: Annotated[AsyncSession, Depends(get_db)],
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     include_sub_themes: bool = Query(False)
 ):
-    """Get all categories (Public)"""
-    return await CategoryService.get_categories(
+    """Get all categories, with their sub-themes if requested (Public)"""
+    # Already serialized with the matching schema; skip re-validating
+    return ORJSONResponse(await CategoryService.get_cached_categories(
         db, skip, limit, include_sub_themes
-    )
+    ))
 
 @router.get("/{category_id}", response_model=CategoryWithSubThemes)
 async def get_category(
@@ -39,9 +41,7 @@ async def get_category(
     db: Annotated[AsyncSession, Depends(get_db)]
 ):
     """Get a single category with sub-themes (Public)"""
-    return await CategoryService.get_category(
-        db, category_id, include_sub_themes=True
-    )
+    return await CategoryService.get_cached_category(db, category_id)
 
 @router.put("/{category_id}", response_model=CategoryResponse)
 async def update_category(
@@ -1,16 +1,27 @@
-from typing import List, Annotated, Optional
-from fastapi import APIRouter, Depends, Query, HTTPException
+from typing import List, Annotated, Optional, Literal
+from fastapi import (
+    APIRouter, Depends, Query, HTTPException, BackgroundTasks, Response,
+    UploadFile, File, status
+)
+from fastapi.responses import StreamingResponse
+from app.core.responses import ORJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
 from app.schemas import (
     QuestionCreate, QuestionUpdate, QuestionResponse, 
-    QuestionWithDetails, PaginationParams
+    QuestionWithDetails, QuestionPage, PaginationParams, AnswerOptionUpdate,
+    QuestionImportResult
 )
 from app.services.question_service import QuestionService
+from app.services.regrade_service import RegradeService
+from app.services.question_export import QuestionExporter
+from app.services.question_import import QuestionImporter
+from app.config import get_settings
 from app.core.dependencies import get_current_user_optional, get_instructor_user, get_admin_user
 from app.models import User
 
 router = APIRouter()
+settings = get_settings()
 
 @router.post("/", response_model=QuestionResponse)
 async def create_question(
@@ -23,6 +34,39 @@ async def create_question(
         db, question_data, instructor.id
     )
 
+@router.post("/import", response_model=QuestionImportResult)
+async def import_questions(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    instructor: Annotated[User, Depends(get_instructor_user)],
+    file: UploadFile = File(...),
+    format: Optional[Literal["json", "ndjson", "csv", "yaml"]] = Query(None),
+    dry_run: bool = Query(False),
+    skip_invalid: bool = Query(False)
+):
+    """Bulk import questions from a JSON/NDJSON/CSV/YAML file (Instructor/Admin only)
+    
+    Nothing is imported if any record is invalid, unless skip_invalid is set.
+    """
+    content = await file.read(settings.import_max_bytes + 1)
+    if len(content) > settings.import_max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Import file is too large"
+        )
+    
+    records = QuestionImporter.parse(
+        content, format or QuestionImporter.detect_format(file.filename)
+    )
+    result = await QuestionImporter.import_records(
+        db, records, instructor.id, dry_run=dry_run, skip_invalid=skip_invalid
+    )
+    if result.errors and not (dry_run or skip_invalid):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=result.model_dump()
+        )
+    return result
+
 @router.get("/", response_model=List[QuestionResponse])
 async def get_questions(
     db: Annotated[AsyncSession, Depends(get_db)],
@@ -41,9 +85,56 @@ async def get_questions(
     elif is_active is None:
         is_active = None  # Authenticated users see all by default
     
-    return await QuestionService.get_questions(
+    # Already QuestionResponse-shaped; skip re-validating every item
+    return ORJSONResponse(await QuestionService.get_cached_questions(
         db, sub_theme_id, difficulty_level, 
         question_type, is_active, skip, limit
+    ))
+
+@router.get("/page", response_model=QuestionPage)
+async def get_questions_page(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    current_user: Annotated[Optional[User], Depends(get_current_user_optional)],
+    sub_theme_id: Optional[int] = Query(None),
+    difficulty_level: Optional[str] = Query(None),
+    question_type: Optional[str] = Query(None),
+    is_active: Optional[bool] = Query(None),
+    cursor: Optional[str] = Query(None),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """Get questions with cursor pagination (Public, same visibility rules as the list)"""
+    if not current_user and is_active is None:
+        is_active = True
+    
+    return await QuestionService.get_questions_page(
+        db, sub_theme_id, difficulty_level,
+        question_type, is_active, cursor, limit
+    )
+
+@router.get("/export")
+async def export_questions(
+    instructor: Annotated[User, Depends(get_instructor_user)],
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    sub_theme_id: Optional[int] = Query(None),
+    difficulty_level: Optional[str] = Query(None),
+    question_type: Optional[str] = Query(None),
+    is_active: Optional[bool] = Query(None)
+):
+    """Stream the question bank with options and tags (Instructor/Admin only)"""
+    filters = dict(
+        sub_theme_id=sub_theme_id,
+        difficulty_level=difficulty_level,
+        question_type=question_type,
+        is_active=is_active
+    )
+    if format == "csv":
+        body, media_type = QuestionExporter.csv(**filters), "text/csv; charset=utf-8"
+    else:
+        body, media_type = QuestionExporter.ndjson(**filters), "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="questions.{format}"'}
     )
 
 @router.get("/{question_id}", response_model=QuestionWithDetails)
@@ -53,12 +144,10 @@ async def get_question(
     current_user: Annotated[Optional[User], Depends(get_current_user_optional)]
 ):
     """Get a single question with details (Public)"""
-    question = await QuestionService.get_question(
-        db, question_id, include_details=True
-    )
+    question = await QuestionService.get_cached_question(db, question_id)
     
     # Check if user can see inactive questions
-    if not question.is_active and (not current_user or current_user.role.value == "student"):
+    if not question["is_active"] and (not current_user or current_user.role.value == "student"):
         raise HTTPException(
             status_code=403,
             detail="This question is not available"
@@ -78,6 +167,30 @@ async def update_question(
         db, question_id, question_data, instructor.id
     )
 
+@router.put("/{question_id}/options/{option_id}", response_model=QuestionResponse)
+async def update_answer_option(
+    question_id: int,
+    option_id: int,
+    option_data: AnswerOptionUpdate,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    db: Annotated[AsyncSession, Depends(get_db)],
+    instructor: Annotated[User, Depends(get_instructor_user)]
+):
+    """Update an answer option (Instructor/Admin only)
+    
+    Changing is_correct starts a re-grade of stored responses; its job is
+    linked in the Location header. On single choice questions, setting
+    is_correct to true moves the key to this option.
+    """
+    question, job = await QuestionService.update_answer_option(
+        db, question_id, option_id, option_data, instructor.id
+    )
+    if job:
+        background_tasks.add_task(RegradeService.run_job, job.id)
+        response.headers["Location"] = f"/api/admin/regrade-jobs/{job.id}"
+    return question
+
 @router.post("/{question_id}/toggle-active", response_model=QuestionResponse)
 async def toggle_question_active(
     question_id: int,
@@ -96,7 +209,7 @@ async def delete_question(
     admin: Annotated[User, Depends(get_admin_user)]
 ):
     """Delete a question (Admin only)"""
-    return await QuestionService.delete_question(db, question_id)
+    return await QuestionService.delete_question(db, question_id, admin.id)
 
 @router.get("/by-category/{category_id}", response_model=List[QuestionResponse])
 async def get_questions_by_category(
@@ -109,6 +222,6 @@ async def get_questions_by_category(
     # Non-authenticated users only see active questions
     is_active = True if not current_user else None
     
-    return await QuestionService.get_questions_by_category(
+    return ORJSONResponse(await QuestionService.get_questions_by_category(
         db, category_id, difficulty_level, is_active
-    )
+    ))
@@ -1,4 +1,4 @@
-from typing import List, Annotated, Optional
+from typing import List, Annotated, Optional, Union
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.database import get_db
@@ -7,6 +7,7 @@ from app.schemas import (
     SubThemeWithCategory
 )
 from app.services.sub_theme_service import SubThemeService
+from app.core.responses import ORJSONResponse
 from app.core.dependencies import get_admin_user, get_current_user
 from app.models import User
 
@@ -21,7 +22,7 @@ async def create_sub_theme(
     """Create a new sub-theme (Admin only)"""
     return await SubThemeService.create_sub_theme(db, sub_theme_data)
 
-@router.get("/", response_model=List[SubThemeResponse])
+@router.get("/", response_model=List[Union[SubThemeWithCategory, SubThemeResponse]])
 async def get_sub_themes(
     db: Annotated[AsyncSession, Depends(get_db)],
     category_id: Optional[int] = Query(None),
@@ -29,10 +30,11 @@ async def get_sub_themes(
     limit: int = Query(100, ge=1, le=1000),
     include_category: bool = Query(False)
 ):
-    """Get sub-themes, optionally filtered by category (Public)"""
-    return await SubThemeService.get_sub_themes(
+    """Get sub-themes, optionally filtered by category, with it if requested (Public)"""
+    # Already serialized with the matching schema; skip re-validating
+    return ORJSONResponse(await SubThemeService.get_cached_sub_themes(
         db, category_id, skip, limit, include_category
-    )
+    ))
 
 @router.get("/{sub_theme_id}", response_model=SubThemeWithCategory)
 async def get_sub_theme(
@@ -40,9 +42,7 @@ async def get_sub_theme(
     db: Annotated[AsyncSession, Depends(get_db)]
 ):
     """Get a single sub-theme with category info (Public)"""
-    return await SubThemeService.get_sub_theme(
-        db, sub_theme_id, include_category=True
-    )
+    return await SubThemeService.get_cached_sub_theme(db, sub_theme_id)
 
 @router.put("/{sub_theme_id}", response_model=SubThemeResponse)
 async def update_sub_theme(
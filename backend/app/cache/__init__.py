@@ -0,0 +1,51 @@
+from functools import lru_cache
+from typing import Dict
+from app.config import get_settings
+from app.cache.backends import CacheBackend, MemoryBackend, RedisBackend
+from app.cache.cache import Cache
+
+_caches: Dict[str, Cache] = {}
+
+@lru_cache()
+def get_cache_backend() -> CacheBackend:
+    """Backend selected by Settings.cache_backend ("memory" or "redis")"""
+    settings = get_settings()
+    if settings.cache_backend == "redis":
+        return RedisBackend(settings.redis_url)
+    if settings.cache_backend == "memory":
+        return MemoryBackend()
+    raise ValueError(f"Unknown cache backend: {settings.cache_backend}")
+
+def get_cache(namespace: str) -> Cache:
+    """Get the shared Cache for a namespace"""
+    cache = _caches.get(namespace)
+    if cache is None:
+        settings = get_settings()
+        cache = Cache(
+            get_cache_backend(),
+            namespace,
+            prefix=settings.cache_key_prefix,
+            default_ttl=settings.cache_default_ttl_seconds,
+            lock_timeout=settings.cache_lock_timeout_seconds,
+            version_check_seconds=settings.cache_version_check_seconds,
+        )
+        _caches[namespace] = cache
+    return cache
+
+async def invalidate(*namespaces: str) -> None:
+    """Invalidate every key in the given namespaces"""
+    for namespace in namespaces:
+        await get_cache(namespace).invalidate()
+
+def cache_stats() -> list:
+    return [cache.stats() for cache in _caches.values()]
+
+async def close_cache_backend() -> None:
+    if get_cache_backend.cache_info().currsize:
+        await get_cache_backend().close()
+
+__all__ = [
+    "CacheBackend", "MemoryBackend", "RedisBackend", "Cache",
+    "get_cache_backend", "get_cache", "invalidate", "cache_stats",
+    "close_cache_backend",
+]
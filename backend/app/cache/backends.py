@@ -0,0 +1,157 @@
+import time
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+class CacheBackend(ABC):
+    """Minimal async key/value interface the cache layer is built on
+
+    Keys are plain strings, values are bytes. ``ttl`` is in seconds;
+    None means no expiry.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        ...
+
+    @abstractmethod
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """Set the key only if it does not exist; returns True if it was set"""
+        ...
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        ...
+
+    @abstractmethod
+    async def delete_if_equals(self, key: str, value: bytes) -> bool:
+        """Delete the key only if it still holds ``value`` (atomic); True if deleted"""
+        ...
+
+    @abstractmethod
+    async def incr(self, key: str, amount: int = 1) -> int:
+        ...
+
+    @abstractmethod
+    async def ping(self) -> bool:
+        ...
+
+    async def close(self) -> None:
+        pass
+
+class MemoryBackend(CacheBackend):
+    """Process-local backend for tests and single-worker deployments"""
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = asyncio.Lock()
+
+    def _read(self, key: str) -> Optional[bytes]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at = item
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    @staticmethod
+    def _expiry(ttl: Optional[float]) -> Optional[float]:
+        return time.monotonic() + ttl if ttl else None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._read(key)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        return [self._read(key) for key in keys]
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        self._data[key] = (value, self._expiry(ttl))
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        async with self._lock:
+            if self._read(key) is not None:
+                return False
+            self._data[key] = (value, self._expiry(ttl))
+            return True
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    async def delete_if_equals(self, key: str, value: bytes) -> bool:
+        async with self._lock:
+            if self._read(key) != value:
+                return False
+            del self._data[key]
+            return True
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        async with self._lock:
+            current = self._read(key)
+            value = int(current) + amount if current is not None else amount
+            expires_at = self._data[key][1] if current is not None else None
+            self._data[key] = (str(value).encode(), expires_at)
+            return value
+
+    async def ping(self) -> bool:
+        return True
+
+class RedisBackend(CacheBackend):
+    """Redis backend shared by every worker"""
+
+    _DELETE_IF_EQUALS = """
+    if redis.call("GET", KEYS[1]) == ARGV[1] then
+        return redis.call("DEL", KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, url: str):
+        # Imported here so the memory backend works without redis installed
+        from redis import asyncio as redis_asyncio
+        self._client = redis_asyncio.from_url(url)
+        self._delete_if_equals = self._client.register_script(self._DELETE_IF_EQUALS)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        return await self._client.mget(keys)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        if ttl:
+            await self._client.set(key, value, px=int(ttl * 1000))
+        else:
+            await self._client.set(key, value)
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        px = int(ttl * 1000) if ttl else None
+        return bool(await self._client.set(key, value, nx=True, px=px))
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._client.delete(*keys)
+
+    async def delete_if_equals(self, key: str, value: bytes) -> bool:
+        return bool(await self._delete_if_equals(keys=[key], args=[value]))
+
+    async def incr(self, key: str, amount: int = 1) -> int:
+        return await self._client.incrby(key, amount)
+
+    async def ping(self) -> bool:
+        return bool(await self._client.ping())
+
+    async def close(self) -> None:
+        await self._client.aclose()
@@ -0,0 +1,181 @@
+import json
+import time
+import uuid
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+from app.cache.backends import CacheBackend
+from app.metrics import cache_metrics
+
+Loader = Callable[[], Awaitable[Any]]
+
+class Cache:
+    """Namespaced, versioned JSON cache on top of a CacheBackend
+
+    Every key lives under ``<prefix>:<namespace>:v<version>:<key>``.
+    Invalidating a namespace bumps its version, which orphans all old
+    keys at once (they expire through their TTL). The current version is
+    re-read from the backend at most every ``version_check_seconds``, so
+    invalidations made by other workers are picked up within that window.
+    Values returned by ``get_or_set`` may be shared between concurrent
+    callers and must be treated as read-only.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend,
+        namespace: str,
+        prefix: str = "csp",
+        default_ttl: Optional[float] = 300,
+        lock_timeout: float = 10.0,
+        version_check_seconds: float = 1.0,
+    ):
+        self.backend = backend
+        self.namespace = namespace
+        self.prefix = prefix
+        self.default_ttl = default_ttl
+        self.lock_timeout = lock_timeout
+        self.version_check_seconds = version_check_seconds
+        self._version: Optional[int] = None
+        self._version_checked_at = 0.0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.loads = 0
+        self.metrics = cache_metrics(namespace)
+
+    @property
+    def version_key(self) -> str:
+        return f"{self.prefix}:{self.namespace}:version"
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Build a key from parts, e.g. key("list", skip, limit)"""
+        return ":".join("" if part is None else str(part) for part in parts)
+
+    @staticmethod
+    def encode(value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":"), default=str).encode()
+
+    @staticmethod
+    def decode(raw: bytes) -> Any:
+        return json.loads(raw)
+
+    async def version(self) -> int:
+        """Current namespace version (locally memoized for a short window)"""
+        now = time.monotonic()
+        if self._version is None or now - self._version_checked_at >= self.version_check_seconds:
+            raw = await self.backend.get(self.version_key)
+            self._version = int(raw) if raw is not None else 0
+            self._version_checked_at = now
+        return self._version
+
+    async def full_key(self, key: str) -> str:
+        return f"{self.prefix}:{self.namespace}:v{await self.version()}:{key}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self.backend.get(await self.full_key(key))
+        if raw is None:
+            self.misses += 1
+            self.metrics.miss()
+            return None
+        self.hits += 1
+        self.metrics.hit()
+        return self.decode(raw)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        await self.backend.set(
+            await self.full_key(key),
+            self.encode(value),
+            ttl if ttl is not None else self.default_ttl,
+        )
+
+    async def delete(self, key: str) -> None:
+        await self.backend.delete(await self.full_key(key))
+
+    async def invalidate(self) -> int:
+        """Bump the namespace version, invalidating every key in it"""
+        self._version = await self.backend.incr(self.version_key)
+        self._version_checked_at = time.monotonic()
+        return self._version
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Loader,
+        ttl: Optional[float] = None
+    ) -> Any:
+        """Return the cached value, computing it at most once on a miss
+
+        Concurrent misses in this worker share one in-flight load; across
+        workers a backend lock makes a single worker run the loader while
+        the others wait for its result.
+        """
+        full_key = await self.full_key(key)
+        raw = await self.backend.get(full_key)
+        if raw is not None:
+            self.hits += 1
+            self.metrics.hit()
+            return self.decode(raw)
+        self.misses += 1
+        self.metrics.miss()
+
+        inflight = self._inflight.get(full_key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        # Avoid "exception was never retrieved" when nobody else waited
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[full_key] = future
+        try:
+            value = await self._load_once(full_key, loader, ttl)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._inflight.pop(full_key, None)
+
+    async def _load_once(self, full_key: str, loader: Loader, ttl: Optional[float]) -> Any:
+        ttl = ttl if ttl is not None else self.default_ttl
+        lock_key = f"{full_key}:lock"
+        # Owner token: past lock_timeout the lock may belong to someone else
+        token = uuid.uuid4().hex.encode()
+
+        if await self.backend.add(lock_key, token, self.lock_timeout):
+            try:
+                return await self._load(full_key, loader, ttl)
+            finally:
+                await self.backend.delete_if_equals(lock_key, token)
+
+        # Another worker holds the lock: wait for it to publish the value
+        deadline = time.monotonic() + self.lock_timeout
+        delay = 0.01
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            raw = await self.backend.get(full_key)
+            if raw is not None:
+                return self.decode(raw)
+            delay = min(delay * 2, 0.2)
+
+        # The lock holder died or is too slow; load it ourselves
+        return await self._load(full_key, loader, ttl)
+
+    async def _load(self, full_key: str, loader: Loader, ttl: Optional[float]) -> Any:
+        value = await loader()
+        self.loads += 1
+        await self.backend.set(full_key, self.encode(value), ttl)
+        return value
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "version": self._version,
+            "hits": self.hits,
+            "misses": self.misses,
+            "loads": self.loads,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
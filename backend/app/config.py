@@ -9,6 +9,13 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str
+    # Connections per worker = pool_size + max_overflow; keep
+    # workers * that below Postgres max_connections
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
     
     # Security
     secret_key: str
@@ -16,9 +23,112 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
     
+    # Password hashing (bcrypt thread pool per worker)
+    password_hash_workers: int = 4
+    password_hash_max_queue: int = 64
+    password_hash_queue_timeout_seconds: float = 5.0
+    
+    # Authenticated user cache (per worker). A role or active flag change
+    # reaches other workers within cache_version_check_seconds; changes
+    # that bypass AuthService's invalidate_user only within the TTL
+    user_cache_ttl_seconds: float = 60.0
+    user_cache_max_size: int = 10000
+    
+    # Token revocation (denylist in the cache backend, bloom filter per worker)
+    token_revocation_bloom_capacity: int = 100000
+    token_revocation_bloom_error_rate: float = 0.001
+    token_revocation_sync_seconds: float = 1.0
+    
     # Redis
     redis_url: str = "redis://localhost:6379"
     
+    # Shared cache ("memory" for tests/single worker, "redis" for production)
+    cache_backend: str = "memory"
+    cache_key_prefix: str = "csp"
+    cache_default_ttl_seconds: float = 300.0
+    cache_lock_timeout_seconds: float = 10.0
+    cache_version_check_seconds: float = 1.0
+    
+    # Assessments
+    assessment_questions_per_type: int = 2
+    # Serve the next level only after scoring this share of the current one
+    assessment_adaptive: bool = True
+    assessment_level_pass_ratio: float = 0.75
+    assessment_state_ttl_seconds: float = 4 * 3600
+    # Expiry of the per-session lock; keep it well above
+    # assessment_complete_wait_seconds, which completion waits while holding it
+    assessment_lock_ttl_seconds: float = 30.0
+    response_flush_batch_size: int = 200
+    response_flush_interval_seconds: float = 1.0
+    response_buffer_max_pending: int = 50000
+    # How long completing a session waits for answers buffered on other workers
+    assessment_complete_wait_seconds: float = 5.0
+    # Answers still missing this long after the last submit died with their
+    # worker; completion then goes ahead with what was stored
+    assessment_lost_answer_grace_seconds: float = 60.0
+    
+    # Pre-rendered assessment question payloads
+    question_payload_local_size: int = 5000
+    question_payload_ttl_seconds: float = 24 * 3600
+    
+    # Question bank export (rows fetched per server-side cursor round trip)
+    export_chunk_size: int = 500
+    
+    # Bulk question import
+    import_max_bytes: int = 100 * 1024 * 1024
+    
+    # Audit log writer ("spill", "drop_oldest" or "drop_newest" when full)
+    audit_flush_batch_size: int = 500
+    audit_flush_interval_seconds: float = 2.0
+    audit_max_pending: int = 10000
+    audit_backpressure_policy: str = "spill"
+    audit_spill_path: str = "audit_spill.jsonl"
+    
+    # Monthly partitions of audit_log/user_responses (retention 0 keeps
+    # everything; expired partitions are "detach"ed or "drop"ped)
+    partition_months_ahead: int = 3
+    audit_log_retention_months: int = 12
+    user_responses_retention_months: int = 0
+    partition_retention_action: str = "detach"
+    
+    # Report generation (scripts/report_worker.py, or in the API process
+    # when report_worker_embedded is set)
+    report_worker_embedded: bool = False
+    report_worker_concurrency: int = 2
+    report_poll_interval_seconds: float = 1.0
+    report_max_attempts: int = 3
+    report_stale_after_seconds: float = 300.0
+    report_long_poll_max_seconds: float = 30.0
+    
+    # Rendered report PDFs, content-addressed under artifact_store_path with
+    # LRU eviction past artifact_store_max_bytes. With a prefix set, downloads
+    # are handed to nginx via X-Accel-Redirect (location must be "internal"
+    # and alias artifact_store_path)
+    artifact_store_path: str = "artifacts"
+    artifact_store_max_bytes: int = 1024 * 1024 * 1024
+    artifact_accel_redirect_prefix: str = ""
+    
+    # /ready: dependencies are checked in the background every interval;
+    # results older than readiness_stale_after_seconds count as not ready
+    readiness_check_interval_seconds: float = 5.0
+    readiness_check_timeout_seconds: float = 2.0
+    readiness_stale_after_seconds: float = 30.0
+    
+    # Prometheus /metrics (multiprocess aggregation is switched on by the
+    # PROMETHEUS_MULTIPROC_DIR environment variable, see app/metrics.py)
+    metrics_enabled: bool = True
+    
+    # Request profiling (opt-in): Server-Timing headers, a JSON log record
+    # for slow requests, and a cProfile report for admins sending the header
+    profiling_enabled: bool = False
+    profiling_slow_request_ms: float = 500.0
+    profiling_top_statements: int = 5
+    profiling_header: str = "X-Profile"
+    
+    # Re-grading
+    regrade_chunk_size: int = 1000
+    regrade_stale_after_seconds: float = 300.0
+    
     class Config:
         env_file = ".env"
 
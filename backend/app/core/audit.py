@@ -0,0 +1,369 @@
+import asyncio
+import enum
+import json
+import logging
+import os
+import threading
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
+from datetime import datetime, date
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import insert, inspect
+from sqlalchemy.exc import DBAPIError
+from app.config import get_settings
+from app.database import AsyncSessionLocal, is_data_error
+from app.models import AuditLog
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+BACKPRESSURE_POLICIES = ("spill", "drop_oldest", "drop_newest")
+
+@dataclass
+class AuditContext:
+    """Who is acting in the current request"""
+    user_id: Optional[int] = None
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+
+_audit_context: ContextVar[AuditContext] = ContextVar("audit_context", default=AuditContext())
+
+def set_audit_actor(user_id: Optional[int]) -> None:
+    """Attach the authenticated user to events recorded in this request"""
+    context = _audit_context.get()
+    _audit_context.set(AuditContext(user_id, context.ip_address, context.user_agent))
+
+class AuditContextMiddleware:
+    """Pure ASGI middleware that scopes an AuditContext to each request"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        headers = dict(scope.get("headers") or [])
+        client = scope.get("client")
+        user_agent = headers.get(b"user-agent")
+        token = _audit_context.set(AuditContext(
+            ip_address=client[0] if client else None,
+            user_agent=user_agent.decode("latin-1") if user_agent else None
+        ))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _audit_context.reset(token)
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+_IGNORED_COLUMNS = ("created_at", "updated_at", "password_hash")
+
+def audit_diff(instance, exclude: Iterable[str] = _IGNORED_COLUMNS) -> Tuple[dict, dict]:
+    """Old and new values of the changed columns, from attribute history
+
+    Call after assigning the new values and before the flush/commit that
+    resets the history.
+    """
+    state = inspect(instance)
+    old, new = {}, {}
+    for attr in state.mapper.column_attrs:
+        if attr.key in exclude:
+            continue
+        history = state.attrs[attr.key].history
+        if not history.has_changes():
+            continue
+        before = history.deleted[0] if history.deleted else None
+        after = history.added[0] if history.added else None
+        if before == after:
+            continue
+        old[attr.key] = _jsonable(before)
+        new[attr.key] = _jsonable(after)
+    return old, new
+
+def audit_snapshot(instance, exclude: Iterable[str] = _IGNORED_COLUMNS) -> dict:
+    """Current column values, e.g. of a row about to be deleted"""
+    state = inspect(instance)
+    return {
+        attr.key: _jsonable(state.attrs[attr.key].loaded_value)
+        for attr in state.mapper.column_attrs
+        if attr.key not in exclude
+    }
+
+@dataclass
+class AuditEvent:
+    action: str
+    entity_type: Optional[str] = None
+    entity_id: Optional[int] = None
+    old_values: Optional[Dict[str, Any]] = None
+    new_values: Optional[Dict[str, Any]] = None
+    user_id: Optional[int] = None
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    created_at: datetime = field(default_factory=datetime.now)
+
+    def to_row(self) -> dict:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        row = self.to_row()
+        row["created_at"] = self.created_at.isoformat()
+        return json.dumps(row, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, line: str) -> "AuditEvent":
+        data = json.loads(line)
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+        return cls(**data)
+
+class AuditWriter:
+    """Queues audit events in memory and writes them in multi-row batches
+
+    Handlers call ``record`` (no I/O, no await). A background task flushes
+    when ``batch_size`` events are waiting or every ``flush_interval``
+    seconds. When ``max_pending`` events are queued the backpressure
+    policy decides: "spill" appends new events to the spill file,
+    "drop_oldest"/"drop_newest" discard one event. Batches that fail to
+    insert are always spilled. The spill file is fsync'd JSON lines and is
+    replayed on start and after successful flushes (see ``replay_spill``).
+    """
+
+    def __init__(
+        self,
+        batch_size: int,
+        flush_interval: float,
+        max_pending: int,
+        policy: str,
+        spill_path: str
+    ):
+        if policy not in BACKPRESSURE_POLICIES:
+            raise ValueError(f"Unknown audit backpressure policy: {policy}")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.policy = policy
+        self.spill_path = Path(spill_path)
+        self._pending: Deque[AuditEvent] = deque()
+        self._flush_lock = asyncio.Lock()
+        self._spill_lock = threading.Lock()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.replayed = 0
+        self.quarantined = 0
+        self.failures = 0
+
+    def record(self, event: AuditEvent) -> None:
+        """Queue an event; never blocks the caller on the database"""
+        self.recorded += 1
+        if len(self._pending) >= self.max_pending:
+            if self.policy == "drop_newest":
+                self.dropped += 1
+                return
+            if self.policy == "drop_oldest":
+                self._pending.popleft()
+                self.dropped += 1
+            else:
+                self._spill([event])
+                return
+        self._pending.append(event)
+        if len(self._pending) >= self.batch_size and self._wake is not None:
+            self._wake.set()
+
+    def _spill(self, events: List[AuditEvent]) -> None:
+        with self._spill_lock:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.spill_path, "a", encoding="utf-8") as spill:
+                spill.write("".join(event.to_json() + "\n" for event in events))
+                spill.flush()
+                os.fsync(spill.fileno())
+        self.spilled += len(events)
+
+    async def flush(self) -> int:
+        """Write every queued event; returns the number written"""
+        async with self._flush_lock:
+            written = 0
+            while self._pending:
+                batch = [
+                    self._pending.popleft()
+                    for _ in range(min(self.batch_size, len(self._pending)))
+                ]
+                try:
+                    await self._write(batch)
+                except Exception:
+                    self.failures += 1
+                    logger.exception("Failed to write %d audit events, spilling", len(batch))
+                    self._spill(batch)
+                    break
+                written += len(batch)
+            self.written += written
+            return written
+
+    async def _write(self, batch: List[AuditEvent]) -> None:
+        async with AsyncSessionLocal() as db:
+            await db.execute(insert(AuditLog), [event.to_row() for event in batch])
+            await db.commit()
+
+    async def replay_spill(self) -> int:
+        """Insert spilled events, then delete the file; returns the number replayed
+
+        Each batch is its own transaction, so after every commit the number
+        of events done is saved next to the file: a replay that fails part
+        way resumes after the last committed batch instead of inserting it
+        again. A batch rejected for its data is split in halves until the
+        offending events are isolated; those are quarantined (logged and
+        appended to the ``.rejected`` file) so they cannot block the rest.
+        """
+        replaying = self.spill_path.with_suffix(self.spill_path.suffix + ".replaying")
+        offset_path = replaying.with_suffix(replaying.suffix + ".offset")
+        async with self._flush_lock:
+            # A leftover .replaying file means a previous replay failed
+            if not replaying.exists():
+                with self._spill_lock:
+                    if not self.spill_path.exists():
+                        return 0
+                    os.replace(self.spill_path, replaying)
+                offset_path.unlink(missing_ok=True)
+
+            events = []
+            with open(replaying, encoding="utf-8") as spill:
+                for line in spill:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        events.append(AuditEvent.from_json(line))
+                    except (ValueError, TypeError, KeyError):
+                        logger.error("Skipping unreadable spilled audit event: %s", line[:200])
+
+            done = int(offset_path.read_text()) if offset_path.exists() else 0
+            replayed = 0
+            # Oldest chunk last, so the events done always form a prefix
+            chunks = [
+                events[start:start + self.batch_size]
+                for start in reversed(range(done, len(events), self.batch_size))
+            ]
+            while chunks:
+                chunk = chunks.pop()
+                try:
+                    await self._write(chunk)
+                    replayed += len(chunk)
+                except DBAPIError as exc:
+                    if not is_data_error(exc):
+                        raise
+                    if len(chunk) > 1:
+                        middle = len(chunk) // 2
+                        chunks += [chunk[middle:], chunk[:middle]]
+                        continue
+                    self._quarantine(chunk[0])
+                done += len(chunk)
+                self._save_offset(offset_path, done)
+            replaying.unlink()
+            offset_path.unlink(missing_ok=True)
+            self.replayed += replayed
+            return replayed
+
+    @staticmethod
+    def _save_offset(path: Path, done: int) -> None:
+        partial = path.with_suffix(path.suffix + ".tmp")
+        partial.write_text(str(done))
+        os.replace(partial, path)
+
+    def _quarantine(self, event: AuditEvent) -> None:
+        """Set aside a spilled event the database keeps rejecting"""
+        self.quarantined += 1
+        logger.error("Quarantined spilled audit event %s", event.to_json())
+        rejected = self.spill_path.with_suffix(self.spill_path.suffix + ".rejected")
+        with open(rejected, "a", encoding="utf-8") as spill:
+            spill.write(event.to_json() + "\n")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            failures = self.failures
+            await self.flush()
+            if self.failures == failures and self.spilled > self.replayed + self.quarantined:
+                try:
+                    await self.replay_spill()
+                except Exception:
+                    logger.exception("Failed to replay the audit spill file")
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._wake = asyncio.Event()
+            try:
+                replayed = await self.replay_spill()
+                if replayed:
+                    logger.info("Replayed %d spilled audit events", replayed)
+            except Exception:
+                logger.exception("Failed to replay the audit spill file")
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "policy": self.policy,
+            "pending": len(self._pending),
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "quarantined": self.quarantined,
+            "failures": self.failures,
+            "spill_file_exists": self.spill_path.exists(),
+        }
+
+audit_writer = AuditWriter(
+    batch_size=settings.audit_flush_batch_size,
+    flush_interval=settings.audit_flush_interval_seconds,
+    max_pending=settings.audit_max_pending,
+    policy=settings.audit_backpressure_policy,
+    spill_path=settings.audit_spill_path,
+)
+
+def record_audit(
+    action: str,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    old_values: Optional[dict] = None,
+    new_values: Optional[dict] = None,
+    user_id: Optional[int] = None
+) -> None:
+    """Queue an audit event, filling actor, IP and user agent from the request"""
+    context = _audit_context.get()
+    audit_writer.record(AuditEvent(
+        action=action,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        old_values=old_values,
+        new_values=new_values,
+        user_id=user_id if user_id is not None else context.user_id,
+        ip_address=context.ip_address,
+        user_agent=context.user_agent
+    ))
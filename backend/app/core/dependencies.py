@@ -8,10 +8,36 @@ from app.database import get_db
 from app.models import User
 from app.schemas import TokenData
 from app.core.security import verify_token
+from app.core.user_cache import user_auth_cache
+from app.core.revocation import token_denylist
+from app.core.audit import set_audit_actor
+from app.core.profiling import profile_span, set_profile_user
 
 # Make auto_error=False so it doesn't require authentication
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login", auto_error=False)
 
+async def _load_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    """Resolve a user id through the auth cache, falling back to the database
+
+    On a cache hit the returned User is transient and only carries id,
+    username, role and is_active; routes that need the full row must
+    load it explicitly.
+    """
+    await user_auth_cache.sync()
+    cached = user_auth_cache.get(user_id)
+    if cached is not None:
+        return cached.to_user()
+    
+    result = await db.execute(
+        select(User).where(User.id == user_id)
+    )
+    user = result.scalar_one_or_none()
+    
+    if user is not None:
+        user_auth_cache.set(user)
+    
+    return user
+
 async def get_current_user(
     db: Annotated[AsyncSession, Depends(get_db)],
     token: Annotated[str, Depends(oauth2_scheme)]
@@ -27,19 +53,17 @@ async def get_current_user(
         raise credentials_exception
     
     # Verify token
-    payload = verify_token(token, token_type="access")
-    if payload is None:
+    with profile_span("jwt"):
+        payload = verify_token(token, token_type="access")
+    if payload is None or await token_denylist.is_token_revoked(payload):
         raise credentials_exception
     
     user_id: str = payload.get("sub")
     if user_id is None:
         raise credentials_exception
     
-    # Get user from database
-    result = await db.execute(
-        select(User).where(User.id == int(user_id))
-    )
-    user = result.scalar_one_or_none()
+    # Get user from cache or database
+    user = await _load_user(db, int(user_id))
     
     if user is None:
         raise credentials_exception
@@ -50,6 +74,8 @@ async def get_current_user(
             detail="Inactive user"
         )
     
+    set_audit_actor(user.id)
+    set_profile_user(user)
     return user
 
 async def get_current_active_user(
@@ -97,21 +123,20 @@ async def get_current_user_optional(
     
     try:
         # Verify token
-        payload = verify_token(token, token_type="access")
-        if payload is None:
+        with profile_span("jwt"):
+            payload = verify_token(token, token_type="access")
+        if payload is None or await token_denylist.is_token_revoked(payload):
             return None
         
         user_id: str = payload.get("sub")
         if user_id is None:
             return None
         
-        # Get user from database
-        result = await db.execute(
-            select(User).where(User.id == int(user_id))
-        )
-        user = result.scalar_one_or_none()
+        # Get user from cache or database
+        user = await _load_user(db, int(user_id))
         
         if user and user.is_active:
+            set_profile_user(user)
             return user
         
         return None
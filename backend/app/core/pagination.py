@@ -0,0 +1,53 @@
+import json
+import base64
+from typing import Optional
+from fastapi import HTTPException, status
+
+NEXT = "n"
+PREV = "p"
+
+def encode_cursor(last_id: int, direction: str = NEXT) -> str:
+    """Encode a keyset position into an opaque, URL-safe cursor"""
+    raw = json.dumps({"id": last_id, "d": direction}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor into (id, direction); raises 400 on malformed input"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        last_id = int(data["id"])
+        direction = data["d"]
+        if direction not in (NEXT, PREV):
+            raise ValueError(direction)
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+    return last_id, direction
+
+def page_cursors(
+    first_id: Optional[int],
+    last_id: Optional[int],
+    direction: str,
+    has_cursor: bool,
+    has_more: bool
+) -> tuple:
+    """Compute (next_cursor, prev_cursor) for a fetched page
+
+    ``has_more`` tells whether a row exists beyond the page in the
+    direction it was fetched.
+    """
+    if first_id is None:
+        return None, None
+
+    if direction == NEXT:
+        has_next, has_prev = has_more, has_cursor
+    else:
+        has_next, has_prev = True, has_more
+
+    return (
+        encode_cursor(last_id, NEXT) if has_next else None,
+        encode_cursor(first_id, PREV) if has_prev else None,
+    )
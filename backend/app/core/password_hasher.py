@@ -0,0 +1,153 @@
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Optional
+from fastapi import HTTPException, status
+from app.config import get_settings
+from app.core.security import verify_password, get_password_hash
+
+settings = get_settings()
+
+class _QueueTimeout(Exception):
+    """A queued call waited longer than allowed and was not run"""
+
+class LatencyStats:
+    """Count/sum/max plus percentiles over the most recent samples"""
+
+    def __init__(self, window: int = 1000):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._recent: Deque[float] = deque(maxlen=window)
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self._recent.append(seconds)
+
+    def _percentile(self, ordered: list, percentile: float) -> float:
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, int(round(percentile * (len(ordered) - 1))))
+        return round(ordered[index] * 1000, 2)
+
+    def stats(self) -> dict:
+        ordered = sorted(self._recent)
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 2),
+            "p50_ms": self._percentile(ordered, 0.50),
+            "p95_ms": self._percentile(ordered, 0.95),
+            "p99_ms": self._percentile(ordered, 0.99),
+        }
+
+class PasswordHasher:
+    """Runs bcrypt off the event loop in a bounded thread pool
+
+    bcrypt releases the GIL, so a small thread pool gives real parallelism
+    without blocking other requests on the worker. Admission control keeps
+    a login burst from building an unbounded backlog:
+
+    - more than ``max_workers + max_queue`` calls in flight -> 429 with
+      Retry-After, the caller should back off and retry
+    - a call that waited longer than ``queue_timeout`` before a thread
+      picked it up is dropped -> 503 with Retry-After
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, queue_timeout: float):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.in_flight = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.wait = LatencyStats()
+        self.run: Dict[str, LatencyStats] = {
+            "hash": LatencyStats(),
+            "verify": LatencyStats(),
+        }
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="bcrypt"
+            )
+        return self._executor
+
+    def _retry_after(self) -> str:
+        # Rough time to drain the current backlog, at least one second
+        return str(max(1, round(self.run["verify"].stats()["p50_ms"] / 1000
+                                * self.in_flight / self.max_workers)))
+
+    async def _submit(self, operation: str, func: Callable, *args):
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many authentication requests, retry shortly",
+                headers={"Retry-After": self._retry_after()}
+            )
+
+        submitted = time.perf_counter()
+
+        def call():
+            started = time.perf_counter()
+            if started - submitted > self.queue_timeout:
+                raise _QueueTimeout()
+            result = func(*args)
+            return result, started - submitted, time.perf_counter() - started
+
+        self.in_flight += 1
+        try:
+            result, waited, ran = await asyncio.get_running_loop().run_in_executor(
+                self.executor, call
+            )
+        except _QueueTimeout:
+            self.timed_out += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is temporarily overloaded, retry shortly",
+                headers={"Retry-After": self._retry_after()}
+            )
+        finally:
+            self.in_flight -= 1
+
+        self.wait.observe(waited)
+        self.run[operation].observe(ran)
+        return result
+
+    async def hash(self, password: str) -> str:
+        """Hash a password without blocking the event loop"""
+        return await self._submit("hash", get_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop"""
+        return await self._submit("verify", verify_password, password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "queue_wait": self.wait.stats(),
+            "hash": self.run["hash"].stats(),
+            "verify": self.run["verify"].stats(),
+        }
+
+password_hasher = PasswordHasher(
+    max_workers=settings.password_hash_workers,
+    max_queue=settings.password_hash_max_queue,
+    queue_timeout=settings.password_hash_queue_timeout_seconds,
+)
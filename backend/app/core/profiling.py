@@ -0,0 +1,266 @@
+import cProfile
+import io
+import json
+import logging
+import pstats
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from sqlalchemy import event, select
+from starlette.datastructures import MutableHeaders
+from app.database import AsyncSessionLocal
+from app.core.security import verify_token
+from app.core.user_cache import user_auth_cache
+from app.core.revocation import token_denylist
+from app.models import User, UserRole
+
+logger = logging.getLogger(__name__)
+
+# Collapses expanded IN lists so one statement shape is counted once
+_IN_LIST = re.compile(r"\(\s*(?:\$\d+|%\(\w+\)s)(?:\s*,\s*(?:\$\d+|%\(\w+\)s))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_statement(statement: str, max_length: int = 300) -> str:
+    statement = _IN_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+    return statement[:max_length]
+
+@dataclass
+class RequestProfile:
+    """Timings collected for one request"""
+    method: str
+    path: str
+    started: float = field(default_factory=time.perf_counter)
+    status: Optional[int] = None
+    queries: int = 0
+    db_seconds: float = 0.0
+    # normalized statement -> [executions, seconds]
+    statements: Dict[str, List[float]] = field(default_factory=dict)
+    # named phases (e.g. "jwt") -> seconds
+    spans: Dict[str, float] = field(default_factory=dict)
+    user_id: Optional[int] = None
+
+    def record_query(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        entry = self.statements.setdefault(normalize_statement(statement), [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def top_statements(self, limit: int) -> List[dict]:
+        ranked = sorted(self.statements.items(), key=lambda item: item[1][1], reverse=True)
+        return [
+            {"statement": statement, "count": int(count), "ms": round(seconds * 1000, 3)}
+            for statement, (count, seconds) in ranked[:limit]
+        ]
+
+    def server_timing(self) -> str:
+        """Server-Timing header value; "app" is what is left after db and spans"""
+        total = self.elapsed()
+        parts = [f'db;dur={self.db_seconds * 1000:.2f};desc="{self.queries} queries"']
+        parts += [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.spans.items()]
+        other = max(total - self.db_seconds - sum(self.spans.values()), 0.0)
+        parts += [f"app;dur={other * 1000:.2f}", f"total;dur={total * 1000:.2f}"]
+        return ", ".join(parts)
+
+    def to_record(self, top: int) -> dict:
+        return {
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "duration_ms": round(self.elapsed() * 1000, 2),
+            "queries": self.queries,
+            "db_ms": round(self.db_seconds * 1000, 2),
+            "spans_ms": {name: round(seconds * 1000, 2) for name, seconds in self.spans.items()},
+            "user_id": self.user_id,
+            "top_statements": self.top_statements(top),
+        }
+
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar(
+    "request_profile", default=None
+)
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current_profile.get()
+
+@contextmanager
+def profile_span(name: str):
+    """Time a block as a named Server-Timing entry (no-op when not profiling)"""
+    profile = _current_profile.get()
+    if profile is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.spans[name] = profile.spans.get(name, 0.0) + time.perf_counter() - started
+
+def set_profile_user(user) -> None:
+    """Record who made the request in the slow request log"""
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.user_id = user.id
+
+async def _is_admin(authorization: Optional[bytes]) -> bool:
+    """Whether a bearer token belongs to an active admin"""
+    scheme, _, token = (authorization or b"").decode("latin-1").partition(" ")
+    payload = verify_token(token) if scheme.lower() == "bearer" else None
+    if payload is None or payload.get("sub") is None:
+        return False
+    if await token_denylist.is_token_revoked(payload):
+        return False
+    user_id = int(payload["sub"])
+
+    await user_auth_cache.sync()
+    cached = user_auth_cache.get(user_id)
+    if cached is not None:
+        return cached.is_active and cached.role == UserRole.ADMIN
+    async with AsyncSessionLocal() as db:
+        row = (await db.execute(
+            select(User.role, User.is_active).where(User.id == user_id)
+        )).one_or_none()
+    return row is not None and row.is_active and row.role == UserRole.ADMIN
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profiling_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    started = conn.info.get("profiling_started")
+    if profile is not None and started:
+        profile.record_query(statement, time.perf_counter() - started.pop())
+
+def instrument_engine(engine) -> None:
+    """Attribute every statement run on ``engine`` to the current request"""
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+class _Profiler:
+    """cProfile, or pyinstrument when asked for and installed"""
+
+    def __init__(self, mode: str):
+        self.kind = "cprofile"
+        if mode == "pyinstrument":
+            try:
+                # Optional: only needed for flame-style HTML output
+                from pyinstrument import Profiler
+                self._profiler = Profiler(async_mode="enabled")
+                self.kind = "pyinstrument"
+            except ImportError:
+                pass
+        if self.kind == "cprofile":
+            self._profiler = cProfile.Profile()
+
+    def start(self) -> None:
+        if self.kind == "pyinstrument":
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self) -> None:
+        if self.kind == "pyinstrument":
+            self._profiler.stop()
+        else:
+            self._profiler.disable()
+
+    def render(self, limit: int = 60) -> tuple:
+        """(media type, body) of the report"""
+        if self.kind == "pyinstrument":
+            return "text/html", self._profiler.output_html().encode()
+        out = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=out)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return "text/plain", out.getvalue().encode()
+
+class ProfilingMiddleware:
+    """Opt-in per-request instrumentation (pure ASGI)
+
+    Every request gets a Server-Timing header with DB time and query count,
+    named spans (see ``profile_span``) and the remainder; requests slower
+    than ``slow_request_ms`` are logged as one JSON record with their most
+    expensive statements.
+
+    An admin request carrying ``header`` ("cprofile" or "pyinstrument") is
+    run under a profiler and answered with the profile report instead of
+    its response; the header is ignored for everyone else. The profiler
+    sees everything the worker does meanwhile, so only one request is
+    profiled at a time and results are clearest on a quiet worker.
+    """
+
+    def __init__(
+        self,
+        app,
+        slow_request_ms: float = 500.0,
+        top_statements: int = 5,
+        header: str = "X-Profile"
+    ):
+        self.app = app
+        self.slow_request_ms = slow_request_ms
+        self.top_statements = top_statements
+        self.header = header.lower().encode("latin-1")
+        self._profiling = False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        profile = RequestProfile(scope["method"], scope["path"])
+        token = _current_profile.set(profile)
+
+        headers = dict(scope.get("headers") or [])
+        mode = headers.get(self.header)
+        profiler = None
+        if mode and not self._profiling and await _is_admin(headers.get(b"authorization")):
+            self._profiling = True
+            profiler = _Profiler(mode.decode("latin-1").strip().lower())
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                MutableHeaders(scope=message).append("Server-Timing", profile.server_timing())
+            # A profiled request is answered with the report instead
+            if profiler is None:
+                await send(message)
+
+        try:
+            if profiler is not None:
+                profiler.start()
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                if profiler is not None:
+                    profiler.stop()
+                    self._profiling = False
+                _current_profile.reset(token)
+
+            if profiler is not None:
+                await self._send_report(send, profiler, profile)
+        finally:
+            if profile.elapsed() * 1000 >= self.slow_request_ms:
+                logger.warning(
+                    "Slow request %s", json.dumps(profile.to_record(self.top_statements))
+                )
+
+    @staticmethod
+    async def _send_report(send, profiler: _Profiler, profile: RequestProfile) -> None:
+        media_type, body = profiler.render()
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", f"{media_type}; charset=utf-8".encode()),
+                (b"content-length", str(len(body)).encode()),
+                (b"server-timing", profile.server_timing().encode()),
+                (b"x-profiled-status", str(profile.status).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
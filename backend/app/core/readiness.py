@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional
+from sqlalchemy import text
+from app.config import get_settings
+from app.cache import get_cache_backend
+from app.database import engine
+from app.db_metrics import pool_stats
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CheckResult:
+    """Outcome of one dependency check"""
+    ok: bool
+    latency_ms: float
+    checked_at: str
+    error: Optional[str] = None
+    details: Dict = field(default_factory=dict)
+
+class ReadinessChecker:
+    """Checks dependencies in the background and serves the last result
+
+    Probes only read the stored snapshot, so they cost nothing however
+    often the orchestrator calls them. Postgres is pinged through the
+    app's own pool, so an exhausted pool shows up as a failed check
+    (checkout timeout) just as it would for a request. Redis is checked
+    when it is the cache backend. A snapshot older than ``stale_after``
+    seconds counts as not ready: the checker itself may be stuck.
+    """
+
+    def __init__(self, interval: float, timeout: float, stale_after: float):
+        self.interval = interval
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.results: Dict[str, CheckResult] = {}
+        self.last_run: Optional[float] = None
+        self._timeouts_seen = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def checks(self) -> Dict[str, Callable[[], Awaitable[dict]]]:
+        checks = {"postgres": self._check_postgres, "db_pool": self._check_pool}
+        if settings.cache_backend == "redis":
+            checks["redis"] = self._check_redis
+        return checks
+
+    async def _check_postgres(self) -> dict:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+        return {}
+
+    async def _check_redis(self) -> dict:
+        if not await get_cache_backend().ping():
+            raise RuntimeError("PING failed")
+        return {}
+
+    async def _check_pool(self) -> dict:
+        """Fails while requests are timing out waiting for a connection"""
+        stats = pool_stats(engine)
+        timeouts = stats["timeouts"] - self._timeouts_seen
+        self._timeouts_seen = stats["timeouts"]
+        details = {
+            "checked_out": stats.get("checked_out"),
+            "max_connections": stats.get("max_connections"),
+            "checkout_timeouts": timeouts,
+        }
+        if timeouts:
+            raise RuntimeError(f"{timeouts} checkout timeouts since the last check")
+        return details
+
+    async def _run_check(self, check: Callable[[], Awaitable[dict]]) -> CheckResult:
+        started = time.perf_counter()
+        try:
+            details = await asyncio.wait_for(check(), self.timeout)
+            error = None
+        except asyncio.TimeoutError:
+            details, error = {}, f"timed out after {self.timeout}s"
+        except Exception as exc:
+            details, error = {}, f"{type(exc).__name__}: {exc}"
+        return CheckResult(
+            ok=error is None,
+            latency_ms=round((time.perf_counter() - started) * 1000, 2),
+            checked_at=datetime.now().isoformat(timespec="seconds"),
+            error=error,
+            details=details
+        )
+
+    async def run_checks(self) -> Dict[str, CheckResult]:
+        checks = self.checks
+        results = await asyncio.gather(*(self._run_check(check) for check in checks.values()))
+        for name, result in zip(checks, results):
+            if not result.ok and self.results.get(name, result).ok:
+                logger.warning("Readiness check %s failed: %s", name, result.error)
+        self.results = dict(zip(checks, results))
+        self.last_run = time.monotonic()
+        return self.results
+
+    def snapshot(self) -> dict:
+        """Last results; ``ready`` is False until a fresh, all-green run exists"""
+        age = time.monotonic() - self.last_run if self.last_run is not None else None
+        fresh = age is not None and age <= self.stale_after
+        return {
+            "ready": fresh and all(result.ok for result in self.results.values()),
+            "age_seconds": round(age, 2) if age is not None else None,
+            "checks": {name: asdict(result) for name, result in self.results.items()},
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_checks()
+            except Exception:
+                logger.exception("Readiness checks failed to run")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+readiness_checker = ReadinessChecker(
+    interval=settings.readiness_check_interval_seconds,
+    timeout=settings.readiness_check_timeout_seconds,
+    stale_after=settings.readiness_stale_after_seconds,
+)
@@ -0,0 +1,41 @@
+import os
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+import anyio
+import orjson
+from fastapi.responses import FileResponse, JSONResponse
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson
+
+    Serializes datetimes, enums and numpy scalars natively and is several
+    times faster than the stdlib encoder on large lists.
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+
+class ArtifactFileResponse(FileResponse):
+    """FileResponse for evictable cache files
+
+    If the file was deleted (e.g. evicted by another process) between the
+    lookup and sending, ``recreate`` is awaited for a new path instead of
+    failing with a 500.
+    """
+
+    def __init__(self, path: Path, recreate: Callable[[], Awaitable[Path]], **kwargs):
+        super().__init__(path, **kwargs)
+        self.recreate = recreate
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+        except FileNotFoundError:
+            self.path = await self.recreate()
+            stat_result = await anyio.to_thread.run_sync(os.stat, self.path)
+        self.stat_result = stat_result
+        self.set_stat_headers(stat_result)
+        await super().__call__(scope, receive, send)
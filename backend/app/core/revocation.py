@@ -0,0 +1,242 @@
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from typing import Dict, Iterable, Optional
+from app.config import get_settings
+from app.cache import get_cache_backend
+from app.metrics import TOKEN_REVOCATION_CHECKS
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+class BloomFilter:
+    """Fixed-size bloom filter over strings (no false negatives)"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = max(capacity, 1)
+        self.size = max(64, int(-self.capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str) -> Iterable[int]:
+        # Double hashing: k positions from one 128-bit digest
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+class TokenDenylist:
+    """Revoked token ids, shared through the cache backend
+
+    Every revocation is stored twice in the backend: as ``<prefix>:id:<id>``
+    (the authoritative entry, expiring with the token) and as the next
+    entry of an append-only log (``<prefix>:log:<seq>``, numbered by an
+    INCR counter). Each worker mirrors the log into a local bloom filter,
+    reading only the entries added since its last sync, so checking a
+    token that was never revoked is one in-memory probe. A bloom hit is
+    confirmed against the backend before the token is refused.
+
+    Ids are namespaced: ``jti:<jti>`` revokes one token, ``fam:<family>``
+    every token issued from one login (see refresh rotation in api.auth).
+    A revocation made on another worker takes effect here within
+    ``sync_interval`` seconds; on this worker, immediately.
+
+    Publishing takes two backend calls (INCR, then SET of the entry), so a
+    sync can see a sequence number whose entry is not written yet. Missing
+    entries newer than the last sync are kept pending and re-read on every
+    sync; only one still missing after ``pending_grace`` seconds is taken
+    as expired.
+    """
+
+    def __init__(
+        self,
+        prefix: str,
+        capacity: int,
+        error_rate: float,
+        sync_interval: float,
+        sync_batch_size: int = 500,
+        pending_grace: float = 30.0
+    ):
+        self.prefix = prefix
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.sync_batch_size = sync_batch_size
+        self.pending_grace = pending_grace
+        self.bloom = BloomFilter(capacity, error_rate)
+        self._synced_seq = 0
+        # Log entries below this one have all expired
+        self._floor_seq = 1
+        # seq -> when its missing entry was first seen
+        self._pending: Dict[int, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _key(self, item: str) -> str:
+        return f"{self.prefix}:id:{item}"
+
+    def _log_key(self, seq: int) -> str:
+        return f"{self.prefix}:log:{seq}"
+
+    @property
+    def _seq_key(self) -> str:
+        return f"{self.prefix}:seq"
+
+    async def revoke(self, item: str, expires_at: float) -> bool:
+        """Revoke an id until ``expires_at`` (epoch seconds)
+
+        Returns False if it was already revoked; the check and the write
+        are one atomic add, so two concurrent callers never both get True.
+        """
+        ttl = expires_at - time.time()
+        if ttl <= 0:
+            return True
+        backend = get_cache_backend()
+        if not await backend.add(self._key(item), b"1", ttl):
+            return False
+        seq = await backend.incr(self._seq_key)
+        await backend.set(self._log_key(seq), item.encode(), ttl)
+        self.bloom.add(item)
+        return True
+
+    async def is_revoked(self, *items: Optional[str]) -> bool:
+        """Whether any of the ids is revoked"""
+        candidates = [item for item in items if item and item in self.bloom]
+        if not candidates:
+            TOKEN_REVOCATION_CHECKS.labels("clear").inc()
+            return False
+        values = await get_cache_backend().get_many([self._key(item) for item in candidates])
+        if any(value is not None for value in values):
+            TOKEN_REVOCATION_CHECKS.labels("revoked").inc()
+            return True
+        TOKEN_REVOCATION_CHECKS.labels("false_positive").inc()
+        return False
+
+    async def revoke_token(self, payload: dict) -> bool:
+        """Revoke one decoded token; False if it was already revoked"""
+        jti = payload.get("jti")
+        if not jti:
+            return True
+        return await self.revoke(f"jti:{jti}", payload["exp"])
+
+    async def revoke_family(self, payload: dict) -> None:
+        """Revoke every access and refresh token sharing the token's family"""
+        family = payload.get("fam")
+        if family:
+            # No token of the family outlives a refresh token issued now
+            expires_at = time.time() + settings.refresh_token_expire_days * 86400
+            await self.revoke(f"fam:{family}", expires_at)
+
+    async def is_token_revoked(self, payload: dict) -> bool:
+        jti, family = payload.get("jti"), payload.get("fam")
+        return await self.is_revoked(jti and f"jti:{jti}", family and f"fam:{family}")
+
+    async def is_family_revoked(self, payload: dict) -> bool:
+        family = payload.get("fam")
+        return await self.is_revoked(family and f"fam:{family}")
+
+    async def _read_log(self, bloom: BloomFilter, seqs: list, synced: int) -> None:
+        """Add the log entries ``seqs`` to ``bloom``
+
+        A missing entry above ``synced`` (or already pending) may still be
+        being written and becomes pending; any other missing entry expired
+        along with its token.
+        """
+        backend = get_cache_backend()
+        now = time.monotonic()
+        leading = bool(seqs) and seqs[0] == self._floor_seq
+        for start in range(0, len(seqs), self.sync_batch_size):
+            batch = seqs[start:start + self.sync_batch_size]
+            values = await backend.get_many([self._log_key(seq) for seq in batch])
+            for seq, value in zip(batch, values):
+                if value is None:
+                    if seq > synced or seq in self._pending:
+                        self._pending.setdefault(seq, now)
+                        leading = False
+                    elif leading:
+                        self._floor_seq = seq + 1
+                    continue
+                self._pending.pop(seq, None)
+                leading = False
+                item = value.decode()
+                # Revocations made by this worker are in the filter already
+                if item not in bloom:
+                    bloom.add(item)
+
+    async def sync(self) -> None:
+        """Add revocations logged since the last sync to the bloom filter"""
+        seq = int(await get_cache_backend().get(self._seq_key) or 0)
+        synced = self._synced_seq
+        now = time.monotonic()
+        self._pending = {
+            pending: seen for pending, seen in self._pending.items()
+            if now - seen < self.pending_grace
+        }
+        if seq < synced or self.bloom.count > self.bloom.capacity:
+            # Backend was reset, or the filter is too full to stay accurate:
+            # rebuild from the entries that have not expired yet
+            if seq < synced:
+                self._floor_seq = 1
+                self._pending.clear()
+                synced = 0
+            live = seq - self._floor_seq + 1
+            bloom = BloomFilter(max(self.capacity, 2 * live), self.error_rate)
+            await self._read_log(bloom, list(range(self._floor_seq, seq + 1)), synced)
+            self.bloom = bloom
+        elif seq > synced or self._pending:
+            seqs = sorted(self._pending) + list(range(synced + 1, seq + 1))
+            await self._read_log(self.bloom, seqs, synced)
+        self._synced_seq = seq
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+            except Exception:
+                logger.exception("Token denylist sync failed")
+
+    async def start(self) -> None:
+        if self._task is not None:
+            return
+        try:
+            await self.sync()
+        except Exception:
+            logger.exception("Initial token denylist sync failed")
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "synced_seq": self._synced_seq,
+            "pending_entries": len(self._pending),
+            "bloom_entries": self.bloom.count,
+            "bloom_bits": self.bloom.size,
+            "bloom_hashes": self.bloom.hashes,
+        }
+
+token_denylist = TokenDenylist(
+    prefix=f"{settings.cache_key_prefix}:revoked",
+    capacity=settings.token_revocation_bloom_capacity,
+    error_rate=settings.token_revocation_bloom_error_rate,
+    sync_interval=settings.token_revocation_sync_seconds,
+)
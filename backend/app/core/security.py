@@ -1,3 +1,4 @@
+import uuid
 from datetime import datetime, timedelta, timezone
 from typing import Optional, Union
 from jose import JWTError, jwt
@@ -22,7 +23,7 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
         expire = datetime.now(timezone.utc) + timedelta(
             minutes=settings.access_token_expire_minutes
         )
-    to_encode.update({"exp": expire, "type": "access"})
+    to_encode.update({"exp": expire, "type": "access", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -32,7 +33,7 @@ def create_refresh_token(data: dict) -> str:
     expire = datetime.now(timezone.utc) + timedelta(
         days=settings.refresh_token_expire_days
     )
-    to_encode.update({"exp": expire, "type": "refresh"})
+    to_encode.update({"exp": expire, "type": "refresh", "jti": uuid.uuid4().hex})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
@@ -54,9 +55,13 @@ def get_password_hash(password: str) -> str:
     """Hash a password"""
     return pwd_context.hash(password)
 
-def create_tokens(user_id: int, username: str) -> dict:
-    """Create both access and refresh tokens"""
-    token_data = {"sub": str(user_id), "username": username}
+def create_tokens(user_id: int, username: str, family: Optional[str] = None) -> dict:
+    """Create both access and refresh tokens
+
+    Tokens refreshed from one login share its ``fam`` claim, so the whole
+    chain can be revoked at once (logout, refresh token reuse).
+    """
+    token_data = {"sub": str(user_id), "username": username, "fam": family or uuid.uuid4().hex}
     
     return {
         "access_token": create_access_token(token_data),
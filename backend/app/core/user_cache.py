@@ -0,0 +1,159 @@
+import time
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import event, inspect
+from app.config import get_settings
+from app.cache import get_cache
+from app.metrics import cache_metrics
+from app.models import User, UserRole
+
+settings = get_settings()
+
+@dataclass(frozen=True)
+class CachedUser:
+    """Snapshot of the user fields needed to authorize a request"""
+    id: int
+    username: str
+    role: UserRole
+    is_active: bool
+    expires_at: float
+
+    def to_user(self) -> User:
+        """Build a transient (session-less) User from the snapshot"""
+        return User(
+            id=self.id,
+            username=self.username,
+            role=self.role,
+            is_active=self.is_active,
+        )
+
+class UserAuthCache:
+    """Bounded LRU cache with TTL for authenticated user lookups
+
+    Each worker has its own copy. ``invalidate_user`` bumps the shared
+    "user_auth" namespace version, and a worker that sees a new version in
+    ``sync`` drops all its entries, so a change made on one worker reaches
+    the others within the namespace's version check window.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[int, CachedUser]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.metrics = cache_metrics("user_auth")
+        self._version: Optional[int] = None
+
+    async def sync(self) -> None:
+        """Drop every entry if another worker invalidated a user"""
+        version = await get_cache("user_auth").version()
+        if version != self._version:
+            if self._version is not None:
+                self.clear()
+            self._version = version
+
+    def get(self, user_id: int) -> Optional[CachedUser]:
+        """Return the cached entry for a user, or None if missing/expired"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                self.metrics.miss()
+                return None
+            if entry.expires_at <= now:
+                del self._entries[user_id]
+                self.misses += 1
+                self.metrics.miss()
+                return None
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            self.metrics.hit()
+            return entry
+
+    def set(self, user: User) -> CachedUser:
+        """Cache the authorization fields of a loaded user"""
+        entry = CachedUser(
+            id=user.id,
+            username=user.username,
+            role=user.role,
+            is_active=user.is_active,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        if self.max_size <= 0 or self.ttl_seconds <= 0:
+            return entry
+        with self._lock:
+            self._entries[user.id] = entry
+            self._entries.move_to_end(user.id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def invalidate(self, user_id: int) -> None:
+        """Drop a user so the next request reloads it from the database"""
+        with self._lock:
+            if self._entries.pop(user_id, None) is not None:
+                self.invalidations += 1
+
+    async def invalidate_everywhere(self, user_id: int) -> None:
+        """Drop a user here and make every other worker drop its entries"""
+        self.invalidate(user_id)
+        # Adopt our own bump so this worker keeps its other entries
+        self._version = await get_cache("user_auth").invalidate()
+
+    def clear(self) -> None:
+        """Drop every cached user"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Counters for monitoring"""
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.misses
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+user_auth_cache = UserAuthCache(
+    max_size=settings.user_cache_max_size,
+    ttl_seconds=settings.user_cache_ttl_seconds,
+)
+
+async def invalidate_user(user_id: int) -> None:
+    """Invalidation hook for code that changes a user's role or active flag
+
+    Call after the commit: drops the entry here and tells every other
+    worker to drop its cached users.
+    """
+    await user_auth_cache.invalidate_everywhere(user_id)
+
+# Any flush that changes authorization fields (services, scripts, admin
+# tools) drops the cached entry on this worker, so the change applies on
+# its next request; other workers only hear of it through invalidate_user.
+_AUTH_FIELDS = ("is_active", "role", "username")
+
+@event.listens_for(User, "after_update")
+def _invalidate_on_update(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[field].history.has_changes() for field in _AUTH_FIELDS):
+        user_auth_cache.invalidate(target.id)
+
+@event.listens_for(User, "after_delete")
+def _invalidate_on_delete(mapper, connection, target):
+    user_auth_cache.invalidate(target.id)
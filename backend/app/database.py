@@ -1,12 +1,20 @@
+from sqlalchemy.exc import DBAPIError, DataError, IntegrityError
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import declarative_base, sessionmaker
 from app.config import get_settings
+from app.db_metrics import InstrumentedPool
 
 settings = get_settings()
 
 engine = create_async_engine(
     settings.database_url,
     echo=settings.debug,
+    poolclass=InstrumentedPool,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
 )
 
 AsyncSessionLocal = sessionmaker(
@@ -17,6 +25,17 @@ AsyncSessionLocal = sessionmaker(
 
 Base = declarative_base()
 
+def is_data_error(exc: BaseException) -> bool:
+    """Whether the database rejected the rows themselves (SQLSTATE class 22/23)
+
+    asyncpg reports data exceptions such as a value too long as a plain
+    DBAPIError, so the SQLSTATE is checked as well as the exception type.
+    """
+    if isinstance(exc, (IntegrityError, DataError)):
+        return True
+    sqlstate = getattr(getattr(exc, "orig", None), "sqlstate", None) or ""
+    return isinstance(exc, DBAPIError) and sqlstate[:2] in ("22", "23")
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         try:
@@ -0,0 +1,108 @@
+import os
+import time
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, List, Tuple
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Upper bounds (seconds) of the checkout wait histogram buckets
+WAIT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0
+)
+
+class PoolMetrics:
+    """Checkout counters and a wait-time histogram for one worker's pool"""
+
+    def __init__(self, buckets: Tuple[float, ...] = WAIT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._listeners: List[Callable[[float, bool], None]] = []
+        self.reset()
+
+    def add_listener(self, listener: Callable[[float, bool], None]) -> None:
+        """Also pass every checkout wait (and whether it timed out) to ``listener``"""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.bucket_counts = [0] * (len(self.buckets) + 1)
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_sum = 0.0
+            self.wait_max = 0.0
+
+    def observe(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_sum += wait_seconds
+            self.wait_max = max(self.wait_max, wait_seconds)
+            self.bucket_counts[bisect_left(self.buckets, wait_seconds)] += 1
+        for listener in self._listeners:
+            listener(wait_seconds, False)
+
+    def observe_timeout(self, wait_seconds: float) -> None:
+        with self._lock:
+            self.timeouts += 1
+            self.wait_max = max(self.wait_max, wait_seconds)
+        for listener in self._listeners:
+            listener(wait_seconds, True)
+
+    def histogram(self) -> Dict[str, int]:
+        """Cumulative counts keyed by bucket upper bound, Prometheus style"""
+        histogram = {}
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.bucket_counts):
+            total += count
+            histogram["+Inf" if bound == float("inf") else str(bound)] = total
+        return histogram
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_sum": round(self.wait_sum, 6),
+                "wait_seconds_max": round(self.wait_max, 6),
+                "wait_seconds_avg": (
+                    round(self.wait_sum / self.checkouts, 6) if self.checkouts else 0.0
+                ),
+                "wait_seconds_histogram": self.histogram(),
+            }
+
+pool_metrics = PoolMetrics()
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waited
+
+    The time measured covers waiting for a free connection and, when the
+    pool grows into its overflow, opening the new connection.
+    """
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_metrics.observe_timeout(time.perf_counter() - started)
+            raise
+        pool_metrics.observe(time.perf_counter() - started)
+        return connection
+
+def pool_stats(engine) -> dict:
+    """Current pool occupancy plus the accumulated checkout metrics"""
+    pool = engine.sync_engine.pool
+    stats = {"pid": os.getpid(), "pool_class": type(pool).__name__}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update({
+            "pool_size": pool.size(),
+            "max_overflow": pool._max_overflow,
+            "max_connections": pool.size() + max(pool._max_overflow, 0),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "timeout_seconds": pool.timeout(),
+        })
+    stats.update(pool_metrics.stats())
+    return stats
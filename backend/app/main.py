@@ -1,16 +1,47 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Response
+from app.core.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import get_settings
-from app.api import auth, categories, sub_themes, questions
+from app.cache import close_cache_backend
+from app.core.password_hasher import password_hasher
+from app.core.audit import audit_writer, AuditContextMiddleware
+from app.core.readiness import readiness_checker
+from app.core.revocation import token_denylist
+from app.core.profiling import ProfilingMiddleware, instrument_engine
+from app.database import engine
+from app.metrics import CONTENT_TYPE_LATEST, MetricsMiddleware, instrument_pool, render_metrics
+from app.services.response_buffer import response_buffer
+from app.services.report_service import report_worker
+from app.api import auth, categories, sub_themes, questions, admin, catalog, assessments
 
 
 settings = get_settings()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    response_buffer.start()
+    await audit_writer.start()
+    readiness_checker.start()
+    await token_denylist.start()
+    if settings.report_worker_embedded:
+        report_worker.start()
+    yield
+    await readiness_checker.stop()
+    await token_denylist.stop()
+    await report_worker.stop()
+    await response_buffer.stop()
+    await audit_writer.stop()
+    await close_cache_backend()
+    password_hasher.shutdown()
+
 app = FastAPI(
     title=settings.app_name,
     version=settings.version,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
 # Include routers
@@ -18,6 +49,9 @@ app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(categories.router, prefix="/api/categories", tags=["categories"])
 app.include_router(sub_themes.router, prefix="/api/sub-themes", tags=["sub-themes"])
 app.include_router(questions.router, prefix="/api/questions", tags=["questions"])
+app.include_router(assessments.router, prefix="/api/assessments", tags=["assessments"])
+app.include_router(catalog.router, prefix="/api/catalog", tags=["catalog"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 
 # CORS
 app.add_middleware(
@@ -27,15 +61,44 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(AuditContextMiddleware)
+if settings.profiling_enabled:
+    instrument_engine(engine)
+    app.add_middleware(
+        ProfilingMiddleware,
+        slow_request_ms=settings.profiling_slow_request_ms,
+        top_statements=settings.profiling_top_statements,
+        header=settings.profiling_header,
+    )
+if settings.metrics_enabled:
+    instrument_pool(engine)
+    app.add_middleware(MetricsMiddleware)
 
 @app.get("/")
 async def root():
     return {"message": f"{settings.app_name} API", "version": settings.version}
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus exposition, aggregated over workers in multiprocess mode"""
+    if not settings.metrics_enabled:
+        return Response(status_code=404)
+    return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Last background dependency check; 503 until everything is healthy"""
+    snapshot = readiness_checker.snapshot()
+    return ORJSONResponse(
+        snapshot,
+        status_code=200 if snapshot["ready"] else 503,
+        headers={"Cache-Control": "no-store"}
+    )
+
 @app.get("/test/db")
 async def test_database():
     """Test database connectivity and basic queries"""
@@ -0,0 +1,184 @@
+"""Prometheus metrics of this app
+
+Works across several uvicorn/gunicorn workers through prometheus_client's
+multiprocess mode: set ``PROMETHEUS_MULTIPROC_DIR`` to an empty, writable
+directory in the environment of the server (before it starts, and wiped
+between deployments). Every worker then writes its samples there and
+``/metrics`` aggregates all of them, whichever worker serves the scrape.
+Under gunicorn, call ``mark_process_dead(worker.pid)`` from the
+``child_exit`` hook so gauges of dead workers are dropped.
+
+Kept outside app.core so low-level modules (cache, pool) can import it
+without pulling in the auth dependencies.
+"""
+import os
+import time
+from typing import Dict
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+from app.db_metrics import WAIT_BUCKETS, pool_metrics
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# HTTP
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Request latency by route template",
+    ["method", "route", "status"], buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "Requests being served",
+    ["method"], multiprocess_mode="livesum"
+)
+
+# Auth
+AUTH_LOGINS = Counter("auth_logins_total", "Login attempts", ["result"])
+AUTH_TOKEN_REFRESHES = Counter("auth_token_refreshes_total", "Token refreshes", ["result"])
+TOKEN_REVOCATION_CHECKS = Counter(
+    "auth_token_revocation_checks_total",
+    "Denylist checks by outcome (clear = bloom filter miss, no backend call)", ["result"]
+)
+
+# Assessments
+ASSESSMENT_EVENTS = Counter(
+    "assessment_sessions_total", "Assessment sessions started and completed", ["event"]
+)
+ASSESSMENT_ANSWERS = Counter(
+    "assessment_answers_total", "Submitted answers", ["result"]
+)
+
+# Database pool
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out", "Connections in use",
+    multiprocess_mode="livesum"
+)
+DB_POOL_CONNECTIONS = Gauge(
+    "db_pool_connections_open", "Connections held by the pool, in use or idle",
+    multiprocess_mode="livesum"
+)
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pool connection",
+    buckets=WAIT_BUCKETS
+)
+DB_POOL_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up waiting"
+)
+
+# Caches
+CACHE_REQUESTS = Counter(
+    "cache_requests_total", "Cache lookups by cache and outcome", ["cache", "result"]
+)
+
+class CacheMetrics:
+    """Hit/miss counters of one cache layer, see ``cache_metrics``"""
+
+    def __init__(self, name: str):
+        self._hits = CACHE_REQUESTS.labels(name, "hit")
+        self._misses = CACHE_REQUESTS.labels(name, "miss")
+
+    def hit(self, count: int = 1) -> None:
+        self._hits.inc(count)
+
+    def miss(self, count: int = 1) -> None:
+        self._misses.inc(count)
+
+_cache_metrics: Dict[str, CacheMetrics] = {}
+
+def cache_metrics(name: str) -> CacheMetrics:
+    """Counters for a cache layer; call ``hit()``/``miss()`` on every lookup"""
+    metrics = _cache_metrics.get(name)
+    if metrics is None:
+        metrics = _cache_metrics[name] = CacheMetrics(name)
+    return metrics
+
+def _observe_checkout(wait_seconds: float, timed_out: bool) -> None:
+    if timed_out:
+        DB_POOL_TIMEOUTS.inc()
+    else:
+        DB_POOL_CHECKOUT_WAIT.observe(wait_seconds)
+
+def instrument_pool(engine) -> None:
+    """Keep the pool gauges current and export checkout waits
+
+    Gauges follow pool events rather than being read at scrape time, so
+    every worker's value stays right in multiprocess mode.
+    """
+    pool = engine.sync_engine.pool
+    pool_metrics.add_listener(_observe_checkout)
+    if not isinstance(pool, QueuePool):
+        return
+
+    # Pool state is not final yet inside these events, so count the events
+    event.listen(pool, "checkout", lambda *args: DB_POOL_CHECKED_OUT.inc())
+    event.listen(pool, "checkin", lambda *args: DB_POOL_CHECKED_OUT.dec())
+    event.listen(pool, "connect", lambda *args: DB_POOL_CONNECTIONS.inc())
+    event.listen(pool, "close", lambda *args: DB_POOL_CONNECTIONS.dec())
+    event.listen(pool, "close_detached", lambda *args: DB_POOL_CONNECTIONS.dec())
+
+def route_template(scope) -> str:
+    """Full path template of the matched route, e.g. /api/questions/{question_id}
+
+    Included routers are matched as nested routers, so the route only knows
+    its own part of the path; the prefix is recovered from the request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path_format", None)
+    if template is None:
+        return "unmatched"
+    try:
+        relative = template.format(**scope.get("path_params", {}))
+    except (KeyError, IndexError, ValueError):
+        return template
+    path = scope["path"]
+    if relative and path.endswith(relative):
+        return path[:len(path) - len(relative)] + template
+    return template
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing every request by its route template
+
+    Paths that match no route share the "unmatched" label, so scans of
+    random URLs cannot blow up the series count.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        method = scope["method"]
+        status_code = 500
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_progress.dec()
+            HTTP_REQUEST_DURATION.labels(
+                method, route_template(scope), str(status_code)
+            ).observe(time.perf_counter() - started)
+
+def render_metrics() -> bytes:
+    """Exposition of this worker, or of all workers in multiprocess mode"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+def mark_process_dead(pid: int) -> None:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
@@ -1,7 +1,7 @@
 from app.models.base import TimestampMixin, IdMixin
 from app.models.enums import (
     UserRole, QuestionType, DifficultyLevel, 
-    AssessmentStatus, ReportType
+    AssessmentStatus, ReportType, ReportStatus, RegradeStatus
 )
 from app.models.user import User
 from app.models.category import Category
@@ -13,11 +13,13 @@ from app.models.question_tag import QuestionTag, question_tag_mapping
 from app.models.assessment_session import AssessmentSession
 from app.models.user_response import UserResponse
 from app.models.response_answer import ResponseAnswer
+from app.models.session_question import SessionQuestion
 from app.models.difficulty_level_progress import DifficultyLevelProgress
 from app.models.category_progress import CategoryProgress
 from app.models.sub_theme_progress import SubThemeProgress
 from app.models.assessment_report import AssessmentReport
 from app.models.audit_log import AuditLog
+from app.models.regrade_job import RegradeJob
 
 # Export all models
 __all__ = [
@@ -31,6 +33,8 @@ __all__ = [
     "DifficultyLevel",
     "AssessmentStatus",
     "ReportType",
+    "ReportStatus",
+    "RegradeStatus",
     
     # Models
     "User",
@@ -44,9 +48,11 @@ __all__ = [
     "AssessmentSession",
     "UserResponse",
     "ResponseAnswer",
+    "SessionQuestion",
     "DifficultyLevelProgress",
     "CategoryProgress",
     "SubThemeProgress",
     "AssessmentReport",
     "AuditLog",
+    "RegradeJob",
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, Text, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.models.base import IdMixin, TimestampMixin
@@ -17,3 +17,7 @@ class AnswerOption(Base, IdMixin, TimestampMixin):
         "ResponseAnswer", 
         back_populates="answer_option"
     )
+    
+    __table_args__ = (
+        Index("ix_answer_options_question_id", "question_id", "display_order"),
+    )
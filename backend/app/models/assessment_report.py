@@ -1,17 +1,38 @@
-from sqlalchemy import Column, Integer, String, DateTime, JSON, ForeignKey, Enum, func
+from sqlalchemy import (
+    Column, Integer, String, DateTime, JSON, Text, ForeignKey, Enum, Index,
+    UniqueConstraint, text
+)
 from sqlalchemy.orm import relationship
 from app.database import Base
-from app.models.base import IdMixin
-from app.models.enums import ReportType
+from app.models.base import IdMixin, TimestampMixin
+from app.models.enums import ReportType, ReportStatus
 
-class AssessmentReport(Base, IdMixin):
+class AssessmentReport(Base, IdMixin, TimestampMixin):
+    """A generated report, and the job that builds it (see ReportService)"""
     __tablename__ = "assessment_reports"
     
     session_id = Column(Integer, ForeignKey("assessment_sessions.id"), nullable=False)
     report_type = Column(Enum(ReportType), nullable=False)
-    generated_at = Column(DateTime, server_default=func.now(), nullable=False)
+    generated_at = Column(DateTime, nullable=True)  # Set when report_data is built
     report_data = Column(JSON)  # Stores structured report data
     pdf_path = Column(String(500))  # Path to generated PDF if applicable
     
+    # Job queue
+    status = Column(Enum(ReportStatus), default=ReportStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)
+    requested_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
     # Relationships
     session = relationship("AssessmentSession", back_populates="reports")
+    
+    __table_args__ = (
+        UniqueConstraint("session_id", "report_type", name="unique_session_report_type"),
+        # Workers pick the oldest waiting job
+        Index(
+            "ix_assessment_reports_queue", "id",
+            postgresql_where=text("status IN ('PENDING', 'RUNNING')")
+        ),
+    )
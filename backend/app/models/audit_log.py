@@ -5,7 +5,8 @@ from app.database import Base
 class AuditLog(Base):
     __tablename__ = "audit_log"
     
-    id = Column(BigInteger, primary_key=True, index=True)
+    # Range-partitioned by month on created_at (see PartitionService)
+    id = Column(BigInteger, primary_key=True, autoincrement=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     action = Column(String(100), nullable=False)
     entity_type = Column(String(50), nullable=True)
@@ -14,7 +15,11 @@ class AuditLog(Base):
     new_values = Column(JSON)
     ip_address = Column(String(45))
     user_agent = Column(Text)
-    created_at = Column(DateTime, server_default=func.now(), nullable=False, index=True)
+    created_at = Column(DateTime, server_default=func.now(), primary_key=True, index=True)
     
     # Relationships
     user = relationship("User")
+    
+    __table_args__ = (
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
@@ -36,3 +36,15 @@ class ReportType(str, enum.Enum):
     SUMMARY = "summary"
     DETAILED = "detailed"
     CERTIFICATE = "certificate"
+
+class RegradeStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+class ReportStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Text, Boolean, ForeignKey, Enum
+from sqlalchemy import Column, Integer, Text, Boolean, ForeignKey, Enum, Index, text
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.models.base import IdMixin, TimestampMixin
@@ -9,10 +9,10 @@ class Question(Base, IdMixin, TimestampMixin):
     
     sub_theme_id = Column(Integer, ForeignKey("sub_themes.id"), nullable=False)
     difficulty_level = Column(Enum(DifficultyLevel), nullable=False)
-    question_type = Column(Enum(QuestionType), nullable=False, index=True)
+    question_type = Column(Enum(QuestionType), nullable=False)
     question_text = Column(Text, nullable=False)
     rationale = Column(Text, nullable=False)
-    is_active = Column(Boolean, default=True, nullable=False, index=True)
+    is_active = Column(Boolean, default=True, nullable=False)
     created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     updated_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     
@@ -34,6 +34,16 @@ class Question(Base, IdMixin, TimestampMixin):
         back_populates="questions"
     )
     
+    __table_args__ = (
+        # Active-question filters (sub-theme, level, type) ordered by id,
+        # the by-category join and the catalog counts
+        Index(
+            "ix_questions_active_lookup",
+            "sub_theme_id", "difficulty_level", "question_type", "id",
+            postgresql_where=text("is_active")
+        ),
+    )
+    
     @property
     def points(self):
         return self.difficulty_level.points
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Table, Integer, ForeignKey
+from sqlalchemy import Column, String, Text, Table, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.models.base import IdMixin, TimestampMixin
@@ -8,7 +8,8 @@ question_tag_mapping = Table(
     'question_tag_mapping',
     Base.metadata,
     Column('question_id', Integer, ForeignKey('questions.id'), primary_key=True),
-    Column('tag_id', Integer, ForeignKey('question_tags.id'), primary_key=True)
+    Column('tag_id', Integer, ForeignKey('question_tags.id'), primary_key=True),
+    Index('ix_question_tag_mapping_tag_id', 'tag_id')
 )
 
 class QuestionTag(Base, IdMixin, TimestampMixin):
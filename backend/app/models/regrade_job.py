@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, DateTime, Enum, JSON, Text, ForeignKey
+from app.database import Base
+from app.models.base import IdMixin, TimestampMixin
+from app.models.enums import RegradeStatus
+
+class RegradeJob(Base, IdMixin, TimestampMixin):
+    __tablename__ = "regrade_jobs"
+    
+    question_ids = Column(JSON, nullable=False)
+    status = Column(
+        Enum(RegradeStatus),
+        default=RegradeStatus.PENDING,
+        nullable=False,
+        index=True
+    )
+    # Checkpoint: every response with a lower or equal id has been re-scored
+    last_response_id = Column(Integer, default=0, nullable=False)
+    total_responses = Column(Integer, default=0, nullable=False)
+    processed_responses = Column(Integer, default=0, nullable=False)
+    changed_responses = Column(Integer, default=0, nullable=False)
+    sessions_rebuilt = Column(Integer, default=0, nullable=False)
+    error = Column(Text, nullable=True)
+    requested_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    
+    @property
+    def progress_percentage(self):
+        if not self.total_responses:
+            return 100.0 if self.status == RegradeStatus.COMPLETED else 0.0
+        return round(self.processed_responses / self.total_responses * 100, 2)
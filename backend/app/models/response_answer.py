@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.models.base import IdMixin
@@ -6,11 +6,17 @@ from app.models.base import IdMixin
 class ResponseAnswer(Base, IdMixin):
     __tablename__ = "response_answers"
     
-    user_response_id = Column(Integer, ForeignKey("user_responses.id"), nullable=False)
+    # No foreign key: user_responses is partitioned and its primary key
+    # includes response_time
+    user_response_id = Column(Integer, nullable=False)
     answer_option_id = Column(Integer, ForeignKey("answer_options.id"), nullable=False)
     
     # Relationships
-    user_response = relationship("UserResponse", back_populates="response_answers")
+    user_response = relationship(
+        "UserResponse",
+        primaryjoin="foreign(ResponseAnswer.user_response_id) == UserResponse.id",
+        back_populates="response_answers"
+    )
     answer_option = relationship("AnswerOption", back_populates="response_answers")
     
     # Constraints
@@ -20,4 +26,5 @@ class ResponseAnswer(Base, IdMixin):
             "answer_option_id", 
             name="unique_response_answer"
         ),
+        Index("ix_response_answers_answer_option_id", "answer_option_id"),
     )
@@ -0,0 +1,17 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from app.database import Base
+
+class SessionQuestion(Base):
+    """One row per question answered in a session
+
+    user_responses is partitioned, so its unique constraint has to include
+    response_time and no longer stops a second answer to the same question.
+    This unpartitioned table carries the one-answer-per-question guarantee:
+    the response buffer claims the pair here before inserting the response.
+    """
+    __tablename__ = "session_questions"
+
+    session_id = Column(
+        Integer, ForeignKey("assessment_sessions.id", ondelete="CASCADE"), primary_key=True
+    )
+    question_id = Column(Integer, ForeignKey("questions.id"), primary_key=True)
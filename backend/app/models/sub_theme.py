@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Text, ForeignKey
+from sqlalchemy import Column, String, Integer, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.models.base import IdMixin, TimestampMixin
@@ -18,3 +18,7 @@ class SubTheme(Base, IdMixin, TimestampMixin):
         back_populates="sub_theme",
         cascade="all, delete-orphan"
     )
+    
+    __table_args__ = (
+        Index("ix_sub_themes_category_id", "category_id", "display_order"),
+    )
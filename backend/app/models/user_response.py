@@ -1,14 +1,17 @@
-from sqlalchemy import Column, Integer, Boolean, DateTime, Numeric, ForeignKey, UniqueConstraint, func
+from sqlalchemy import Column, Integer, Boolean, DateTime, Numeric, ForeignKey, UniqueConstraint, Index, func
 from sqlalchemy.orm import relationship
 from app.database import Base
-from app.models.base import IdMixin
 
-class UserResponse(Base, IdMixin):
+class UserResponse(Base):
     __tablename__ = "user_responses"
     
+    # Range-partitioned by month on response_time (see PartitionService),
+    # so the partition key is part of the primary key and unique constraint;
+    # one answer per question and session is enforced by session_questions
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     session_id = Column(Integer, ForeignKey("assessment_sessions.id"), nullable=False)
     question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
-    response_time = Column(DateTime, server_default=func.now(), nullable=False)
+    response_time = Column(DateTime, server_default=func.now(), primary_key=True)
     time_spent_seconds = Column(Integer, default=0, nullable=False)
     dont_know = Column(Boolean, default=False, nullable=False)
     score_earned = Column(Numeric(10, 2), default=0, nullable=False)
@@ -18,11 +21,17 @@ class UserResponse(Base, IdMixin):
     question = relationship("Question", back_populates="user_responses")
     response_answers = relationship(
         "ResponseAnswer", 
+        primaryjoin="UserResponse.id == foreign(ResponseAnswer.user_response_id)",
         back_populates="user_response",
         cascade="all, delete-orphan"
     )
     
     # Constraints
     __table_args__ = (
-        UniqueConstraint("session_id", "question_id", name="unique_session_question"),
+        UniqueConstraint(
+            "session_id", "question_id", "response_time", name="unique_session_question"
+        ),
+        # Re-grade scans: responses to given questions in id order
+        Index("ix_user_responses_question_id", "question_id", "id"),
+        {"postgresql_partition_by": "RANGE (response_time)"},
     )
@@ -1,8 +1,10 @@
 from app.schemas.base import (
-    BaseSchema, TimestampSchema, PaginationParams, PaginatedResponse
+    BaseSchema, TimestampSchema, PaginationParams, PaginatedResponse,
+    CursorPage
 )
 from app.schemas.user import (
     UserCreate, UserLogin, UserUpdate, PasswordChange,
+    UserStatusUpdate, UserRoleUpdate,
     UserResponse, UserInDB, Token, TokenData
 )
 from app.schemas.category import (
@@ -11,22 +13,26 @@ from app.schemas.category import (
 )
 from app.schemas.question import (
     QuestionCreate, QuestionUpdate, QuestionResponse, QuestionWithDetails,
-    AnswerOptionCreate, AnswerOptionUpdate, AnswerOptionResponse,
-    QuestionTagCreate, QuestionTagResponse
+    QuestionPage, AnswerOptionCreate, AnswerOptionUpdate, AnswerOptionResponse,
+    QuestionTagCreate, QuestionTagResponse,
+    QuestionImport, QuestionImportError, QuestionImportResult
 )
 from app.schemas.assessment import (
     AssessmentStart, AnswerSubmit, AssessmentSessionResponse,
     QuestionInAssessment, AssessmentProgress, AssessmentComplete,
     DifficultyProgress, CategoryProgress, DetailedAssessmentReport
 )
+from app.schemas.regrade import RegradeJobCreate, RegradeJobResponse
+from app.schemas.report import ReportRequest, AssessmentReportResponse
 
 __all__ = [
     # Base
     "BaseSchema", "TimestampSchema", "PaginationParams", "PaginatedResponse",
+    "CursorPage",
     
     # User
     "UserCreate", "UserLogin", "UserUpdate", "PasswordChange",
-    "UserResponse", "UserInDB", "Token", "TokenData",
+    "UserStatusUpdate", "UserRoleUpdate", "UserResponse", "UserInDB", "Token", "TokenData",
     
     # Category
     "CategoryCreate", "CategoryUpdate", "CategoryResponse", "CategoryWithSubThemes",
@@ -34,11 +40,18 @@ __all__ = [
     
     # Question
     "QuestionCreate", "QuestionUpdate", "QuestionResponse", "QuestionWithDetails",
-    "AnswerOptionCreate", "AnswerOptionUpdate", "AnswerOptionResponse",
+    "QuestionPage", "AnswerOptionCreate", "AnswerOptionUpdate", "AnswerOptionResponse",
     "QuestionTagCreate", "QuestionTagResponse",
+    "QuestionImport", "QuestionImportError", "QuestionImportResult",
     
     # Assessment
     "AssessmentStart", "AnswerSubmit", "AssessmentSessionResponse",
     "QuestionInAssessment", "AssessmentProgress", "AssessmentComplete",
     "DifficultyProgress", "CategoryProgress", "DetailedAssessmentReport",
+    
+    # Re-grading
+    "RegradeJobCreate", "RegradeJobResponse",
+    
+    # Reports
+    "ReportRequest", "AssessmentReportResponse",
 ]
\ No newline at end of file
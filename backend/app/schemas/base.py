@@ -20,4 +20,10 @@ class PaginatedResponse(BaseModel):
     """Generic paginated response"""
     total: int
     skip: int
-    limit: int
\ No newline at end of file
+    limit: int
+
+class CursorPage(BaseModel):
+    """Keyset-paginated response with opaque cursors"""
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    limit: int
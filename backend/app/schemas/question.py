@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, field_validator
-from typing import List, Optional
-from app.schemas.base import BaseSchema, TimestampSchema
+from typing import Annotated, List, Optional
+from app.schemas.base import BaseSchema, TimestampSchema, CursorPage
 from app.models.enums import QuestionType, DifficultyLevel
 
 class AnswerOptionCreate(BaseModel):
@@ -41,6 +41,22 @@ class QuestionCreate(BaseModel):
         
         return v
 
+class QuestionImport(QuestionCreate):
+    """One question of a bulk import file"""
+    is_active: bool = True
+    tags: List[Annotated[str, Field(min_length=1, max_length=50)]] = Field(default_factory=list)
+
+class QuestionImportError(BaseModel):
+    index: int  # 0-based position of the record in the file
+    error: str
+
+class QuestionImportResult(BaseModel):
+    received: int
+    imported: int
+    tags_created: int
+    dry_run: bool
+    errors: List[QuestionImportError] = []
+
 class QuestionUpdate(BaseModel):
     question_text: Optional[str] = Field(None, min_length=10)
     rationale: Optional[str] = Field(None, min_length=10)
@@ -59,6 +75,9 @@ class QuestionBase(BaseSchema):
 class QuestionResponse(QuestionBase, TimestampSchema):
     answer_options: List[AnswerOptionResponse] = []
 
+class QuestionPage(CursorPage):
+    items: List[QuestionResponse] = []
+
 class QuestionWithDetails(QuestionResponse):
     sub_theme: "SubThemeBase"
     tags: List["QuestionTagBase"] = []
@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+from app.schemas.base import BaseSchema
+from app.models.enums import RegradeStatus
+
+class RegradeJobCreate(BaseModel):
+    """Request to re-grade every stored response to some questions"""
+    question_ids: List[int] = Field(..., min_length=1)
+
+class RegradeJobResponse(BaseSchema):
+    id: int
+    question_ids: List[int]
+    status: RegradeStatus
+    last_response_id: int
+    total_responses: int
+    processed_responses: int
+    changed_responses: int
+    sessions_rebuilt: int
+    progress_percentage: float
+    error: Optional[str]
+    requested_by: Optional[int]
+    started_at: Optional[datetime]
+    finished_at: Optional[datetime]
+    created_at: datetime
+    updated_at: datetime
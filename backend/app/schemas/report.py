@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import Any, Dict, Optional
+from datetime import datetime
+from app.schemas.base import BaseSchema
+from app.models.enums import ReportType, ReportStatus
+
+class ReportRequest(BaseModel):
+    """Ask for a report of a completed assessment"""
+    report_type: ReportType = ReportType.DETAILED
+    regenerate: bool = False
+
+class AssessmentReportResponse(BaseSchema):
+    id: int
+    session_id: int
+    report_type: ReportType
+    status: ReportStatus
+    attempts: int
+    error: Optional[str]
+    report_data: Optional[Dict[str, Any]]
+    generated_at: Optional[datetime]
+    created_at: datetime
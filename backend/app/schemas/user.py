@@ -22,6 +22,12 @@ class UserUpdate(BaseModel):
     last_name: Optional[str] = Field(None, max_length=100)
     is_active: Optional[bool] = None
 
+class UserStatusUpdate(BaseModel):
+    is_active: bool
+
+class UserRoleUpdate(BaseModel):
+    role: UserRole
+
 class PasswordChange(BaseModel):
     current_password: str
     new_password: str = Field(..., min_length=8)
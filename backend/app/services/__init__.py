@@ -1,5 +1,10 @@
 from app.services.auth_service import AuthService
 from app.services.category_service import CategoryService
 from app.services.sub_theme_service import SubThemeService
+from app.services.catalog_service import CatalogService
+from app.services.assessment_service import AssessmentService
 
-__all__ = ["AuthService", "CategoryService", "SubThemeService"]
\ No newline at end of file
+__all__ = [
+    "AuthService", "CategoryService", "SubThemeService",
+    "CatalogService", "AssessmentService"
+]
\ No newline at end of file
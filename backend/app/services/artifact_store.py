@@ -0,0 +1,134 @@
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+from app.config import get_settings
+from app.metrics import cache_metrics
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+class ArtifactStore:
+    """Content-addressed files on disk with LRU eviction under a size cap
+
+    A file's key is the SHA-256 of what it was rendered from (see
+    ``key_for``), so an artifact never changes once written and is safe to
+    cache forever under a strong ETag. Files live in ``root/ab/<key><suffix>``
+    and are written to a temp file then renamed, so readers never see a
+    partial file and concurrent writers of one key are harmless.
+
+    Recency is kept in each file's atime (set explicitly on every hit, so
+    noatime mounts do not matter); mtime stays the write time and keeps
+    Last-Modified stable.
+    """
+
+    def __init__(self, root: str, max_bytes: int, suffix: str = ".pdf"):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.metrics = cache_metrics("report_artifacts")
+
+    @staticmethod
+    def key_for(*parts) -> str:
+        return hashlib.sha256("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Optional[Path]:
+        """Path of a stored artifact (marked as recently used), or None"""
+        path = self.path_for(key)
+        try:
+            stat = path.stat()
+            os.utime(path, (time.time(), stat.st_mtime))
+        except FileNotFoundError:
+            self.misses += 1
+            self.metrics.miss()
+            return None
+        self.hits += 1
+        self.metrics.hit()
+        return path
+
+    def put(self, key: str, data: bytes) -> Path:
+        """Store an artifact and evict least recently used ones over the cap"""
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                tmp.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+            if self._size > self.max_bytes:
+                self._evict(keep=path)
+        return path
+
+    def _files(self):
+        return self.root.glob(f"*/*{self.suffix}")
+
+    def _scan_size(self) -> int:
+        total = 0
+        for path in self._files():
+            try:
+                total += path.stat().st_size
+            except FileNotFoundError:
+                pass
+        return total
+
+    def _evict(self, keep: Path) -> None:
+        """Delete least recently used files until under 90% of the cap
+
+        Rescans the tree, so files written by other processes are counted.
+        """
+        entries = []
+        for path in self._files():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, path))
+        entries.sort()
+
+        size = sum(entry[1] for entry in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, file_size, path in entries:
+            if size <= target:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            size -= file_size
+            self.evictions += 1
+        self._size = size
+
+    def stats(self) -> dict:
+        return {
+            "root": str(self.root),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+artifact_store = ArtifactStore(
+    root=settings.artifact_store_path,
+    max_bytes=settings.artifact_store_max_bytes,
+)
@@ -0,0 +1,377 @@
+import time
+import asyncio
+import logging
+import orjson
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func
+from fastapi import HTTPException, status
+from app.config import get_settings
+from app.cache import get_cache
+from app.models import (
+    AssessmentSession, AssessmentStatus, DifficultyLevel, QuestionType, ReportType,
+    UserResponse
+)
+from app.schemas import AssessmentStart, AnswerSubmit, AssessmentComplete
+from app.services.assessment_state import SessionState, QuestionMeta, state_store
+from app.services.response_buffer import BufferedResponse, response_buffer
+from app.services.scoring import ScoringEngine
+from app.services.question_pool import question_pool
+from app.services.question_payloads import question_payloads
+from app.services.report_service import ReportService
+from app.metrics import ASSESSMENT_EVENTS, ASSESSMENT_ANSWERS
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+class AssessmentService:
+    @staticmethod
+    async def start_assessment(
+        db: AsyncSession,
+        user_id: int,
+        start_data: AssessmentStart,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None
+    ) -> bytes:
+        """Start a new assessment session and return the first question"""
+        await question_pool.ensure_loaded(db)
+        levels = AssessmentService._parse_levels(start_data.difficulty_levels)
+        sub_theme_ids = question_pool.sub_theme_ids(
+            start_data.category_ids, start_data.sub_theme_ids
+        )
+
+        state = SessionState(
+            session_id=0,
+            user_id=user_id,
+            started_at=time.time(),
+            plan=[],
+            questions={},
+            levels=[level.value for level in levels],
+            sub_theme_ids=sorted(sub_theme_ids)
+        )
+        if not await AssessmentService._draw_level(db, state):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No questions available for the selected filters"
+            )
+
+        session = AssessmentSession(
+            user_id=user_id,
+            status=AssessmentStatus.IN_PROGRESS,
+            total_score=0,
+            total_possible_score=state.total_possible_score,
+            completion_percentage=0,
+            ip_address=ip_address,
+            user_agent=user_agent
+        )
+        db.add(session)
+        await db.commit()
+        await db.refresh(session)
+
+        state.session_id = session.id
+        await state_store.save(state)
+        ASSESSMENT_EVENTS.labels("started").inc()
+
+        return await AssessmentService._progress(db, state)
+
+    @staticmethod
+    async def get_progress(
+        db: AsyncSession,
+        session_id: int,
+        user_id: int
+    ) -> bytes:
+        """Get the current progress and question of a session"""
+        state = await AssessmentService._get_state(session_id, user_id)
+        return await AssessmentService._progress(db, state)
+
+    @staticmethod
+    async def submit_answer(
+        db: AsyncSession,
+        session_id: int,
+        user_id: int,
+        answer: AnswerSubmit
+    ) -> bytes:
+        """Score an answer, buffer it for persistence and advance the session"""
+        async with state_store.lock(session_id):
+            state = await AssessmentService._get_state(session_id, user_id)
+
+            if answer.question_id != state.current_question_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="This is not the current question of the assessment"
+                )
+
+            meta = await AssessmentService._refresh_key(db, state.questions[answer.question_id])
+            selected = [] if answer.dont_know else list(dict.fromkeys(answer.selected_option_ids))
+            AssessmentService._validate_selection(meta, selected, answer.dont_know)
+
+            score = AssessmentService.score_answer(meta, selected)
+            state.answered[meta.id] = score
+            state.last_answer_at = time.time()
+            state.score = round(state.score + score, 2)
+            if score > 0:
+                state.correct.append(meta.id)
+            if state.current_question_id is None:
+                await AssessmentService._advance(db, state)
+
+            await response_buffer.add(BufferedResponse(
+                session_id=session_id,
+                question_id=meta.id,
+                selected_option_ids=selected,
+                dont_know=answer.dont_know,
+                time_spent_seconds=answer.time_spent_seconds,
+                score_earned=score,
+                is_correct=score > 0,
+                difficulty_level=meta.difficulty_level,
+                question_type=meta.question_type,
+                sub_theme_id=meta.sub_theme_id,
+                category_id=meta.category_id,
+                completion_percentage=state.completion_percentage
+            ))
+            await state_store.save(state)
+
+        ASSESSMENT_ANSWERS.labels(
+            "dont_know" if answer.dont_know else ("correct" if score > 0 else "incorrect")
+        ).inc()
+        return await AssessmentService._progress(db, state)
+
+    @staticmethod
+    async def complete_assessment(
+        db: AsyncSession,
+        session_id: int,
+        user_id: int
+    ) -> AssessmentComplete:
+        """Finish a session and persist its final totals"""
+        async with state_store.lock(session_id):
+            state = await AssessmentService._get_state(session_id, user_id)
+            end_time = datetime.now()
+
+            # Every answer must be stored before the totals are final
+            stored = await AssessmentService._wait_for_responses(db, state)
+
+            # total_score and completion_percentage are maintained by the
+            # progress aggregator as answers are flushed; the possible score
+            # depends on how many levels the student reached
+            total_score = await db.scalar(
+                update(AssessmentSession)
+                .where(AssessmentSession.id == session_id)
+                .values(
+                    status=AssessmentStatus.COMPLETED,
+                    end_time=end_time,
+                    total_possible_score=state.total_possible_score
+                )
+                .returning(AssessmentSession.total_score)
+            )
+            await db.commit()
+            await state_store.delete(session_id)
+
+        ASSESSMENT_EVENTS.labels("completed").inc()
+
+        # Only queued here; a report worker builds it off the request path
+        await ReportService.enqueue(db, session_id, ReportType.DETAILED, user_id)
+
+        # Stored total: includes re-grades of answers given before a key edit
+        total_score = float(total_score)
+        total_possible = state.total_possible_score
+        return AssessmentComplete(
+            session_id=session_id,
+            status=AssessmentStatus.COMPLETED,
+            total_score=total_score,
+            total_possible_score=total_possible,
+            percentage=round(total_score / total_possible * 100, 2) if total_possible else 0.0,
+            duration_seconds=round(time.time() - state.started_at, 2),
+            questions_answered=stored,
+            questions_correct=len(state.correct)
+        )
+
+    @staticmethod
+    async def _wait_for_responses(db: AsyncSession, state: SessionState) -> int:
+        """Wait until every answer of the session is in user_responses
+
+        Answers sit in the ResponseBuffer of whichever worker took them, so
+        this flushes the local buffer and polls the stored count until it
+        covers all answers (minus any the buffers had to drop), and returns
+        the stored count. Raises 503 rather than completing with missing
+        answers, unless the last answer is older than
+        ``assessment_lost_answer_grace_seconds``: a live worker would have
+        flushed by then, so the rest was lost with a crashed one.
+        """
+        # Runs under the session lock: stop well before it could expire
+        wait = min(settings.assessment_complete_wait_seconds, state_store.lock_ttl / 2)
+        deadline = time.monotonic() + wait
+        while True:
+            await response_buffer.flush()
+            expected = state.questions_answered - await state_store.dropped(state.session_id)
+            stored = await db.scalar(
+                select(func.count())
+                .select_from(UserResponse)
+                .where(UserResponse.session_id == state.session_id)
+            )
+            if stored >= expected:
+                return stored
+            if time.monotonic() >= deadline:
+                if time.time() - state.last_answer_at >= settings.assessment_lost_answer_grace_seconds:
+                    logger.warning(
+                        "Completing session %s without %d lost answers",
+                        state.session_id, expected - stored
+                    )
+                    return stored
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Answers are still being saved, retry shortly",
+                    headers={"Retry-After": "1"}
+                )
+            await asyncio.sleep(0.1)
+
+    @staticmethod
+    def score_answer(meta: QuestionMeta, selected_option_ids: List[int]) -> float:
+        """Score a selection with the question's bitmask answer key"""
+        return meta.answer_key().score(selected_option_ids)
+
+    @staticmethod
+    async def _refresh_key(db: AsyncSession, meta: QuestionMeta) -> QuestionMeta:
+        """Reload a drawn question's answer key if it was edited since the draw
+
+        Sessions keep the key captured at draw time; an edit bumps the
+        "answer_keys" version, so later answers are scored with the new key.
+        """
+        version = await get_cache("answer_keys").version()
+        if meta.key_version != version:
+            key = (await ScoringEngine.load_keys(db, [meta.id])).get(meta.id)
+            if key is not None:
+                meta.points = key.points
+                meta.option_ids = list(key.option_ids)
+                meta.correct_mask = key.correct_mask
+            meta.key_version = version
+        return meta
+
+    @staticmethod
+    def _validate_selection(
+        meta: QuestionMeta,
+        selected: List[int],
+        dont_know: bool
+    ) -> None:
+        if not dont_know and not selected:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Select at least one option or answer 'don't know'"
+            )
+        if not set(selected).issubset(meta.option_ids):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Selected options do not belong to this question"
+            )
+        if meta.question_type == QuestionType.SINGLE_CHOICE.value and len(selected) > 1:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Single choice questions accept exactly one option"
+            )
+
+    @staticmethod
+    async def _get_state(session_id: int, user_id: int) -> SessionState:
+        state = await state_store.load(session_id)
+        if state is None or state.user_id != user_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Assessment session not found or no longer in progress"
+            )
+        return state
+
+    @staticmethod
+    async def _progress(db: AsyncSession, state: SessionState) -> bytes:
+        """AssessmentProgress as JSON bytes
+
+        The current question is spliced in from the pre-rendered payload
+        cache, so serving the next question does no ORM or schema work.
+        """
+        current_question_id = state.current_question_id
+        current_question = b"null"
+        if current_question_id is not None:
+            current_question = await question_payloads.get(db, current_question_id)
+
+        body = orjson.dumps({
+            "session_id": state.session_id,
+            "questions_answered": state.questions_answered,
+            "questions_remaining": state.questions_remaining,
+            "score_earned": state.score,
+            "time_elapsed_seconds": round(time.time() - state.started_at, 2),
+        })
+        return b'{"current_question":' + current_question + b"," + body[1:]
+
+    @staticmethod
+    async def _advance(db: AsyncSession, state: SessionState) -> None:
+        """Move on after a level block is fully answered
+
+        With adaptive selection the next level is only served when the
+        student scored at least ``assessment_level_pass_ratio`` of the
+        block; otherwise the assessment is over.
+        """
+        block = state.level_block
+        correct = sum(1 for qid in block if state.answered.get(qid, 0) > 0)
+        passed = bool(block) and correct / len(block) >= settings.assessment_level_pass_ratio
+
+        if settings.assessment_adaptive and not passed:
+            state.finished = True
+            return
+
+        state.level_index += 1
+        if not await AssessmentService._draw_level(db, state):
+            state.finished = True
+
+    @staticmethod
+    async def _draw_level(db: AsyncSession, state: SessionState) -> bool:
+        """Append N single + N multiple choice questions of the current level
+
+        Levels without any matching question are skipped. Returns False when
+        no requested level is left.
+        """
+        per_type = settings.assessment_questions_per_type
+        await question_pool.ensure_loaded(db)
+
+        while state.current_level is not None:
+            drawn = {}
+            for question_type in QuestionType:
+                for question_id in question_pool.draw(
+                    state.sub_theme_ids, state.current_level, question_type.value,
+                    per_type, exclude=state.questions
+                ):
+                    drawn[question_id] = question_pool.sub_theme_of(question_id)
+
+            # Read before the keys, so an edit racing the draw shows as stale
+            key_version = await get_cache("answer_keys").version()
+            keys = await ScoringEngine.load_keys(db, list(drawn))
+            # A question without options cannot be answered
+            block = [question_id for question_id in drawn if question_id in keys]
+            if block:
+                for question_id in block:
+                    key = keys[question_id]
+                    state.questions[question_id] = QuestionMeta(
+                        id=question_id,
+                        sub_theme_id=drawn[question_id],
+                        category_id=question_pool.category_id(drawn[question_id]),
+                        difficulty_level=key.difficulty_level,
+                        question_type=key.question_type,
+                        points=key.points,
+                        option_ids=list(key.option_ids),
+                        correct_mask=key.correct_mask,
+                        key_version=key_version
+                    )
+                state.plan.extend(block)
+                return True
+            state.level_index += 1
+        return False
+
+    @staticmethod
+    def _parse_levels(difficulty_levels: Optional[List[str]]) -> List[DifficultyLevel]:
+        """Requested difficulty levels in ascending order (all by default)"""
+        if not difficulty_levels:
+            return list(DifficultyLevel)
+        try:
+            requested = {DifficultyLevel(level) for level in difficulty_levels}
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Unknown difficulty level"
+            )
+        return [level for level in DifficultyLevel if level in requested]
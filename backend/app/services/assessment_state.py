@@ -0,0 +1,174 @@
+import json
+import time
+import uuid
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional
+from fastapi import HTTPException, status
+from app.config import get_settings
+from app.cache import get_cache_backend
+from app.services.scoring import AnswerKey
+
+settings = get_settings()
+
+@dataclass
+class QuestionMeta:
+    """What the engine needs to score a question without touching the DB"""
+    id: int
+    sub_theme_id: int
+    category_id: int
+    difficulty_level: str
+    question_type: str
+    points: float
+    option_ids: List[int]
+    correct_mask: int
+    # "answer_keys" namespace version the key was loaded at
+    key_version: int = 0
+
+    def answer_key(self) -> AnswerKey:
+        return AnswerKey(
+            question_id=self.id,
+            difficulty_level=self.difficulty_level,
+            question_type=self.question_type,
+            points=self.points,
+            option_ids=tuple(self.option_ids),
+            correct_mask=self.correct_mask
+        )
+
+@dataclass
+class SessionState:
+    """Live state of an in-progress assessment"""
+    session_id: int
+    user_id: int
+    started_at: float
+    plan: List[int]
+    questions: Dict[int, QuestionMeta]
+    answered: Dict[int, float] = field(default_factory=dict)
+    correct: List[int] = field(default_factory=list)
+    score: float = 0.0
+    # Adaptive selection: requested levels (ascending), the one being served,
+    # and the resolved sub-theme filter new blocks are drawn from
+    levels: List[str] = field(default_factory=list)
+    level_index: int = 0
+    sub_theme_ids: List[int] = field(default_factory=list)
+    finished: bool = False
+    # Epoch seconds of the last submitted answer
+    last_answer_at: float = 0.0
+
+    @property
+    def current_question_id(self) -> Optional[int]:
+        for question_id in self.plan:
+            if question_id not in self.answered:
+                return question_id
+        return None
+
+    @property
+    def questions_answered(self) -> int:
+        return len(self.answered)
+
+    @property
+    def questions_remaining(self) -> int:
+        return len(self.plan) - len(self.answered)
+
+    @property
+    def total_possible_score(self) -> float:
+        return sum(self.questions[qid].points for qid in self.plan)
+
+    @property
+    def current_level(self) -> Optional[str]:
+        if self.level_index < len(self.levels):
+            return self.levels[self.level_index]
+        return None
+
+    @property
+    def level_block(self) -> List[int]:
+        """Question ids served for the current level"""
+        return [
+            qid for qid in self.plan
+            if self.questions[qid].difficulty_level == self.current_level
+        ]
+
+    @property
+    def completion_percentage(self) -> float:
+        if self.finished or not self.levels:
+            return 100.0
+        block = self.level_block
+        answered = sum(1 for qid in block if qid in self.answered)
+        level_fraction = answered / len(block) if block else 0.0
+        return round((self.level_index + level_fraction) / len(self.levels) * 100, 2)
+
+    def to_json(self) -> bytes:
+        return json.dumps(asdict(self), separators=(",", ":")).encode()
+
+    @classmethod
+    def from_json(cls, raw: bytes) -> "SessionState":
+        data = json.loads(raw)
+        # JSON object keys are strings; restore the integer question ids
+        data["questions"] = {
+            int(qid): QuestionMeta(**meta) for qid, meta in data["questions"].items()
+        }
+        data["answered"] = {int(qid): score for qid, score in data["answered"].items()}
+        return cls(**data)
+
+class AssessmentStateStore:
+    """Keeps SessionState in the cache backend (memory or Redis)"""
+
+    def __init__(self, ttl_seconds: float, lock_ttl: float, lock_timeout: float = 5.0):
+        self.ttl_seconds = ttl_seconds
+        # How long a holder may keep the lock / a caller waits to get it
+        self.lock_ttl = lock_ttl
+        self.lock_timeout = lock_timeout
+
+    @staticmethod
+    def _key(session_id: int) -> str:
+        return f"{settings.cache_key_prefix}:assessment:{session_id}"
+
+    async def load(self, session_id: int) -> Optional[SessionState]:
+        raw = await get_cache_backend().get(self._key(session_id))
+        return SessionState.from_json(raw) if raw is not None else None
+
+    async def save(self, state: SessionState) -> None:
+        await get_cache_backend().set(
+            self._key(state.session_id), state.to_json(), self.ttl_seconds
+        )
+
+    async def delete(self, session_id: int) -> None:
+        await get_cache_backend().delete(self._key(session_id))
+
+    async def record_dropped(self, session_id: int) -> None:
+        """Count an answer of the session that could not be stored"""
+        backend = get_cache_backend()
+        key = f"{self._key(session_id)}:dropped"
+        # Created with the state's TTL; incr keeps it
+        await backend.add(key, b"0", self.ttl_seconds)
+        await backend.incr(key)
+
+    async def dropped(self, session_id: int) -> int:
+        raw = await get_cache_backend().get(f"{self._key(session_id)}:dropped")
+        return int(raw) if raw is not None else 0
+
+    @asynccontextmanager
+    async def lock(self, session_id: int):
+        """Serialize read-modify-write cycles on one session across workers"""
+        backend = get_cache_backend()
+        lock_key = f"{self._key(session_id)}:lock"
+        token = uuid.uuid4().hex.encode()
+        deadline = time.monotonic() + self.lock_timeout
+        while not await backend.add(lock_key, token, self.lock_ttl):
+            if time.monotonic() >= deadline:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Assessment session is busy, retry"
+                )
+            await asyncio.sleep(0.01)
+        try:
+            yield
+        finally:
+            # Past lock_ttl the lock may already belong to another request
+            await backend.delete_if_equals(lock_key, token)
+
+state_store = AssessmentStateStore(
+    settings.assessment_state_ttl_seconds,
+    lock_ttl=settings.assessment_lock_ttl_seconds,
+)
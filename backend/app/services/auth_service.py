@@ -3,9 +3,12 @@ from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, or_
 from fastapi import HTTPException, status
-from app.models import User
+from app.models import User, UserRole
 from app.schemas import UserCreate, Token
-from app.core.security import verify_password, get_password_hash, create_tokens
+from app.core.security import create_tokens
+from app.core.password_hasher import password_hasher
+from app.core.user_cache import invalidate_user
+from app.core.audit import record_audit, audit_diff
 
 class AuthService:
     @staticmethod
@@ -35,7 +38,7 @@ class AuthService:
                 )
         
         # Create new user
-        hashed_password = get_password_hash(user_data.password)
+        hashed_password = await password_hasher.hash(user_data.password)
         new_user = User(
             username=user_data.username,
             email=user_data.email,
@@ -71,7 +74,7 @@ class AuthService:
         if not user:
             return None
         
-        if not verify_password(password, user.password_hash):
+        if not await password_hasher.verify(password, user.password_hash):
             return None
         
         # Update last login
@@ -84,4 +87,59 @@ class AuthService:
     async def create_tokens_for_user(user: User) -> Token:
         """Create access and refresh tokens for a user"""
         token_dict = create_tokens(user.id, user.username)
-        return Token(**token_dict)
\ No newline at end of file
+        return Token(**token_dict)
+    
+    @staticmethod
+    async def get_user(db: AsyncSession, user_id: int) -> User:
+        """Get a single user by ID"""
+        result = await db.execute(
+            select(User).where(User.id == user_id)
+        )
+        user = result.scalar_one_or_none()
+        
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        
+        return user
+    
+    @staticmethod
+    async def set_user_active(
+        db: AsyncSession,
+        user_id: int,
+        is_active: bool
+    ) -> User:
+        """Activate or deactivate a user"""
+        user = await AuthService.get_user(db, user_id)
+        user.is_active = is_active
+        old_values, new_values = audit_diff(user)
+        
+        await db.commit()
+        await db.refresh(user)
+        if new_values:
+            record_audit("user.set_active", "user", user_id, old_values, new_values)
+        
+        # Drop again after commit so no request re-caches the old row
+        await invalidate_user(user.id)
+        return user
+    
+    @staticmethod
+    async def set_user_role(
+        db: AsyncSession,
+        user_id: int,
+        role: UserRole
+    ) -> User:
+        """Change a user's role"""
+        user = await AuthService.get_user(db, user_id)
+        user.role = role
+        old_values, new_values = audit_diff(user)
+        
+        await db.commit()
+        await db.refresh(user)
+        if new_values:
+            record_audit("user.set_role", "user", user_id, old_values, new_values)
+        
+        await invalidate_user(user.id)
+        return user
@@ -0,0 +1,123 @@
+import json
+import hashlib
+from datetime import datetime, timezone
+from typing import Dict, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from app.models import Category, SubTheme, Question, DifficultyLevel
+from app.cache import get_cache
+
+# Snapshots are keyed by version, so the TTL only bounds orphaned entries
+SNAPSHOT_TTL_SECONDS = 24 * 3600
+
+class CatalogSnapshot:
+    """Serialized Category -> SubTheme tree for one catalog version"""
+
+    def __init__(self, version: int, etag: str, body: bytes):
+        self.version = version
+        self.etag = etag
+        self.body = body
+
+class CatalogService:
+    # Last snapshot served by this worker
+    _snapshot: Optional[CatalogSnapshot] = None
+
+    @staticmethod
+    async def get_version() -> int:
+        """Current catalog version; bumped by category/sub-theme/question writes"""
+        return await get_cache("catalog").version()
+
+    @staticmethod
+    async def get_snapshot(db: AsyncSession) -> CatalogSnapshot:
+        """Get the snapshot for the current version, building it at most once"""
+        version = await CatalogService.get_version()
+        snapshot = CatalogService._snapshot
+        if snapshot is not None and snapshot.version == version:
+            return snapshot
+
+        async def build():
+            body = await CatalogService.build_catalog(db, version)
+            return {
+                "etag": f'"{hashlib.sha256(body.encode()).hexdigest()[:32]}"',
+                "body": body,
+            }
+
+        cache = get_cache("catalog")
+        data = await cache.get_or_set(
+            cache.key("snapshot"), build, ttl=SNAPSHOT_TTL_SECONDS
+        )
+        snapshot = CatalogSnapshot(version, data["etag"], data["body"].encode())
+        CatalogService._snapshot = snapshot
+        return snapshot
+
+    @staticmethod
+    async def build_catalog(db: AsyncSession, version: int) -> str:
+        """Build the catalog JSON document from the database (3 queries)"""
+        categories = (await db.execute(
+            select(Category.id, Category.name, Category.display_order)
+            .order_by(Category.display_order, Category.id)
+        )).all()
+
+        sub_themes = (await db.execute(
+            select(
+                SubTheme.id, SubTheme.category_id, SubTheme.name,
+                SubTheme.description, SubTheme.display_order
+            ).order_by(SubTheme.display_order, SubTheme.id)
+        )).all()
+
+        counts = (await db.execute(
+            select(
+                Question.sub_theme_id,
+                Question.difficulty_level,
+                func.count(Question.id)
+            )
+            .where(Question.is_active == True)
+            .group_by(Question.sub_theme_id, Question.difficulty_level)
+        )).all()
+
+        counts_by_sub_theme: Dict[int, Dict[str, int]] = {}
+        for sub_theme_id, level, count in counts:
+            counts_by_sub_theme.setdefault(sub_theme_id, {})[level.value] = count
+
+        def empty_counts() -> Dict[str, int]:
+            return {level.value: 0 for level in DifficultyLevel}
+
+        tree = {
+            category.id: {
+                "id": category.id,
+                "name": category.name,
+                "display_order": category.display_order,
+                "question_counts": empty_counts(),
+                "total_questions": 0,
+                "sub_themes": [],
+            }
+            for category in categories
+        }
+
+        for sub_theme in sub_themes:
+            category = tree.get(sub_theme.category_id)
+            if category is None:
+                continue
+            question_counts = empty_counts()
+            question_counts.update(counts_by_sub_theme.get(sub_theme.id, {}))
+            total = sum(question_counts.values())
+            category["sub_themes"].append({
+                "id": sub_theme.id,
+                "name": sub_theme.name,
+                "description": sub_theme.description,
+                "display_order": sub_theme.display_order,
+                "question_counts": question_counts,
+                "total_questions": total,
+            })
+            for level, count in question_counts.items():
+                category["question_counts"][level] += count
+            category["total_questions"] += total
+
+        return json.dumps(
+            {
+                "version": version,
+                "generated_at": datetime.now(timezone.utc).isoformat(),
+                "categories": list(tree.values()),
+            },
+            separators=(",", ":"),
+        )
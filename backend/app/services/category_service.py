@@ -4,7 +4,11 @@ from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 from app.models import Category, SubTheme
-from app.schemas import CategoryCreate, CategoryUpdate
+from app.schemas import (
+    CategoryCreate, CategoryUpdate, CategoryResponse, CategoryWithSubThemes
+)
+from app.cache import get_cache, invalidate
+from app.core.audit import record_audit, audit_diff, audit_snapshot
 
 class CategoryService:
     @staticmethod
@@ -29,6 +33,7 @@ class CategoryService:
         db.add(category)
         await db.commit()
         await db.refresh(category)
+        await invalidate("categories", "catalog")
         return category
     
     @staticmethod
@@ -47,6 +52,29 @@ class CategoryService:
         result = await db.execute(query)
         return result.scalars().all()
     
+    @staticmethod
+    async def get_cached_categories(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        include_sub_themes: bool = False
+    ) -> List[dict]:
+        """Get all categories as serialized dicts, through the shared cache"""
+        schema = CategoryWithSubThemes if include_sub_themes else CategoryResponse
+        
+        async def load():
+            categories = await CategoryService.get_categories(
+                db, skip, limit, include_sub_themes
+            )
+            return [
+                schema.model_validate(category).model_dump(mode="json")
+                for category in categories
+            ]
+        
+        return await get_cache("categories").get_or_set(
+            get_cache("categories").key("list", skip, limit, include_sub_themes), load
+        )
+    
     @staticmethod
     async def get_category(
         db: AsyncSession,
@@ -70,6 +98,22 @@ class CategoryService:
         
         return category
     
+    @staticmethod
+    async def get_cached_category(
+        db: AsyncSession,
+        category_id: int
+    ) -> dict:
+        """Get a single category with sub-themes, through the shared cache"""
+        async def load():
+            category = await CategoryService.get_category(
+                db, category_id, include_sub_themes=True
+            )
+            return CategoryWithSubThemes.model_validate(category).model_dump(mode="json")
+        
+        return await get_cache("categories").get_or_set(
+            get_cache("categories").key("detail", category_id), load
+        )
+    
     @staticmethod
     async def update_category(
         db: AsyncSession,
@@ -83,9 +127,13 @@ class CategoryService:
         update_data = category_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(category, field, value)
+        old_values, new_values = audit_diff(category)
         
         await db.commit()
         await db.refresh(category)
+        await invalidate("categories", "sub_themes", "question_payloads", "catalog")
+        if new_values:
+            record_audit("category.update", "category", category_id, old_values, new_values)
         return category
     
     @staticmethod
@@ -96,8 +144,12 @@ class CategoryService:
         """Delete a category (cascades to sub-themes and questions)"""
         category = await CategoryService.get_category(db, category_id)
         
+        old_values = audit_snapshot(category)
+        
         await db.delete(category)
         await db.commit()
+        await invalidate("categories", "sub_themes", "questions", "question_payloads", "catalog")
+        record_audit("category.delete", "category", category_id, old_values=old_values)
         
         return {"message": f"Category '{category.name}' deleted successfully"}
     
@@ -0,0 +1,207 @@
+import re
+from dataclasses import dataclass
+from datetime import datetime, date
+from typing import Dict, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text
+from app.config import get_settings
+
+settings = get_settings()
+
+# Partitioned table -> partition key column
+PARTITIONED_TABLES = {
+    "audit_log": "created_at",
+    "user_responses": "response_time",
+}
+
+RETENTION_ACTIONS = ("detach", "drop")
+
+_BOUNDS = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+@dataclass
+class Partition:
+    name: str
+    start: Optional[datetime]
+    end: Optional[datetime]
+    estimated_rows: int
+
+    @property
+    def is_default(self) -> bool:
+        return self.start is None
+
+def month_start(value: date, offset: int = 0) -> datetime:
+    """First instant of the month ``offset`` months after ``value``"""
+    index = value.year * 12 + value.month - 1 + offset
+    return datetime(index // 12, index % 12 + 1, 1)
+
+def partition_name(table: str, month: datetime) -> str:
+    return f"{table}_p{month:%Y_%m}"
+
+class PartitionService:
+    """Maintains the monthly range partitions of append-only tables
+
+    Partitions are created ahead of time as standalone tables and then
+    attached, which only takes a SHARE UPDATE EXCLUSIVE lock on the parent.
+    Rows that landed in the default partition because no monthly
+    partition existed yet are moved into the new one. Expired partitions
+    are detached (kept as plain tables for archiving) or dropped.
+    """
+
+    @staticmethod
+    def _check_table(table: str) -> str:
+        if table not in PARTITIONED_TABLES:
+            raise ValueError(f"{table} is not a partitioned table")
+        return PARTITIONED_TABLES[table]
+
+    @staticmethod
+    async def get_partitions(db: AsyncSession, table: str) -> List[Partition]:
+        """Attached partitions of a table, oldest first, default last"""
+        PartitionService._check_table(table)
+        result = await db.execute(
+            text(
+                "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples "
+                "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = CAST(:table AS regclass) AND c.relkind = 'r'"
+            ),
+            {"table": table}
+        )
+        partitions = []
+        for name, bound, reltuples in result.all():
+            match = _BOUNDS.search(bound)
+            partitions.append(Partition(
+                name=name,
+                start=datetime.fromisoformat(match.group(1)) if match else None,
+                end=datetime.fromisoformat(match.group(2)) if match else None,
+                estimated_rows=max(int(reltuples), 0)
+            ))
+        partitions.sort(key=lambda p: (p.is_default, p.start or datetime.min))
+        return partitions
+
+    @staticmethod
+    async def ensure_partitions(
+        db: AsyncSession,
+        table: str,
+        months_ahead: Optional[int] = None,
+        today: Optional[date] = None
+    ) -> List[str]:
+        """Create monthly partitions from this month to ``months_ahead``; returns new names"""
+        key = PartitionService._check_table(table)
+        if months_ahead is None:
+            months_ahead = settings.partition_months_ahead
+        today = today or date.today()
+
+        partitions = await PartitionService.get_partitions(db, table)
+        existing = {p.start for p in partitions if not p.is_default}
+        default = next((p.name for p in partitions if p.is_default), None)
+
+        created = []
+        for offset in range(months_ahead + 1):
+            start = month_start(today, offset)
+            if start in existing:
+                continue
+            end = month_start(start, 1)
+            name = partition_name(table, start)
+            bounds = {"start": start, "end": end}
+            in_range = f"{key} >= :start AND {key} < :end"
+
+            await db.execute(text(
+                f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+            ))
+            # Lets ATTACH skip scanning the new table
+            await db.execute(text(
+                f"ALTER TABLE {name} ADD CONSTRAINT {name}_bounds "
+                f"CHECK ({key} >= '{start}' AND {key} < '{end}')"
+            ))
+            if default is not None:
+                await db.execute(
+                    text(f"INSERT INTO {name} SELECT * FROM {default} WHERE {in_range}"),
+                    bounds
+                )
+                await db.execute(text(f"DELETE FROM {default} WHERE {in_range}"), bounds)
+            await db.execute(text(
+                f"ALTER TABLE {table} ATTACH PARTITION {name} "
+                f"FOR VALUES FROM ('{start}') TO ('{end}')"
+            ))
+            await db.execute(text(f"ALTER TABLE {name} DROP CONSTRAINT {name}_bounds"))
+            created.append(name)
+
+        await db.commit()
+        return created
+
+    @staticmethod
+    async def expired_partitions(
+        db: AsyncSession,
+        table: str,
+        retention_months: int,
+        today: Optional[date] = None
+    ) -> List[Partition]:
+        """Partitions whose whole range is older than the retention window"""
+        if retention_months <= 0:
+            return []
+        cutoff = month_start(today or date.today(), -retention_months)
+        return [
+            p for p in await PartitionService.get_partitions(db, table)
+            if not p.is_default and p.end <= cutoff
+        ]
+
+    @staticmethod
+    async def apply_retention(
+        db: AsyncSession,
+        table: str,
+        retention_months: int,
+        action: Optional[str] = None,
+        today: Optional[date] = None
+    ) -> List[str]:
+        """Detach or drop expired partitions; returns their names
+
+        Dropping a user_responses partition also deletes the answers of its
+        responses (response_answers has no foreign key to cascade through).
+        Detached partitions keep their answers so the archive stays whole.
+        """
+        action = action or settings.partition_retention_action
+        if action not in RETENTION_ACTIONS:
+            raise ValueError(f"Unknown retention action: {action}")
+
+        expired = await PartitionService.expired_partitions(
+            db, table, retention_months, today
+        )
+        for partition in expired:
+            await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {partition.name}"))
+            if action == "drop":
+                if table == "user_responses":
+                    await db.execute(text(
+                        "DELETE FROM response_answers WHERE user_response_id IN "
+                        f"(SELECT id FROM {partition.name})"
+                    ))
+                await db.execute(text(f"DROP TABLE {partition.name}"))
+
+        await db.commit()
+        return [partition.name for partition in expired]
+
+    @staticmethod
+    def retention_months(table: str) -> int:
+        """Configured retention of a table in months (0 keeps everything)"""
+        return {
+            "audit_log": settings.audit_log_retention_months,
+            "user_responses": settings.user_responses_retention_months,
+        }[table]
+
+    @staticmethod
+    async def maintain(
+        db: AsyncSession,
+        months_ahead: Optional[int] = None,
+        action: Optional[str] = None,
+        today: Optional[date] = None
+    ) -> Dict[str, dict]:
+        """Create upcoming and expire old partitions of every partitioned table"""
+        report = {}
+        for table in PARTITIONED_TABLES:
+            report[table] = {
+                "created": await PartitionService.ensure_partitions(
+                    db, table, months_ahead, today
+                ),
+                "expired": await PartitionService.apply_retention(
+                    db, table, PartitionService.retention_months(table), action, today
+                ),
+            }
+        return report
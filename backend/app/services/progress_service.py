@@ -0,0 +1,328 @@
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, delete, func, case, and_, bindparam, cast, String
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models import (
+    AssessmentSession, UserResponse, Question, SubTheme,
+    DifficultyLevelModel, DifficultyLevelProgress, CategoryProgress,
+    SubThemeProgress, QuestionType
+)
+from app.services.scoring import (
+    BONUS_SINGLE_CHOICE, BONUS_MULTIPLE_CHOICE, is_bonus_eligible
+)
+
+# Counter columns shared by the three progress tables
+_COUNTERS = ("questions_attempted", "questions_correct", "score_earned")
+_DIFFICULTY_COUNTERS = _COUNTERS + ("single_choice_correct", "multiple_choice_correct")
+
+def _is_bonus(single_correct, multiple_correct, correct):
+    """SQL form of scoring.is_bonus_eligible"""
+    return and_(
+        single_correct == BONUS_SINGLE_CHOICE,
+        multiple_correct == BONUS_MULTIPLE_CHOICE,
+        correct == BONUS_SINGLE_CHOICE + BONUS_MULTIPLE_CHOICE
+    )
+
+class ProgressAggregator:
+    """Keeps the per-session progress tables up to date incrementally
+
+    Each flushed batch of scored answers is folded into per-key deltas and
+    applied with one multi-row ``INSERT ... ON CONFLICT DO UPDATE`` per
+    progress table plus one executemany UPDATE on assessment_sessions, in
+    the same transaction as the user_responses insert. ``rebuild`` and
+    ``verify`` recompute everything from user_responses.
+    """
+
+    # difficulty name ("novice") -> difficulty_levels.id, seeded once
+    _difficulty_ids: Optional[Dict[str, int]] = None
+
+    @staticmethod
+    async def get_difficulty_ids(db: AsyncSession) -> Dict[str, int]:
+        if ProgressAggregator._difficulty_ids is None:
+            result = await db.execute(
+                select(DifficultyLevelModel.name, DifficultyLevelModel.id)
+            )
+            ProgressAggregator._difficulty_ids = {
+                name.lower(): level_id for name, level_id in result.all()
+            }
+        return ProgressAggregator._difficulty_ids
+
+    @staticmethod
+    async def apply(db: AsyncSession, answers: Iterable) -> None:
+        """Apply a batch of scored answers (BufferedResponse) as deltas"""
+        difficulty_ids = await ProgressAggregator.get_difficulty_ids(db)
+
+        by_difficulty = defaultdict(lambda: dict.fromkeys(_DIFFICULTY_COUNTERS, 0))
+        by_category = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+        by_sub_theme = defaultdict(lambda: dict.fromkeys(_COUNTERS, 0))
+        by_session = {}
+
+        for answer in answers:
+            correct = 1 if answer.is_correct else 0
+            score = Decimal(str(answer.score_earned))
+
+            difficulty = by_difficulty[
+                (answer.session_id, difficulty_ids[answer.difficulty_level])
+            ]
+            if answer.question_type == QuestionType.SINGLE_CHOICE.value:
+                difficulty["single_choice_correct"] += correct
+            else:
+                difficulty["multiple_choice_correct"] += correct
+
+            for delta in (
+                difficulty,
+                by_category[(answer.session_id, answer.category_id)],
+                by_sub_theme[(answer.session_id, answer.sub_theme_id)],
+            ):
+                delta["questions_attempted"] += 1
+                delta["questions_correct"] += correct
+                delta["score_earned"] += score
+
+            session = by_session.setdefault(
+                answer.session_id, {"score": Decimal(0), "completion": 0}
+            )
+            session["score"] += score
+            session["completion"] = max(
+                session["completion"], answer.completion_percentage
+            )
+
+        if not by_session:
+            return
+
+        await ProgressAggregator._upsert(
+            db, DifficultyLevelProgress, "difficulty_level_id",
+            "unique_session_difficulty", by_difficulty, _DIFFICULTY_COUNTERS
+        )
+        await ProgressAggregator._upsert(
+            db, CategoryProgress, "category_id",
+            "unique_session_category", by_category, _COUNTERS
+        )
+        await ProgressAggregator._upsert(
+            db, SubThemeProgress, "sub_theme_id",
+            "unique_session_subtheme", by_sub_theme, _COUNTERS
+        )
+
+        sessions = AssessmentSession.__table__
+        await db.execute(
+            update(sessions)
+            .where(sessions.c.id == bindparam("b_session_id"))
+            .values(
+                total_score=sessions.c.total_score + bindparam("b_score"),
+                completion_percentage=func.greatest(
+                    sessions.c.completion_percentage, bindparam("b_completion")
+                )
+            ),
+            [
+                {
+                    "b_session_id": session_id,
+                    "b_score": values["score"],
+                    "b_completion": values["completion"],
+                }
+                for session_id, values in by_session.items()
+            ]
+        )
+
+    @staticmethod
+    async def _upsert(
+        db: AsyncSession,
+        model,
+        key_column: str,
+        constraint: str,
+        deltas: Dict[tuple, dict],
+        counters: tuple
+    ) -> None:
+        rows = []
+        for (session_id, key), values in deltas.items():
+            row = {"session_id": session_id, key_column: key, **values}
+            if model is DifficultyLevelProgress:
+                row["bonus_earned"] = is_bonus_eligible(
+                    values["single_choice_correct"],
+                    values["multiple_choice_correct"],
+                    values["questions_correct"]
+                )
+            rows.append(row)
+
+        stmt = pg_insert(model.__table__).values(rows)
+        table = model.__table__
+        set_ = {
+            column: table.c[column] + stmt.excluded[column]
+            for column in counters
+        }
+        if model is DifficultyLevelProgress:
+            set_["bonus_earned"] = _is_bonus(
+                set_["single_choice_correct"],
+                set_["multiple_choice_correct"],
+                set_["questions_correct"]
+            )
+
+        await db.execute(
+            stmt.on_conflict_do_update(constraint=constraint, set_=set_)
+        )
+
+    @staticmethod
+    def _expected_queries(session_ids: Optional[List[int]] = None) -> dict:
+        """Set-based SELECTs that derive every progress row from user_responses"""
+        is_correct = case((UserResponse.score_earned > 0, 1), else_=0)
+        counters = [
+            func.count(UserResponse.id).label("questions_attempted"),
+            func.sum(is_correct).label("questions_correct"),
+            func.sum(UserResponse.score_earned).label("score_earned"),
+        ]
+
+        def scoped(query):
+            if session_ids is not None:
+                query = query.where(UserResponse.session_id.in_(session_ids))
+            return query
+
+        single_correct = func.sum(case(
+            (and_(UserResponse.score_earned > 0,
+                  Question.question_type == QuestionType.SINGLE_CHOICE), 1),
+            else_=0
+        ))
+        multiple_correct = func.sum(case(
+            (and_(UserResponse.score_earned > 0,
+                  Question.question_type == QuestionType.MULTIPLE_CHOICE), 1),
+            else_=0
+        ))
+        # difficulty_levels.name holds the enum value ("novice", ...)
+        difficulty_join = func.lower(DifficultyLevelModel.name) == func.lower(
+            cast(Question.difficulty_level, String)
+        )
+
+        return {
+            DifficultyLevelProgress: scoped(
+                select(
+                    UserResponse.session_id,
+                    DifficultyLevelModel.id.label("difficulty_level_id"),
+                    *counters,
+                    single_correct.label("single_choice_correct"),
+                    multiple_correct.label("multiple_choice_correct"),
+                )
+                .join(Question, UserResponse.question_id == Question.id)
+                .join(DifficultyLevelModel, difficulty_join)
+                .group_by(UserResponse.session_id, DifficultyLevelModel.id)
+            ),
+            CategoryProgress: scoped(
+                select(
+                    UserResponse.session_id,
+                    SubTheme.category_id.label("category_id"),
+                    *counters,
+                )
+                .join(Question, UserResponse.question_id == Question.id)
+                .join(SubTheme, Question.sub_theme_id == SubTheme.id)
+                .group_by(UserResponse.session_id, SubTheme.category_id)
+            ),
+            SubThemeProgress: scoped(
+                select(
+                    UserResponse.session_id,
+                    Question.sub_theme_id.label("sub_theme_id"),
+                    *counters,
+                )
+                .join(Question, UserResponse.question_id == Question.id)
+                .group_by(UserResponse.session_id, Question.sub_theme_id)
+            ),
+        }
+
+    @staticmethod
+    async def rebuild(
+        db: AsyncSession,
+        session_ids: Optional[List[int]] = None
+    ) -> None:
+        """Recompute progress rows and session scores from user_responses
+
+        Runs in the caller's transaction; the caller commits.
+        """
+        for model, query in ProgressAggregator._expected_queries(session_ids).items():
+            delete_stmt = delete(model)
+            if session_ids is not None:
+                delete_stmt = delete_stmt.where(model.session_id.in_(session_ids))
+            await db.execute(delete_stmt)
+
+            columns = [column.name for column in query.selected_columns]
+            if model is DifficultyLevelProgress:
+                query = query.add_columns(_is_bonus(
+                    query.selected_columns.single_choice_correct,
+                    query.selected_columns.multiple_choice_correct,
+                    query.selected_columns.questions_correct,
+                ).label("bonus_earned"))
+                columns.append("bonus_earned")
+
+            await db.execute(
+                pg_insert(model.__table__).from_select(columns, query)
+            )
+
+        totals = (
+            select(func.coalesce(func.sum(UserResponse.score_earned), 0))
+            .where(UserResponse.session_id == AssessmentSession.id)
+            .scalar_subquery()
+        )
+        update_stmt = update(AssessmentSession).values(total_score=totals)
+        if session_ids is not None:
+            update_stmt = update_stmt.where(AssessmentSession.id.in_(session_ids))
+        await db.execute(update_stmt.execution_options(synchronize_session=False))
+
+    @staticmethod
+    async def verify(
+        db: AsyncSession,
+        session_ids: Optional[List[int]] = None
+    ) -> List[dict]:
+        """Compare stored progress with a from-scratch recomputation
+
+        Returns one entry per mismatching row; an empty list means the
+        incremental aggregates are correct.
+        """
+        mismatches = []
+        for model, query in ProgressAggregator._expected_queries(session_ids).items():
+            key_column = query.selected_columns[1].name
+            counters = [
+                column.name for column in query.selected_columns
+                if column.name not in ("session_id", key_column)
+            ]
+            expected = {
+                (row.session_id, row[1]): {name: row._mapping[name] for name in counters}
+                for row in (await db.execute(query)).all()
+            }
+
+            stored_query = select(model)
+            if session_ids is not None:
+                stored_query = stored_query.where(model.session_id.in_(session_ids))
+            stored = {
+                (row.session_id, getattr(row, key_column)): {
+                    name: getattr(row, name) for name in counters
+                }
+                for row in (await db.execute(stored_query)).scalars().all()
+            }
+
+            for key in expected.keys() | stored.keys():
+                if expected.get(key) != stored.get(key):
+                    mismatches.append({
+                        "table": model.__tablename__,
+                        "session_id": key[0],
+                        key_column: key[1],
+                        "expected": expected.get(key),
+                        "stored": stored.get(key),
+                    })
+
+        totals_query = (
+            select(
+                AssessmentSession.id,
+                AssessmentSession.total_score,
+                func.coalesce(func.sum(UserResponse.score_earned), 0).label("expected")
+            )
+            .outerjoin(UserResponse, UserResponse.session_id == AssessmentSession.id)
+            .group_by(AssessmentSession.id, AssessmentSession.total_score)
+        )
+        if session_ids is not None:
+            totals_query = totals_query.where(AssessmentSession.id.in_(session_ids))
+        for session_id, stored_total, expected_total in (await db.execute(totals_query)).all():
+            if stored_total != expected_total:
+                mismatches.append({
+                    "table": AssessmentSession.__tablename__,
+                    "session_id": session_id,
+                    "expected": {"total_score": expected_total},
+                    "stored": {"total_score": stored_total},
+                })
+
+        return mismatches
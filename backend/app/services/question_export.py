@@ -0,0 +1,153 @@
+import csv
+import io
+from typing import AsyncIterator, Optional
+import orjson
+from sqlalchemy import select, func, literal_column
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models import (
+    Question, AnswerOption, SubTheme, Category, QuestionTag, question_tag_mapping
+)
+from app.services.question_service import QuestionService
+
+settings = get_settings()
+
+# Questions always have exactly four options (QuestionCreate enforces it)
+CSV_OPTION_COLUMNS = 4
+
+CSV_HEADER = [
+    "id", "category", "sub_theme_id", "sub_theme", "difficulty_level",
+    "question_type", "is_active", "question_text", "rationale", "tags",
+] + [
+    column
+    for number in range(1, CSV_OPTION_COLUMNS + 1)
+    for column in (f"option_{number}", f"option_{number}_correct")
+]
+
+class QuestionExporter:
+    """Streams the question bank as NDJSON or CSV
+
+    Rows come from a server-side cursor (``AsyncSession.stream`` with
+    ``yield_per``). Answer options and tags are aggregated per question in
+    Postgres, so each row is complete on arrival and is written out
+    immediately: memory use depends on the chunk size, not the bank size.
+    """
+
+    @staticmethod
+    def _query(
+        sub_theme_id: Optional[int] = None,
+        difficulty_level: Optional[str] = None,
+        question_type: Optional[str] = None,
+        is_active: Optional[bool] = None
+    ):
+        options = (
+            select(func.coalesce(
+                func.json_agg(aggregate_order_by(
+                    func.json_build_object(
+                        "option_text", AnswerOption.option_text,
+                        "is_correct", AnswerOption.is_correct,
+                        "display_order", AnswerOption.display_order
+                    ),
+                    AnswerOption.display_order
+                )),
+                literal_column("'[]'::json")
+            ))
+            .where(AnswerOption.question_id == Question.id)
+            .scalar_subquery()
+        )
+        tags = (
+            select(func.coalesce(
+                func.array_agg(aggregate_order_by(QuestionTag.name, QuestionTag.name)),
+                literal_column("'{}'::varchar[]")
+            ))
+            .select_from(question_tag_mapping)
+            .join(QuestionTag, question_tag_mapping.c.tag_id == QuestionTag.id)
+            .where(question_tag_mapping.c.question_id == Question.id)
+            .scalar_subquery()
+        )
+        query = (
+            select(
+                Question.id,
+                Category.name.label("category"),
+                Question.sub_theme_id,
+                SubTheme.name.label("sub_theme"),
+                Question.difficulty_level,
+                Question.question_type,
+                Question.is_active,
+                Question.question_text,
+                Question.rationale,
+                tags.label("tags"),
+                options.label("answer_options"),
+            )
+            .join(SubTheme, Question.sub_theme_id == SubTheme.id)
+            .join(Category, SubTheme.category_id == Category.id)
+            .order_by(Question.id)
+        )
+        return QuestionService._apply_filters(
+            query, sub_theme_id, difficulty_level, question_type, is_active
+        )
+
+    @staticmethod
+    async def _partitions(**filters) -> AsyncIterator[list]:
+        # Own session: the request's session may be closed before the
+        # response body is fully sent
+        async with AsyncSessionLocal() as db:
+            result = await db.stream(
+                QuestionExporter._query(**filters).execution_options(
+                    yield_per=settings.export_chunk_size
+                )
+            )
+            async for rows in result.partitions():
+                yield rows
+
+    @staticmethod
+    def _record(row) -> dict:
+        return {
+            "id": row.id,
+            "category": row.category,
+            "sub_theme_id": row.sub_theme_id,
+            "sub_theme": row.sub_theme,
+            "difficulty_level": row.difficulty_level.value,
+            "question_type": row.question_type.value,
+            "is_active": row.is_active,
+            "question_text": row.question_text,
+            "rationale": row.rationale,
+            "tags": list(row.tags),
+            "answer_options": row.answer_options,
+        }
+
+    @staticmethod
+    async def ndjson(**filters) -> AsyncIterator[bytes]:
+        """One JSON object per line, in the QuestionCreate shape plus ids and names"""
+        async for rows in QuestionExporter._partitions(**filters):
+            yield b"".join(
+                orjson.dumps(QuestionExporter._record(row)) + b"\n" for row in rows
+            )
+
+    @staticmethod
+    async def csv(**filters) -> AsyncIterator[str]:
+        """One row per question, options flattened into numbered columns"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(CSV_HEADER)
+
+        async for rows in QuestionExporter._partitions(**filters):
+            for row in rows:
+                record = QuestionExporter._record(row)
+                options = []
+                for option in record["answer_options"][:CSV_OPTION_COLUMNS]:
+                    options.extend([option["option_text"], option["is_correct"]])
+                writer.writerow([
+                    record["id"], record["category"], record["sub_theme_id"],
+                    record["sub_theme"], record["difficulty_level"],
+                    record["question_type"], record["is_active"],
+                    record["question_text"], record["rationale"],
+                    ";".join(record["tags"]),
+                ] + options)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+        if buffer.tell():
+            yield buffer.getvalue()
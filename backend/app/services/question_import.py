@@ -0,0 +1,276 @@
+import csv
+import io
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, insert, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from fastapi import HTTPException, status
+from app.models import Question, AnswerOption, SubTheme, QuestionTag, question_tag_mapping
+from app.schemas import QuestionImport, QuestionImportError, QuestionImportResult
+from app.cache import invalidate
+from app.core.audit import record_audit
+
+FORMATS = ("json", "ndjson", "csv", "yaml")
+
+# Rows per INSERT statement when COPY is not available
+_INSERT_CHUNK = 1000
+
+_TRUE = {"1", "true", "yes", "y", "t"}
+
+class QuestionImporter:
+    """Bulk question import from JSON, NDJSON, CSV or YAML files
+
+    Records are validated in one pass (QuestionImport rules plus a single
+    ``IN`` query for sub-theme existence). Valid questions then get their
+    ids reserved from the sequence in one round trip and are loaded with
+    COPY (asyncpg) or multi-row INSERTs, together with their options and
+    tag mappings, in one transaction.
+    """
+
+    @staticmethod
+    def detect_format(filename: Optional[str]) -> str:
+        suffix = Path(filename or "").suffix.lower().lstrip(".")
+        if suffix == "yml":
+            suffix = "yaml"
+        if suffix == "jsonl":
+            suffix = "ndjson"
+        if suffix not in FORMATS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot infer the file format, use one of: {', '.join(FORMATS)}"
+            )
+        return suffix
+
+    @staticmethod
+    def parse(content: bytes, file_format: str) -> List[dict]:
+        """Raw question records from a file; the export formats round-trip"""
+        try:
+            if file_format == "json":
+                data = json.loads(content)
+            elif file_format == "yaml":
+                # Imported here so the rest of the app works without PyYAML
+                import yaml
+                data = yaml.safe_load(content)
+            elif file_format == "ndjson":
+                data = [
+                    json.loads(line) for line in content.decode("utf-8").splitlines()
+                    if line.strip()
+                ]
+            elif file_format == "csv":
+                data = QuestionImporter._parse_csv(content.decode("utf-8-sig"))
+            else:
+                raise ValueError(f"Unknown format {file_format}")
+        except HTTPException:
+            raise
+        except Exception as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Could not parse {file_format} file: {exc}"
+            )
+
+        if isinstance(data, dict):
+            data = data.get("questions")
+        if not isinstance(data, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Expected a list of questions (or an object with a 'questions' list)"
+            )
+        return data
+
+    @staticmethod
+    def _parse_csv(content: str) -> List[dict]:
+        """Rows in the export CSV layout (option_N / option_N_correct columns)"""
+        records = []
+        for row in csv.DictReader(io.StringIO(content)):
+            options = []
+            number = 1
+            while row.get(f"option_{number}"):
+                options.append({
+                    "option_text": row[f"option_{number}"],
+                    "is_correct": (row.get(f"option_{number}_correct") or "").strip().lower() in _TRUE,
+                    "display_order": number,
+                })
+                number += 1
+            record = {
+                "sub_theme_id": row.get("sub_theme_id"),
+                "difficulty_level": row.get("difficulty_level"),
+                "question_type": row.get("question_type"),
+                "question_text": row.get("question_text"),
+                "rationale": row.get("rationale"),
+                "tags": [tag for tag in (row.get("tags") or "").split(";") if tag],
+                "answer_options": options,
+            }
+            if row.get("is_active"):
+                record["is_active"] = row["is_active"].strip().lower() in _TRUE
+            records.append(record)
+        return records
+
+    @staticmethod
+    async def validate(
+        db: AsyncSession,
+        records: List[dict]
+    ) -> Tuple[List[QuestionImport], List[QuestionImportError]]:
+        """Validate every record; returns the valid questions and the errors"""
+        parsed: List[Tuple[int, QuestionImport]] = []
+        errors: List[QuestionImportError] = []
+        for index, record in enumerate(records):
+            try:
+                parsed.append((index, QuestionImport.model_validate(record)))
+            except ValidationError as exc:
+                message = "; ".join(
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in exc.errors()
+                )
+                errors.append(QuestionImportError(index=index, error=message))
+
+        sub_theme_ids = {question.sub_theme_id for _, question in parsed}
+        existing = set()
+        if sub_theme_ids:
+            result = await db.execute(
+                select(SubTheme.id).where(SubTheme.id.in_(sub_theme_ids))
+            )
+            existing = set(result.scalars().all())
+
+        valid = []
+        for index, question in parsed:
+            if question.sub_theme_id not in existing:
+                errors.append(QuestionImportError(
+                    index=index, error=f"Sub-theme {question.sub_theme_id} not found"
+                ))
+            else:
+                valid.append(question)
+
+        errors.sort(key=lambda error: error.index)
+        return valid, errors
+
+    @staticmethod
+    async def import_records(
+        db: AsyncSession,
+        records: List[dict],
+        created_by_id: Optional[int] = None,
+        dry_run: bool = False,
+        skip_invalid: bool = False
+    ) -> QuestionImportResult:
+        """Validate and load questions; all-or-nothing unless skip_invalid"""
+        questions, errors = await QuestionImporter.validate(db, records)
+        result = QuestionImportResult(
+            received=len(records),
+            imported=0,
+            tags_created=0,
+            dry_run=dry_run,
+            errors=errors
+        )
+        if dry_run or not questions or (errors and not skip_invalid):
+            return result
+
+        result.tags_created = await QuestionImporter._load(db, questions, created_by_id)
+        await db.commit()
+        await invalidate("questions", "catalog")
+        result.imported = len(questions)
+        record_audit(
+            "question.import", "question",
+            new_values={"imported": result.imported, "tags_created": result.tags_created,
+                        "skipped": len(errors)},
+            user_id=created_by_id
+        )
+        return result
+
+    @staticmethod
+    async def _load(
+        db: AsyncSession,
+        questions: List[QuestionImport],
+        created_by_id: Optional[int]
+    ) -> int:
+        """Insert questions, options and tag mappings; returns new tag count"""
+        tag_ids, tags_created = await QuestionImporter._ensure_tags(db, questions)
+
+        # Reserve every question id in one round trip
+        result = await db.execute(
+            text(
+                "SELECT nextval(pg_get_serial_sequence('questions', 'id')) "
+                "FROM generate_series(1, :count)"
+            ),
+            {"count": len(questions)}
+        )
+        question_ids = list(result.scalars().all())
+
+        question_rows, option_rows, mapping_rows = [], [], []
+        for question_id, question in zip(question_ids, questions):
+            question_rows.append((
+                question_id, question.sub_theme_id,
+                question.difficulty_level.name, question.question_type.name,
+                question.question_text, question.rationale, question.is_active,
+                created_by_id, created_by_id
+            ))
+            for option in question.answer_options:
+                option_rows.append((
+                    question_id, option.option_text, option.is_correct, option.display_order
+                ))
+            for tag in dict.fromkeys(question.tags):
+                mapping_rows.append((question_id, tag_ids[tag]))
+
+        question_columns = [
+            "id", "sub_theme_id", "difficulty_level", "question_type",
+            "question_text", "rationale", "is_active", "created_by", "updated_by"
+        ]
+        option_columns = ["question_id", "option_text", "is_correct", "display_order"]
+        mapping_columns = ["question_id", "tag_id"]
+
+        connection = await db.connection()
+        if connection.dialect.driver == "asyncpg":
+            raw = (await connection.get_raw_connection()).driver_connection
+            await raw.copy_records_to_table(
+                Question.__tablename__, records=question_rows, columns=question_columns
+            )
+            await raw.copy_records_to_table(
+                AnswerOption.__tablename__, records=option_rows, columns=option_columns
+            )
+            if mapping_rows:
+                await raw.copy_records_to_table(
+                    question_tag_mapping.name, records=mapping_rows, columns=mapping_columns
+                )
+        else:
+            for table, columns, rows in (
+                (Question.__table__, question_columns, question_rows),
+                (AnswerOption.__table__, option_columns, option_rows),
+                (question_tag_mapping, mapping_columns, mapping_rows),
+            ):
+                for start in range(0, len(rows), _INSERT_CHUNK):
+                    chunk = rows[start:start + _INSERT_CHUNK]
+                    await db.execute(
+                        insert(table),
+                        [dict(zip(columns, row)) for row in chunk]
+                    )
+
+        return tags_created
+
+    @staticmethod
+    async def _ensure_tags(
+        db: AsyncSession,
+        questions: List[QuestionImport]
+    ) -> Tuple[Dict[str, int], int]:
+        names = sorted({tag for question in questions for tag in question.tags})
+        if not names:
+            return {}, 0
+
+        tag_ids: Dict[str, int] = {}
+        tags_created = 0
+        # Chunked: one statement is limited to 32767 bind parameters
+        for start in range(0, len(names), _INSERT_CHUNK):
+            chunk = names[start:start + _INSERT_CHUNK]
+            created = await db.execute(
+                pg_insert(QuestionTag)
+                .values([{"name": name} for name in chunk])
+                .on_conflict_do_nothing(index_elements=["name"])
+                .returning(QuestionTag.id)
+            )
+            tags_created += len(created.all())
+
+            result = await db.execute(
+                select(QuestionTag.name, QuestionTag.id).where(QuestionTag.name.in_(chunk))
+            )
+            tag_ids.update(result.all())
+        return tag_ids, tags_created
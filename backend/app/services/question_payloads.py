@@ -0,0 +1,126 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+import orjson
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from fastapi import HTTPException, status
+from app.config import get_settings
+from app.cache import get_cache
+from app.metrics import cache_metrics
+from app.models import Question, AnswerOption, SubTheme, Category
+from app.schemas import QuestionInAssessment
+
+settings = get_settings()
+
+class QuestionPayloadCache:
+    """Serialized QuestionInAssessment payloads, ready to write to the socket
+
+    Payloads are orjson bytes kept in a small per-worker LRU in front of
+    the shared cache backend. Both levels are keyed by the
+    "question_payloads" namespace version, which every question, option,
+    sub-theme and category edit bumps, so a hit never touches the ORM or
+    re-validates the schema. A miss is built with two Core queries.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._local: "OrderedDict[Tuple[int, int], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.metrics = cache_metrics("question_payloads")
+
+    @property
+    def cache(self):
+        return get_cache("question_payloads")
+
+    async def get(self, db: AsyncSession, question_id: int) -> bytes:
+        """Payload bytes of one question, building it on a miss"""
+        version = await self.cache.version()
+        local_key = (version, question_id)
+        with self._lock:
+            payload = self._local.get(local_key)
+            if payload is not None:
+                self._local.move_to_end(local_key)
+                self.local_hits += 1
+                self.metrics.hit()
+                return payload
+
+        shared_key = await self.cache.full_key(str(question_id))
+        payload = await self.cache.backend.get(shared_key)
+        if payload is not None:
+            self.shared_hits += 1
+            self.metrics.hit()
+        else:
+            self.misses += 1
+            self.metrics.miss()
+            payload = await self.build(db, question_id)
+            await self.cache.backend.set(shared_key, payload, self.ttl_seconds)
+
+        with self._lock:
+            self._local[local_key] = payload
+            while len(self._local) > self.max_size:
+                self._local.popitem(last=False)
+        return payload
+
+    @staticmethod
+    async def build(db: AsyncSession, question_id: int) -> bytes:
+        """Render a question as presented to the student (no is_correct)"""
+        question = (await db.execute(
+            select(
+                Question.id, Question.question_text, Question.question_type,
+                Question.difficulty_level,
+                SubTheme.name.label("sub_theme"), Category.name.label("category")
+            )
+            .join(SubTheme, Question.sub_theme_id == SubTheme.id)
+            .join(Category, SubTheme.category_id == Category.id)
+            .where(Question.id == question_id)
+        )).one_or_none()
+        if question is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Question not found"
+            )
+
+        options = await db.execute(
+            select(AnswerOption.id, AnswerOption.option_text, AnswerOption.display_order)
+            .where(AnswerOption.question_id == question_id)
+            .order_by(AnswerOption.display_order, AnswerOption.id)
+        )
+
+        payload = QuestionInAssessment(
+            id=question.id,
+            question_text=question.question_text,
+            question_type=question.question_type,
+            difficulty_level=question.difficulty_level.value,
+            points=question.difficulty_level.points,
+            options=[
+                {"id": option_id, "text": text, "display_order": display_order}
+                for option_id, text, display_order in options.all()
+            ],
+            category=question.category,
+            sub_theme=question.sub_theme
+        )
+        return orjson.dumps(payload.model_dump(mode="json"))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._local)
+        return {
+            "local_size": size,
+            "local_hits": self.local_hits,
+            "shared_hits": self.shared_hits,
+            "misses": self.misses,
+        }
+
+question_payloads = QuestionPayloadCache(
+    max_size=settings.question_payload_local_size,
+    ttl_seconds=settings.question_payload_ttl_seconds,
+)
@@ -0,0 +1,206 @@
+import random
+import asyncio
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.cache import get_cache
+from app.models import Question, SubTheme
+
+BucketKey = Tuple[int, str, str]  # (sub_theme_id, difficulty_level, question_type)
+
+class _Bucket:
+    """Unordered id set with O(1) add, remove and uniform random pick"""
+
+    __slots__ = ("ids", "positions")
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self.positions: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, question_id: int) -> None:
+        if question_id not in self.positions:
+            self.positions[question_id] = len(self.ids)
+            self.ids.append(question_id)
+
+    def remove(self, question_id: int) -> None:
+        position = self.positions.pop(question_id, None)
+        if position is None:
+            return
+        # Swap the last id into the hole so removal stays O(1)
+        last = self.ids.pop()
+        if last != question_id:
+            self.ids[position] = last
+            self.positions[last] = position
+
+class QuestionPoolRegistry:
+    """In-memory pools of active question ids, one per bucket
+
+    Buckets are keyed by ``(sub_theme_id, difficulty_level, question_type)``
+    so a draw only touches the buckets matching the filters and picks an
+    index at random instead of running ``ORDER BY random()``. Writes on
+    this worker update the pools in place; writes on other workers are
+    noticed through the "questions"/"sub_themes" cache namespace versions
+    and trigger a full reload.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[BucketKey, _Bucket] = {}
+        self._question_keys: Dict[int, BucketKey] = {}
+        self._sub_theme_categories: Dict[int, int] = {}
+        self._versions: Optional[Tuple[int, int]] = None
+        self._load_lock = asyncio.Lock()
+        self.reloads = 0
+
+    @staticmethod
+    async def _current_versions() -> Tuple[int, int]:
+        return (
+            await get_cache("questions").version(),
+            await get_cache("sub_themes").version(),
+        )
+
+    async def ensure_loaded(self, db: AsyncSession) -> None:
+        """(Re)load the pools if they are empty or another worker changed questions"""
+        if self._versions == await self._current_versions():
+            return
+        async with self._load_lock:
+            versions = await self._current_versions()
+            if self._versions != versions:
+                await self._load(db)
+                self._versions = versions
+
+    async def _load(self, db: AsyncSession) -> None:
+        sub_themes = await db.execute(select(SubTheme.id, SubTheme.category_id))
+        questions = await db.execute(
+            select(
+                Question.id, Question.sub_theme_id,
+                Question.difficulty_level, Question.question_type
+            )
+            .where(Question.is_active == True)
+        )
+
+        self._sub_theme_categories = dict(sub_themes.all())
+        self._buckets = {}
+        self._question_keys = {}
+        for question_id, sub_theme_id, level, question_type in questions.all():
+            self._add(question_id, (sub_theme_id, level.value, question_type.value))
+        self.reloads += 1
+
+    def _add(self, question_id: int, key: BucketKey) -> None:
+        self._remove(question_id)
+        self._buckets.setdefault(key, _Bucket()).add(question_id)
+        self._question_keys[question_id] = key
+
+    def _remove(self, question_id: int) -> None:
+        key = self._question_keys.pop(question_id, None)
+        if key is not None:
+            self._buckets[key].remove(question_id)
+
+    async def sync_question(self, db: AsyncSession, question_id: int) -> None:
+        """Refresh one question after a write on this worker
+
+        Call after the write was committed and the "questions" namespace
+        invalidated; the pools stay loaded unless someone else also wrote.
+        """
+        if self._versions is None:
+            return
+        row = (await db.execute(
+            select(
+                Question.sub_theme_id, Question.difficulty_level,
+                Question.question_type, Question.is_active
+            )
+            .where(Question.id == question_id)
+        )).one_or_none()
+
+        if row is None or not row.is_active:
+            self._remove(question_id)
+        else:
+            self._add(question_id, (
+                row.sub_theme_id, row.difficulty_level.value, row.question_type.value
+            ))
+
+        # Adopt our own version bump; anything more means another writer
+        questions_version, sub_themes_version = await self._current_versions()
+        if (questions_version == self._versions[0] + 1
+                and sub_themes_version == self._versions[1]):
+            self._versions = (questions_version, sub_themes_version)
+
+    def sub_theme_ids(
+        self,
+        category_ids: Optional[Iterable[int]] = None,
+        sub_theme_ids: Optional[Iterable[int]] = None
+    ) -> Set[int]:
+        """Resolve the category/sub-theme filters to sub-theme ids"""
+        selected = set(self._sub_theme_categories)
+        if category_ids:
+            categories = set(category_ids)
+            selected = {
+                sub_theme_id for sub_theme_id in selected
+                if self._sub_theme_categories[sub_theme_id] in categories
+            }
+        if sub_theme_ids:
+            selected &= set(sub_theme_ids)
+        return selected
+
+    def sub_theme_of(self, question_id: int) -> int:
+        return self._question_keys[question_id][0]
+
+    def category_id(self, sub_theme_id: int) -> int:
+        return self._sub_theme_categories[sub_theme_id]
+
+    def draw(
+        self,
+        sub_theme_ids: Iterable[int],
+        difficulty_level: str,
+        question_type: str,
+        count: int,
+        exclude: Iterable[int] = ()
+    ) -> List[int]:
+        """Draw up to ``count`` distinct question ids from the matching buckets"""
+        buckets = [
+            bucket for bucket in (
+                self._buckets.get((sub_theme_id, difficulty_level, question_type))
+                for sub_theme_id in sub_theme_ids
+            )
+            if bucket
+        ]
+        excluded = set(exclude)
+        available = sum(len(bucket) for bucket in buckets)
+        drawn: List[int] = []
+        attempts = 0
+
+        # Pick a uniform position across all matching buckets; a few misses
+        # on already-taken ids are cheap, so retry before falling back
+        while len(drawn) < count and attempts < count * 8 and available:
+            attempts += 1
+            position = random.randrange(available)
+            for bucket in buckets:
+                if position < len(bucket):
+                    question_id = bucket.ids[position]
+                    break
+                position -= len(bucket)
+            if question_id not in excluded:
+                excluded.add(question_id)
+                drawn.append(question_id)
+
+        if len(drawn) < count:
+            remaining = [
+                question_id
+                for bucket in buckets for question_id in bucket.ids
+                if question_id not in excluded
+            ]
+            drawn.extend(random.sample(remaining, min(count - len(drawn), len(remaining))))
+        return drawn
+
+    def stats(self) -> dict:
+        return {
+            "loaded": self._versions is not None,
+            "reloads": self.reloads,
+            "questions": len(self._question_keys),
+            "buckets": sum(1 for bucket in self._buckets.values() if bucket),
+            "sub_themes": len(self._sub_theme_categories),
+        }
+
+question_pool = QuestionPoolRegistry()
@@ -1,11 +1,28 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
-from app.models import Question, AnswerOption, SubTheme, QuestionTag, question_tag_mapping
-from app.schemas import QuestionCreate, QuestionUpdate, AnswerOptionCreate
+from app.models import (
+    Question, AnswerOption, SubTheme, QuestionTag, question_tag_mapping, RegradeJob
+)
+from app.schemas import (
+    QuestionCreate, QuestionUpdate, AnswerOptionCreate, AnswerOptionUpdate,
+    QuestionWithDetails
+)
 from app.models.enums import QuestionType
+from app.cache import get_cache, invalidate
+from app.core.pagination import decode_cursor, page_cursors, NEXT
+from app.core.audit import record_audit, audit_diff, audit_snapshot
+from app.services.regrade_service import RegradeService
+from app.services.question_pool import question_pool
+
+# Columns of QuestionResponse, in the order _rows_to_dicts unpacks them
+_QUESTION_COLUMNS = (
+    Question.id, Question.sub_theme_id, Question.difficulty_level,
+    Question.question_type, Question.question_text, Question.rationale,
+    Question.is_active, Question.created_at, Question.updated_at,
+)
 
 class QuestionService:
     @staticmethod
@@ -46,6 +63,12 @@ class QuestionService:
         
         await db.commit()
         await db.refresh(question)
+        await invalidate("questions", "catalog")
+        await question_pool.sync_question(db, question.id)
+        record_audit(
+            "question.create", "question", question.id,
+            new_values=audit_snapshot(question), user_id=created_by_id
+        )
         
         # Load answer options
         await db.execute(
@@ -72,7 +95,87 @@ class QuestionService:
             selectinload(Question.sub_theme)
         )
         
-        # Apply filters
+        query = QuestionService._apply_filters(
+            query, sub_theme_id, difficulty_level, question_type, is_active
+        )
+        query = query.offset(skip).limit(limit).order_by(Question.id)
+        
+        result = await db.execute(query)
+        return result.scalars().all()
+    
+    @staticmethod
+    async def get_question_rows(
+        db: AsyncSession,
+        sub_theme_id: Optional[int] = None,
+        difficulty_level: Optional[str] = None,
+        question_type: Optional[str] = None,
+        is_active: Optional[bool] = True,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[dict]:
+        """Same result as get_questions, as QuestionResponse-shaped dicts
+        
+        Built straight from Core row tuples: no identity map, no ORM
+        instances and no Pydantic validation.
+        """
+        query = select(*_QUESTION_COLUMNS)
+        query = QuestionService._apply_filters(
+            query, sub_theme_id, difficulty_level, question_type, is_active
+        )
+        query = query.offset(skip).limit(limit).order_by(Question.id)
+        
+        result = await db.execute(query)
+        return await QuestionService._rows_to_dicts(db, result.all())
+    
+    @staticmethod
+    async def _rows_to_dicts(db: AsyncSession, rows) -> List[dict]:
+        """Turn question row tuples into dicts and attach their answer options"""
+        questions = {}
+        for (question_id, sub_theme_id, level, question_type, question_text,
+             rationale, is_active, created_at, updated_at) in rows:
+            questions[question_id] = {
+                "id": question_id,
+                "sub_theme_id": sub_theme_id,
+                "difficulty_level": level.value,
+                "question_type": question_type.value,
+                "question_text": question_text,
+                "rationale": rationale,
+                "is_active": is_active,
+                "points": level.points,
+                "created_at": created_at.isoformat(),
+                "updated_at": updated_at.isoformat(),
+                "answer_options": [],
+            }
+        
+        if questions:
+            options = await db.execute(
+                select(
+                    AnswerOption.question_id, AnswerOption.id,
+                    AnswerOption.option_text, AnswerOption.is_correct,
+                    AnswerOption.display_order
+                )
+                .where(AnswerOption.question_id.in_(list(questions)))
+                .order_by(AnswerOption.question_id, AnswerOption.display_order)
+            )
+            for question_id, option_id, option_text, is_correct, display_order in options.all():
+                questions[question_id]["answer_options"].append({
+                    "id": option_id,
+                    "option_text": option_text,
+                    "is_correct": is_correct,
+                    "display_order": display_order,
+                })
+        
+        return list(questions.values())
+    
+    @staticmethod
+    def _apply_filters(
+        query,
+        sub_theme_id: Optional[int] = None,
+        difficulty_level: Optional[str] = None,
+        question_type: Optional[str] = None,
+        is_active: Optional[bool] = True
+    ):
+        """Apply the common question list filters to a select"""
         if sub_theme_id:
             query = query.where(Question.sub_theme_id == sub_theme_id)
         if difficulty_level:
@@ -81,11 +184,94 @@ class QuestionService:
             query = query.where(Question.question_type == question_type)
         if is_active is not None:
             query = query.where(Question.is_active == is_active)
+        return query
+    
+    @staticmethod
+    async def get_questions_page(
+        db: AsyncSession,
+        sub_theme_id: Optional[int] = None,
+        difficulty_level: Optional[str] = None,
+        question_type: Optional[str] = None,
+        is_active: Optional[bool] = True,
+        cursor: Optional[str] = None,
+        limit: int = 100
+    ) -> dict:
+        """Get a page of questions using keyset pagination on Question.id
         
-        query = query.offset(skip).limit(limit).order_by(Question.id)
+        Unlike offset paging, the cost of a page does not depend on how
+        deep it is: the cursor becomes an indexed ``id > x`` (or ``id < x``)
+        predicate.
+        """
+        query = select(Question).options(
+            selectinload(Question.answer_options),
+            selectinload(Question.sub_theme)
+        )
+        query = QuestionService._apply_filters(
+            query, sub_theme_id, difficulty_level, question_type, is_active
+        )
         
-        result = await db.execute(query)
-        return result.scalars().all()
+        direction = NEXT
+        if cursor:
+            last_id, direction = decode_cursor(cursor)
+            if direction == NEXT:
+                query = query.where(Question.id > last_id)
+            else:
+                query = query.where(Question.id < last_id)
+        
+        if direction == NEXT:
+            query = query.order_by(Question.id)
+        else:
+            query = query.order_by(Question.id.desc())
+        
+        # Fetch one extra row to know whether another page exists
+        result = await db.execute(query.limit(limit + 1))
+        questions = list(result.scalars().all())
+        has_more = len(questions) > limit
+        questions = questions[:limit]
+        
+        if direction != NEXT:
+            questions.reverse()
+        
+        next_cursor, prev_cursor = page_cursors(
+            questions[0].id if questions else None,
+            questions[-1].id if questions else None,
+            direction,
+            has_cursor=cursor is not None,
+            has_more=has_more
+        )
+        
+        return {
+            "items": questions,
+            "next_cursor": next_cursor,
+            "prev_cursor": prev_cursor,
+            "limit": limit
+        }
+    
+    @staticmethod
+    async def get_cached_questions(
+        db: AsyncSession,
+        sub_theme_id: Optional[int] = None,
+        difficulty_level: Optional[str] = None,
+        question_type: Optional[str] = None,
+        is_active: Optional[bool] = True,
+        skip: int = 0,
+        limit: int = 100
+    ) -> List[dict]:
+        """Get questions with filters as serialized dicts, through the shared cache"""
+        async def load():
+            return await QuestionService.get_question_rows(
+                db, sub_theme_id, difficulty_level,
+                question_type, is_active, skip, limit
+            )
+        
+        cache = get_cache("questions")
+        return await cache.get_or_set(
+            cache.key(
+                "list", sub_theme_id, difficulty_level,
+                question_type, is_active, skip, limit
+            ),
+            load
+        )
     
     @staticmethod
     async def get_question(
@@ -116,6 +302,21 @@ class QuestionService:
         
         return question
     
+    @staticmethod
+    async def get_cached_question(
+        db: AsyncSession,
+        question_id: int
+    ) -> dict:
+        """Get a single question with details, through the shared cache"""
+        async def load():
+            question = await QuestionService.get_question(
+                db, question_id, include_details=True
+            )
+            return QuestionWithDetails.model_validate(question).model_dump(mode="json")
+        
+        cache = get_cache("questions")
+        return await cache.get_or_set(cache.key("detail", question_id), load)
+    
     @staticmethod
     async def update_question(
         db: AsyncSession,
@@ -132,21 +333,104 @@ class QuestionService:
             setattr(question, field, value)
         
         question.updated_by = updated_by_id
+        old_values, new_values = audit_diff(question)
         
         await db.commit()
         await db.refresh(question)
+        await invalidate("questions", "question_payloads", "catalog")
+        await question_pool.sync_question(db, question_id)
+        record_audit(
+            "question.update", "question", question_id,
+            old_values, new_values, user_id=updated_by_id
+        )
         return question
     
+    @staticmethod
+    async def update_answer_option(
+        db: AsyncSession,
+        question_id: int,
+        option_id: int,
+        option_data: AnswerOptionUpdate,
+        updated_by_id: int
+    ) -> Tuple[Question, Optional[RegradeJob]]:
+        """Update an answer option; queue a re-grade if the answer key changed
+
+        Marking an option of a single choice question correct unmarks the
+        others, so the key moves in one edit instead of two invalid ones.
+        """
+        question = await QuestionService.get_question(db, question_id)
+        option = next(
+            (opt for opt in question.answer_options if opt.id == option_id), None
+        )
+        if not option:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Answer option not found"
+            )
+        
+        update_data = option_data.model_dump(exclude_unset=True)
+        key_changed = (
+            "is_correct" in update_data
+            and update_data["is_correct"] != option.is_correct
+        )
+        for field, value in update_data.items():
+            setattr(option, field, value)
+        
+        unmarked = []
+        if question.question_type == QuestionType.SINGLE_CHOICE and update_data.get("is_correct"):
+            for other in question.answer_options:
+                if other.id != option_id and other.is_correct:
+                    other.is_correct = False
+                    unmarked.append(other.id)
+        
+        if not await QuestionService.validate_question_answers(question):
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid number of correct answers for this question type"
+            )
+        
+        question.updated_by = updated_by_id
+        old_values, new_values = audit_diff(option)
+        await db.commit()
+        await invalidate("questions", "question_payloads", "catalog")
+        old_values["question_id"] = new_values["question_id"] = question_id
+        if unmarked:
+            new_values["unmarked_option_ids"] = unmarked
+        record_audit(
+            "answer_option.update", "answer_option", option_id,
+            old_values, new_values, user_id=updated_by_id
+        )
+        
+        question = await QuestionService.get_question(db, question_id)
+        job = None
+        if key_changed:
+            # Live sessions reload the key before scoring their next answer
+            await invalidate("answer_keys")
+            job = await RegradeService.create_job(db, [question_id], updated_by_id)
+        return question, job
+    
     @staticmethod
     async def delete_question(
         db: AsyncSession,
-        question_id: int
+        question_id: int,
+        deleted_by_id: Optional[int] = None
     ) -> dict:
         """Delete a question (cascades to answer options)"""
         question = await QuestionService.get_question(db, question_id)
+        old_values = audit_snapshot(question)
+        old_values["answer_options"] = [
+            audit_snapshot(option) for option in question.answer_options
+        ]
         
         await db.delete(question)
         await db.commit()
+        await invalidate("questions", "question_payloads", "catalog")
+        await question_pool.sync_question(db, question_id)
+        record_audit(
+            "question.delete", "question", question_id,
+            old_values=old_values, user_id=deleted_by_id
+        )
         
         return {"message": f"Question {question_id} deleted successfully"}
     
@@ -161,9 +445,16 @@ class QuestionService:
         
         question.is_active = not question.is_active
         question.updated_by = updated_by_id
+        old_values, new_values = audit_diff(question)
         
         await db.commit()
         await db.refresh(question)
+        await invalidate("questions", "question_payloads", "catalog")
+        await question_pool.sync_question(db, question_id)
+        record_audit(
+            "question.toggle_active", "question", question_id,
+            old_values, new_values, user_id=updated_by_id
+        )
         return question
     
     @staticmethod
@@ -171,24 +462,21 @@ class QuestionService:
         db: AsyncSession,
         category_id: int,
         difficulty_level: Optional[str] = None,
-        is_active: bool = True
-    ) -> List[Question]:
-        """Get all questions in a category"""
-        query = select(Question).join(SubTheme).where(
-            and_(
-                SubTheme.category_id == category_id,
-                Question.is_active == is_active
-            )
-        ).options(
-            selectinload(Question.answer_options),
-            selectinload(Question.sub_theme)
+        is_active: Optional[bool] = True
+    ) -> List[dict]:
+        """Get all questions in a category as QuestionResponse-shaped dicts"""
+        query = (
+            select(*_QUESTION_COLUMNS)
+            .join(SubTheme, Question.sub_theme_id == SubTheme.id)
+            .where(SubTheme.category_id == category_id)
+            .order_by(Question.id)
+        )
+        query = QuestionService._apply_filters(
+            query, difficulty_level=difficulty_level, is_active=is_active
         )
-        
-        if difficulty_level:
-            query = query.where(Question.difficulty_level == difficulty_level)
         
         result = await db.execute(query)
-        return result.scalars().all()
+        return await QuestionService._rows_to_dicts(db, result.all())
     
     @staticmethod
     async def validate_question_answers(question: Question) -> bool:
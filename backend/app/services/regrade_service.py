@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, List, Optional
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, or_, and_, bindparam
+from fastapi import HTTPException, status
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models import UserResponse, ResponseAnswer, RegradeJob, RegradeStatus
+from app.services.progress_service import ProgressAggregator
+from app.services.scoring import ScoringEngine
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+class RegradeService:
+    """Re-scores stored responses after an answer key changes
+
+    A job streams the affected user_responses through a server-side cursor
+    in id order, re-scores each chunk with ScoringEngine.rescore, writes the
+    changed scores back with one executemany UPDATE and rebuilds progress
+    for the touched sessions. The chunk's writes and the job checkpoint
+    (``last_response_id``) are committed together, so a crashed job resumes
+    exactly after the last committed chunk.
+
+    Answers scored with the old key may still sit in a worker's
+    ResponseBuffer when the job starts, so the job only finishes after an
+    empty pass that comes at least two flush intervals after it started.
+    """
+
+    @staticmethod
+    async def create_job(
+        db: AsyncSession,
+        question_ids: List[int],
+        requested_by: Optional[int] = None
+    ) -> RegradeJob:
+        """Queue a re-grade of every response to the given questions"""
+        question_ids = sorted(set(question_ids))
+        if not question_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="At least one question id is required"
+            )
+
+        total = await db.scalar(
+            select(func.count(UserResponse.id))
+            .where(UserResponse.question_id.in_(question_ids))
+        )
+        job = RegradeJob(
+            question_ids=question_ids,
+            status=RegradeStatus.PENDING,
+            last_response_id=0,
+            total_responses=total,
+            processed_responses=0,
+            changed_responses=0,
+            sessions_rebuilt=0,
+            requested_by=requested_by
+        )
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+    @staticmethod
+    async def get_job(db: AsyncSession, job_id: int) -> RegradeJob:
+        """Get a single re-grade job by ID"""
+        job = await db.get(RegradeJob, job_id)
+        if not job:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Regrade job not found"
+            )
+        return job
+
+    @staticmethod
+    async def get_jobs(
+        db: AsyncSession,
+        status_filter: Optional[RegradeStatus] = None,
+        limit: int = 50
+    ) -> List[RegradeJob]:
+        """Most recent re-grade jobs first"""
+        query = select(RegradeJob).order_by(RegradeJob.id.desc()).limit(limit)
+        if status_filter is not None:
+            query = query.where(RegradeJob.status == status_filter)
+        result = await db.execute(query)
+        return result.scalars().all()
+
+    @staticmethod
+    async def get_resumable_job_ids(db: AsyncSession) -> List[int]:
+        """Pending and failed jobs, plus running ones whose runner went away"""
+        result = await db.execute(
+            select(RegradeJob.id)
+            .where(RegradeService._claimable())
+            .order_by(RegradeJob.id)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    def _claimable():
+        stale_before = func.now() - timedelta(seconds=settings.regrade_stale_after_seconds)
+        return or_(
+            RegradeJob.status.in_([RegradeStatus.PENDING, RegradeStatus.FAILED]),
+            and_(
+                RegradeJob.status == RegradeStatus.RUNNING,
+                RegradeJob.updated_at < stale_before
+            )
+        )
+
+    @staticmethod
+    async def _claim(db: AsyncSession, job_id: int) -> bool:
+        """Atomically mark a job as running; False if someone else owns it"""
+        result = await db.execute(
+            update(RegradeJob)
+            .where(RegradeJob.id == job_id, RegradeService._claimable())
+            .values(
+                status=RegradeStatus.RUNNING,
+                started_at=func.coalesce(RegradeJob.started_at, func.now()),
+                error=None
+            )
+            .returning(RegradeJob.id)
+        )
+        claimed = result.scalar_one_or_none() is not None
+        await db.commit()
+        return claimed
+
+    @staticmethod
+    def _responses_query(question_ids: List[int], after_id: int):
+        option_ids = func.array_remove(
+            func.array_agg(ResponseAnswer.answer_option_id), None
+        )
+        return (
+            select(
+                UserResponse.id,
+                UserResponse.response_time,
+                UserResponse.session_id,
+                UserResponse.question_id,
+                UserResponse.dont_know,
+                UserResponse.score_earned,
+                option_ids.label("option_ids")
+            )
+            .outerjoin(ResponseAnswer, ResponseAnswer.user_response_id == UserResponse.id)
+            .where(
+                UserResponse.question_id.in_(question_ids),
+                UserResponse.id > after_id
+            )
+            .group_by(UserResponse.id, UserResponse.response_time)
+            .order_by(UserResponse.id)
+        )
+
+    @staticmethod
+    async def run_job(
+        job_id: int,
+        chunk_size: Optional[int] = None,
+        on_progress: Optional[Callable[[RegradeJob], None]] = None
+    ) -> Optional[RegradeJob]:
+        """Run (or resume) a job to completion; None if it is not claimable"""
+        chunk_size = chunk_size or settings.regrade_chunk_size
+
+        async with AsyncSessionLocal() as db:
+            if not await RegradeService._claim(db, job_id):
+                logger.info("Regrade job %s is not claimable, skipping", job_id)
+                return None
+
+            job = await db.get(RegradeJob, job_id)
+            try:
+                keys = await ScoringEngine.load_keys(db, job.question_ids)
+                await db.commit()
+                settle_until = time.monotonic() + 2 * settings.response_flush_interval_seconds
+
+                # Keep reading until a pass finds nothing new, so answers
+                # flushed while the job was running are re-scored too
+                while True:
+                    seen = 0
+                    async with AsyncSessionLocal() as reader:
+                        result = await reader.stream(
+                            RegradeService._responses_query(
+                                job.question_ids, job.last_response_id
+                            ).execution_options(yield_per=chunk_size)
+                        )
+                        async for rows in result.partitions():
+                            seen += len(rows)
+                            await RegradeService._apply_chunk(db, job, keys, rows)
+                            if on_progress:
+                                on_progress(job)
+                    if not seen:
+                        if time.monotonic() >= settle_until:
+                            break
+                        await asyncio.sleep(settings.response_flush_interval_seconds)
+
+                job.status = RegradeStatus.COMPLETED
+                job.total_responses = max(job.total_responses, job.processed_responses)
+                job.finished_at = datetime.now()
+                await db.commit()
+            except Exception as exc:
+                logger.exception("Regrade job %s failed", job_id)
+                await db.rollback()
+                job = await db.get(RegradeJob, job_id, populate_existing=True)
+                job.status = RegradeStatus.FAILED
+                job.error = str(exc)[:2000]
+                await db.commit()
+
+            if on_progress:
+                on_progress(job)
+            return job
+
+    @staticmethod
+    async def _apply_chunk(db: AsyncSession, job: RegradeJob, keys: dict, rows) -> None:
+        """Re-score one chunk and commit it together with the checkpoint"""
+        # Responses to questions deleted since the job was queued are skipped
+        scorable = [row for row in rows if row.question_id in keys]
+        changed_sessions = set()
+        changed = 0
+
+        if scorable:
+            new_scores = ScoringEngine.rescore(
+                keys,
+                [row.question_id for row in scorable],
+                [row.option_ids for row in scorable],
+                [row.dont_know for row in scorable]
+            )
+            old_scores = np.array([float(row.score_earned) for row in scorable])
+            updates = []
+            for index in np.flatnonzero(new_scores != old_scores):
+                row = scorable[index]
+                updates.append({
+                    "b_id": row.id,
+                    "b_time": row.response_time,
+                    "b_score": Decimal(str(new_scores[index]))
+                })
+                changed_sessions.add(row.session_id)
+            changed = len(updates)
+
+            if updates:
+                responses = UserResponse.__table__
+                await db.execute(
+                    update(responses)
+                    # response_time lets Postgres prune to one partition
+                    .where(
+                        responses.c.id == bindparam("b_id"),
+                        responses.c.response_time == bindparam("b_time")
+                    )
+                    .values(score_earned=bindparam("b_score")),
+                    updates
+                )
+                await ProgressAggregator.rebuild(db, sorted(changed_sessions))
+
+        job.last_response_id = rows[-1].id
+        job.processed_responses += len(rows)
+        job.changed_responses += changed
+        job.sessions_rebuilt += len(changed_sessions)
+        await db.commit()
@@ -0,0 +1,123 @@
+import textwrap
+from typing import List, Tuple
+
+# Bump whenever the rendered layout changes: cached PDFs are addressed by
+# this version, so old files simply stop being looked up
+TEMPLATE_VERSION = "1"
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842  # A4 in points
+MARGIN = 56
+LINE_HEIGHT = 14
+WRAP_COLUMNS = 90
+
+# (font size, text) lines of a document
+Line = Tuple[int, str]
+
+def _escape(text: str) -> bytes:
+    """PDF string literal body in the standard (Latin-1) font encoding"""
+    raw = text.encode("latin-1", "replace")
+    return raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+def _wrap(size: int, text: str) -> List[Line]:
+    if not text:
+        return [(size, "")]
+    return [(size, part) for part in textwrap.wrap(text, WRAP_COLUMNS * 11 // size)]
+
+def _paginate(lines: List[Line]) -> List[List[Line]]:
+    per_page = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+    pages = [lines[i:i + per_page] for i in range(0, len(lines), per_page)]
+    return pages or [[]]
+
+def _page_stream(lines: List[Line]) -> bytes:
+    out = [b"BT", b"%d TL" % LINE_HEIGHT, b"%d %d Td" % (MARGIN, PAGE_HEIGHT - MARGIN)]
+    for size, text in lines:
+        out.append(b"/F1 %d Tf (%s) Tj T*" % (size, _escape(text)))
+    out.append(b"ET")
+    return b"\n".join(out)
+
+def build_pdf(lines: List[Line]) -> bytes:
+    """A minimal text-only PDF (Helvetica, A4), no third-party renderer needed"""
+    pages = _paginate(lines)
+    # 1: catalog, 2: page tree, 3: font, then a page + content pair per page
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+            b" ".join(b"%d 0 R" % pid for pid in page_ids), len(pages)
+        ),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    for page_id, page in zip(page_ids, pages):
+        stream = _page_stream(page)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (PAGE_WIDTH, PAGE_HEIGHT, page_id + 1)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+
+    body = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref = len(body)
+    body += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    body += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    body += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref
+    )
+    return bytes(body)
+
+def report_lines(report_type: str, data: dict) -> List[Line]:
+    """Printable lines of a stored AssessmentReport.report_data"""
+    session = data["session"]
+    lines: List[Line] = []
+
+    if report_type == "certificate":
+        certificate = data["certificate"]
+        lines += [(24, "Certificate of Completion"), (12, ""),
+                  (12, "This certifies that"), (18, certificate["holder"]), (12, ""),
+                  (12, f"completed the cyber skills assessment #{session['id']}"),
+                  (12, f"with a score of {certificate['total_score']:g} / "
+                       f"{certificate['total_possible_score']:g} "
+                       f"({certificate['percentage']:g}%)."),
+                  (12, ""), (10, f"Issued {certificate['issued_at'][:10]}")]
+        return lines
+
+    lines += [(18, f"Assessment report #{session['id']}"), (12, "")]
+    lines += [(10, f"Started: {session['start_time']}"),
+              (10, f"Finished: {session['end_time'] or '-'}"),
+              (10, f"Score: {session['total_score']:g} / {session['total_possible_score']:g}"),
+              (10, f"Questions answered: {session['questions_answered']}"), (10, "")]
+
+    lines.append((14, "By difficulty"))
+    for row in data["difficulty_breakdown"]:
+        lines.append((10, f"{row['difficulty']}: {row['questions_correct']}/"
+                          f"{row['questions_attempted']} correct, "
+                          f"{row['score_earned']:g} points"
+                          + (" (bonus)" if row["bonus_earned"] else "")))
+    lines += [(10, ""), (14, "By category")]
+    for row in data["category_breakdown"]:
+        lines.append((10, f"{row['category_name']}: {row['questions_correct']}/"
+                          f"{row['questions_attempted']} correct "
+                          f"({row['accuracy_percentage']:g}%)"))
+
+    if data.get("sub_theme_breakdown"):
+        lines += [(10, ""), (14, "By sub-theme")]
+    for row in data.get("sub_theme_breakdown", []):
+        lines.append((10, f"{row['category_name']} / {row['sub_theme_name']}: "
+                          f"{row['questions_correct']}/{row['questions_attempted']} correct"))
+
+    if data.get("question_details"):
+        lines += [(10, ""), (14, "Questions")]
+    for number, row in enumerate(data.get("question_details", []), start=1):
+        verdict = "don't know" if row["dont_know"] else (
+            "correct" if row["is_correct"] else "incorrect"
+        )
+        lines += _wrap(10, f"{number}. [{row['difficulty_level']}] {row['question_text']}")
+        lines += _wrap(9, f"   {verdict}, {row['score_earned']:g} points. {row['rationale']}")
+    return lines
+
+def render_report_pdf(report_type: str, data: dict) -> bytes:
+    return build_pdf(report_lines(report_type, data))
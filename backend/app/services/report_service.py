@@ -0,0 +1,560 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, or_, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert, aggregate_order_by
+from fastapi import HTTPException, status
+from starlette.concurrency import run_in_threadpool
+from app.config import get_settings
+from app.database import AsyncSessionLocal
+from app.models import (
+    User, UserRole, AssessmentSession, AssessmentStatus, AssessmentReport,
+    ReportType, ReportStatus, UserResponse, ResponseAnswer, Question, AnswerOption,
+    SubTheme, Category, DifficultyLevelModel, DifficultyLevelProgress,
+    CategoryProgress, SubThemeProgress
+)
+from app.schemas import DetailedAssessmentReport
+from app.services.artifact_store import artifact_store
+from app.services.report_render import TEMPLATE_VERSION, render_report_pdf
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+_FINISHED = (ReportStatus.COMPLETED, ReportStatus.FAILED)
+
+def _accuracy(correct, attempted) -> float:
+    return round(correct / attempted * 100, 2) if attempted else 0.0
+
+class ReportService:
+    """Builds assessment reports off the request path
+
+    assessment_reports doubles as the job queue: a request inserts (or
+    re-arms) a PENDING row and a worker claims it with
+    ``FOR UPDATE SKIP LOCKED``, so any number of workers can share the
+    queue. Report data comes from a handful of set-based queries over the
+    progress aggregates and user_responses, never from per-question ORM
+    loads.
+    """
+
+    @staticmethod
+    async def _get_session(
+        db: AsyncSession,
+        session_id: int,
+        user: User
+    ) -> AssessmentSession:
+        session = await db.get(AssessmentSession, session_id)
+        privileged = user.role in (UserRole.INSTRUCTOR, UserRole.ADMIN)
+        if session is None or (session.user_id != user.id and not privileged):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Assessment session not found"
+            )
+        return session
+
+    @staticmethod
+    async def enqueue(
+        db: AsyncSession,
+        session_id: int,
+        report_type: ReportType,
+        requested_by: Optional[int] = None,
+        regenerate: bool = False
+    ) -> AssessmentReport:
+        """Queue a report unless one is queued or built already
+
+        Failed reports, and any report when ``regenerate`` is set, are put
+        back in the queue.
+        """
+        await db.execute(
+            pg_insert(AssessmentReport)
+            .values(
+                session_id=session_id,
+                report_type=report_type,
+                status=ReportStatus.PENDING,
+                attempts=0,
+                requested_by=requested_by
+            )
+            .on_conflict_do_nothing(constraint="unique_session_report_type")
+        )
+        report = (await db.execute(
+            select(AssessmentReport)
+            .where(
+                AssessmentReport.session_id == session_id,
+                AssessmentReport.report_type == report_type
+            )
+            .execution_options(populate_existing=True)
+        )).scalar_one()
+
+        rearm = report.status == ReportStatus.FAILED or (
+            regenerate and report.status == ReportStatus.COMPLETED
+        )
+        if rearm:
+            report.status = ReportStatus.PENDING
+            report.attempts = 0
+            report.error = None
+            report.requested_by = requested_by
+        await db.commit()
+        await db.refresh(report)
+        return report
+
+    @staticmethod
+    async def request_report(
+        db: AsyncSession,
+        session_id: int,
+        report_type: ReportType,
+        user: User,
+        regenerate: bool = False
+    ) -> AssessmentReport:
+        """Queue a report of a completed session the user may see"""
+        session = await ReportService._get_session(db, session_id, user)
+        if session.status != AssessmentStatus.COMPLETED:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Reports are available once the assessment is completed"
+            )
+        return await ReportService.enqueue(
+            db, session_id, report_type, user.id, regenerate
+        )
+
+    @staticmethod
+    async def get_report(
+        db: AsyncSession,
+        session_id: int,
+        report_type: ReportType,
+        user: User,
+        wait: float = 0.0
+    ) -> AssessmentReport:
+        """Get a report, waiting up to ``wait`` seconds for it to finish
+
+        Long-polling re-reads the row every report_poll_interval_seconds in
+        a fresh transaction; the request holds no lock meanwhile.
+        """
+        await ReportService._get_session(db, session_id, user)
+        deadline = time.monotonic() + min(wait, settings.report_long_poll_max_seconds)
+        while True:
+            report = (await db.execute(
+                select(AssessmentReport)
+                .where(
+                    AssessmentReport.session_id == session_id,
+                    AssessmentReport.report_type == report_type
+                )
+                .execution_options(populate_existing=True)
+            )).scalar_one_or_none()
+            if report is None:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Report not requested"
+                )
+            remaining = deadline - time.monotonic()
+            if report.status in _FINISHED or remaining <= 0:
+                return report
+            # End the snapshot so the next read sees the worker's commit
+            await db.rollback()
+            await asyncio.sleep(min(settings.report_poll_interval_seconds, remaining))
+
+    @staticmethod
+    async def get_completed_report(
+        db: AsyncSession,
+        session_id: int,
+        report_type: ReportType,
+        user: User
+    ) -> AssessmentReport:
+        """A report the user may read; 409 until it is built"""
+        report = await ReportService.get_report(db, session_id, report_type, user)
+        if report.status != ReportStatus.COMPLETED:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Report is not ready"
+            )
+        return report
+
+    @staticmethod
+    def pdf_key(report: AssessmentReport) -> str:
+        """Content key of a report's PDF
+
+        One per (session, type, template version, generation): regenerating
+        the report or bumping TEMPLATE_VERSION yields a new key. Computed
+        from the row alone, so conditional requests skip the store.
+        """
+        return artifact_store.key_for(
+            report.session_id, report.report_type.value, TEMPLATE_VERSION,
+            report.generated_at.isoformat()
+        )
+
+    @staticmethod
+    async def render_pdf(report: AssessmentReport, key: str) -> Path:
+        """Render a report's PDF into the artifact store (no database access)"""
+        pdf = await run_in_threadpool(
+            render_report_pdf, report.report_type.value, report.report_data
+        )
+        return await run_in_threadpool(artifact_store.put, key, pdf)
+
+    @staticmethod
+    async def get_report_pdf(db: AsyncSession, report: AssessmentReport, key: str) -> Path:
+        """Path of a completed report's PDF, rendered on first use"""
+        path = await run_in_threadpool(artifact_store.get, key)
+        if path is None:
+            path = await ReportService.render_pdf(report, key)
+
+        pdf_path = str(path.relative_to(artifact_store.root))
+        if report.pdf_path != pdf_path:
+            report.pdf_path = pdf_path
+            await db.commit()
+        return path
+
+    @staticmethod
+    def _stale_running():
+        """Running rows whose worker went away (crash, OOM kill)"""
+        stale_before = func.now() - timedelta(seconds=settings.report_stale_after_seconds)
+        return and_(
+            AssessmentReport.status == ReportStatus.RUNNING,
+            AssessmentReport.started_at < stale_before
+        )
+
+    @staticmethod
+    def _claimable():
+        return or_(
+            AssessmentReport.status == ReportStatus.PENDING,
+            and_(
+                ReportService._stale_running(),
+                AssessmentReport.attempts < settings.report_max_attempts
+            )
+        )
+
+    @staticmethod
+    async def claim_next(db: AsyncSession) -> Optional[int]:
+        """Mark the oldest claimable report as running; None if the queue is empty"""
+        # A report that kept killing its worker is given up on
+        await db.execute(
+            update(AssessmentReport)
+            .where(
+                ReportService._stale_running(),
+                AssessmentReport.attempts >= settings.report_max_attempts
+            )
+            .values(
+                status=ReportStatus.FAILED,
+                error="Worker stopped while building the report",
+                finished_at=func.now()
+            )
+        )
+        next_report = (
+            select(AssessmentReport.id)
+            .where(ReportService._claimable())
+            .order_by(AssessmentReport.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        report_id = (await db.execute(
+            update(AssessmentReport)
+            .where(AssessmentReport.id == next_report)
+            .values(
+                status=ReportStatus.RUNNING,
+                attempts=AssessmentReport.attempts + 1,
+                started_at=func.now()
+            )
+            .returning(AssessmentReport.id)
+        )).scalar_one_or_none()
+        await db.commit()
+        return report_id
+
+    @staticmethod
+    async def process_next() -> Optional[int]:
+        """Claim and build one report; returns its id, None if there was none"""
+        async with AsyncSessionLocal() as db:
+            report_id = await ReportService.claim_next(db)
+            if report_id is None:
+                return None
+
+            report = await db.get(AssessmentReport, report_id)
+            try:
+                report.report_data = await ReportService.build_report_data(
+                    db, report.session_id, report.report_type
+                )
+                report.status = ReportStatus.COMPLETED
+                report.error = None
+                report.generated_at = report.finished_at = datetime.now()
+                await db.commit()
+            except Exception as exc:
+                logger.exception("Report %s failed", report_id)
+                await db.rollback()
+                report = await db.get(AssessmentReport, report_id, populate_existing=True)
+                retry = report.attempts < settings.report_max_attempts
+                report.status = ReportStatus.PENDING if retry else ReportStatus.FAILED
+                report.error = str(exc)[:2000]
+                report.finished_at = None if retry else datetime.now()
+                await db.commit()
+            return report_id
+
+    @staticmethod
+    async def build_report_data(
+        db: AsyncSession,
+        session_id: int,
+        report_type: ReportType
+    ) -> dict:
+        """Report payload of a session, shaped like DetailedAssessmentReport"""
+        data = {
+            "session": await ReportService._session_summary(db, session_id),
+            "difficulty_breakdown": await ReportService._difficulty_breakdown(db, session_id),
+            "category_breakdown": await ReportService._category_breakdown(db, session_id),
+        }
+        if report_type == ReportType.SUMMARY:
+            return data
+
+        if report_type == ReportType.CERTIFICATE:
+            data["certificate"] = await ReportService._certificate(db, session_id, data["session"])
+            return data
+
+        data["sub_theme_breakdown"] = await ReportService._sub_theme_breakdown(db, session_id)
+        data["question_details"] = await ReportService._question_details(db, session_id)
+        return DetailedAssessmentReport(**data).model_dump(mode="json")
+
+    @staticmethod
+    async def _session_summary(db: AsyncSession, session_id: int) -> dict:
+        answered = (
+            select(func.count(UserResponse.id))
+            .where(UserResponse.session_id == AssessmentSession.id)
+            .scalar_subquery()
+        )
+        row = (await db.execute(
+            select(
+                AssessmentSession.id, AssessmentSession.user_id,
+                AssessmentSession.start_time, AssessmentSession.end_time,
+                AssessmentSession.status, AssessmentSession.total_score,
+                AssessmentSession.total_possible_score,
+                AssessmentSession.completion_percentage,
+                answered.label("questions_answered")
+            )
+            .where(AssessmentSession.id == session_id)
+        )).one()
+        end_time = row.end_time
+        return {
+            "id": row.id,
+            "user_id": row.user_id,
+            "start_time": row.start_time.isoformat(),
+            "end_time": end_time.isoformat() if end_time else None,
+            "status": row.status.value,
+            "total_score": float(row.total_score),
+            "total_possible_score": float(row.total_possible_score),
+            "completion_percentage": float(row.completion_percentage),
+            "duration_seconds": (
+                round((end_time - row.start_time).total_seconds(), 2) if end_time else None
+            ),
+            "questions_answered": row.questions_answered,
+            # The served plan is not persisted; every served question was answered
+            "questions_total": row.questions_answered,
+        }
+
+    @staticmethod
+    async def _difficulty_breakdown(db: AsyncSession, session_id: int) -> List[dict]:
+        rows = (await db.execute(
+            select(
+                DifficultyLevelModel.name, DifficultyLevelModel.points,
+                DifficultyLevelProgress.questions_attempted,
+                DifficultyLevelProgress.questions_correct,
+                DifficultyLevelProgress.single_choice_correct,
+                DifficultyLevelProgress.multiple_choice_correct,
+                DifficultyLevelProgress.bonus_earned,
+                DifficultyLevelProgress.score_earned
+            )
+            .join(
+                DifficultyLevelModel,
+                DifficultyLevelProgress.difficulty_level_id == DifficultyLevelModel.id
+            )
+            .where(DifficultyLevelProgress.session_id == session_id)
+            .order_by(DifficultyLevelModel.level_order)
+        )).all()
+        return [
+            {
+                "difficulty": row.name,
+                "points": float(row.points),
+                "questions_attempted": row.questions_attempted,
+                "questions_correct": row.questions_correct,
+                "single_choice_correct": row.single_choice_correct,
+                "multiple_choice_correct": row.multiple_choice_correct,
+                "bonus_earned": row.bonus_earned,
+                "score_earned": float(row.score_earned),
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    async def _category_breakdown(db: AsyncSession, session_id: int) -> List[dict]:
+        rows = (await db.execute(
+            select(
+                Category.name,
+                CategoryProgress.questions_attempted,
+                CategoryProgress.questions_correct,
+                CategoryProgress.score_earned
+            )
+            .join(Category, CategoryProgress.category_id == Category.id)
+            .where(CategoryProgress.session_id == session_id)
+            .order_by(Category.display_order, Category.id)
+        )).all()
+        return [
+            {
+                "category_name": row.name,
+                "questions_attempted": row.questions_attempted,
+                "questions_correct": row.questions_correct,
+                "score_earned": float(row.score_earned),
+                "accuracy_percentage": _accuracy(row.questions_correct, row.questions_attempted),
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    async def _sub_theme_breakdown(db: AsyncSession, session_id: int) -> List[dict]:
+        rows = (await db.execute(
+            select(
+                SubTheme.id, SubTheme.name, Category.name.label("category_name"),
+                SubThemeProgress.questions_attempted,
+                SubThemeProgress.questions_correct,
+                SubThemeProgress.score_earned
+            )
+            .join(SubTheme, SubThemeProgress.sub_theme_id == SubTheme.id)
+            .join(Category, SubTheme.category_id == Category.id)
+            .where(SubThemeProgress.session_id == session_id)
+            .order_by(Category.display_order, SubTheme.display_order, SubTheme.id)
+        )).all()
+        return [
+            {
+                "sub_theme_id": row.id,
+                "sub_theme_name": row.name,
+                "category_name": row.category_name,
+                "questions_attempted": row.questions_attempted,
+                "questions_correct": row.questions_correct,
+                "score_earned": float(row.score_earned),
+                "accuracy_percentage": _accuracy(row.questions_correct, row.questions_attempted),
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    async def _question_details(db: AsyncSession, session_id: int) -> List[dict]:
+        """Every answer of the session with its key, in one query"""
+        selected = (
+            select(func.array_agg(ResponseAnswer.answer_option_id))
+            .where(ResponseAnswer.user_response_id == UserResponse.id)
+            .scalar_subquery()
+        )
+        correct = (
+            select(func.array_agg(aggregate_order_by(AnswerOption.id, AnswerOption.display_order)))
+            .where(AnswerOption.question_id == UserResponse.question_id, AnswerOption.is_correct)
+            .scalar_subquery()
+        )
+        rows = (await db.execute(
+            select(
+                UserResponse.question_id, Question.question_text, Question.rationale,
+                Question.difficulty_level, Question.question_type,
+                SubTheme.name.label("sub_theme"), Category.name.label("category"),
+                UserResponse.dont_know, UserResponse.score_earned,
+                UserResponse.time_spent_seconds, UserResponse.response_time,
+                selected.label("selected_option_ids"),
+                correct.label("correct_option_ids")
+            )
+            .join(Question, UserResponse.question_id == Question.id)
+            .join(SubTheme, Question.sub_theme_id == SubTheme.id)
+            .join(Category, SubTheme.category_id == Category.id)
+            .where(UserResponse.session_id == session_id)
+            .order_by(UserResponse.response_time, UserResponse.id)
+        )).all()
+        return [
+            {
+                "question_id": row.question_id,
+                "question_text": row.question_text,
+                "rationale": row.rationale,
+                "difficulty_level": row.difficulty_level.value,
+                "question_type": row.question_type.value,
+                "category": row.category,
+                "sub_theme": row.sub_theme,
+                "dont_know": row.dont_know,
+                "selected_option_ids": sorted(row.selected_option_ids or []),
+                "correct_option_ids": row.correct_option_ids or [],
+                "is_correct": row.score_earned > 0,
+                "score_earned": float(row.score_earned),
+                "time_spent_seconds": row.time_spent_seconds,
+                "answered_at": row.response_time.isoformat(),
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    async def _certificate(db: AsyncSession, session_id: int, session: dict) -> dict:
+        holder = (await db.execute(
+            select(User.username, User.first_name, User.last_name)
+            .join(AssessmentSession, AssessmentSession.user_id == User.id)
+            .where(AssessmentSession.id == session_id)
+        )).one()
+        full_name = " ".join(part for part in (holder.first_name, holder.last_name) if part)
+        possible = session["total_possible_score"]
+        return {
+            "holder": full_name or holder.username,
+            "issued_at": datetime.now().isoformat(),
+            "total_score": session["total_score"],
+            "total_possible_score": possible,
+            "percentage": round(session["total_score"] / possible * 100, 2) if possible else 0.0,
+        }
+
+class ReportWorker:
+    """Runs ``concurrency`` loops that drain the report queue
+
+    Used by scripts/report_worker.py, or inside the API process when
+    report_worker_embedded is set. An idle loop polls every
+    ``poll_interval`` seconds.
+    """
+
+    def __init__(self, concurrency: int, poll_interval: float):
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+        self.processed = 0
+        self.errors = 0
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                report_id = await ReportService.process_next()
+            except Exception:
+                self.errors += 1
+                logger.exception("Report worker iteration failed")
+                report_id = None
+            if report_id is None:
+                await asyncio.sleep(self.poll_interval)
+            else:
+                self.processed += 1
+
+    async def drain(self) -> int:
+        """Build every queued report, then return how many were processed"""
+        processed = 0
+        while await ReportService.process_next() is not None:
+            processed += 1
+        self.processed += processed
+        return processed
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [
+                asyncio.create_task(self._loop()) for _ in range(self.concurrency)
+            ]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def stats(self) -> dict:
+        return {
+            "running": bool(self._tasks),
+            "concurrency": self.concurrency,
+            "processed": self.processed,
+            "errors": self.errors,
+        }
+
+report_worker = ReportWorker(
+    concurrency=settings.report_worker_concurrency,
+    poll_interval=settings.report_poll_interval_seconds,
+)
@@ -0,0 +1,229 @@
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Deque, List, Optional
+from sqlalchemy import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.config import get_settings
+from app.database import AsyncSessionLocal, is_data_error
+from app.models import UserResponse, ResponseAnswer, SessionQuestion
+from app.services.progress_service import ProgressAggregator
+from app.services.assessment_state import state_store
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BufferedResponse:
+    """A scored answer waiting to be written to user_responses"""
+    session_id: int
+    question_id: int
+    selected_option_ids: List[int]
+    dont_know: bool
+    time_spent_seconds: int
+    score_earned: float
+    is_correct: bool
+    difficulty_level: str
+    question_type: str
+    sub_theme_id: int
+    category_id: int
+    completion_percentage: float
+    response_time: datetime = field(default_factory=datetime.now)
+
+class ResponseBuffer:
+    """Collects answers in memory and writes them in multi-row batches
+
+    A batch is flushed when it reaches ``batch_size`` or every
+    ``flush_interval`` seconds, whichever comes first, so exam-day answer
+    bursts cost one INSERT per table per batch instead of one transaction
+    per answer. Progress rows and session totals are updated in the same
+    transaction by ProgressAggregator.
+
+    A batch rejected for its data (integrity or data error, e.g. a question
+    deleted mid-session) is split in halves until the offending rows are
+    isolated; those are quarantined (logged, kept in ``quarantine`` and
+    counted per session) and the rest is written. Any other error (database
+    unreachable) puts the unwritten rows back for the next flush.
+
+    Each (session, question) pair is claimed in session_questions in the
+    same transaction, so an answer that is already stored (e.g. a retried
+    submit) is skipped instead of written twice.
+    """
+
+    def __init__(self, batch_size: int, flush_interval: float, max_pending: int):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending: List[BufferedResponse] = []
+        self.quarantine: Deque[BufferedResponse] = deque(maxlen=1000)
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.flushed = 0
+        self.batches = 0
+        self.failures = 0
+        self.quarantined = 0
+        self.duplicates = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def add(self, response: BufferedResponse) -> None:
+        self._pending.append(response)
+        if len(self._pending) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write every pending response; returns the number written"""
+        async with self._flush_lock:
+            if not self._pending:
+                return 0
+            batch, self._pending = self._pending, []
+            chunks = [batch]
+            written = 0
+            while chunks:
+                chunk = chunks.pop()
+                try:
+                    stored = await self._write(chunk)
+                except Exception as exc:
+                    if is_data_error(exc):
+                        if len(chunk) > 1:
+                            middle = len(chunk) // 2
+                            # Oldest half first
+                            chunks += [chunk[middle:], chunk[:middle]]
+                        else:
+                            await self._quarantine(chunk[0])
+                        continue
+                    self.failures += 1
+                    unwritten = chunk + [item for rest in reversed(chunks) for item in rest]
+                    logger.exception("Failed to flush %d buffered responses", len(unwritten))
+                    # Put the rows back (oldest first) unless the buffer is full
+                    room = max(self.max_pending - len(self._pending), 0)
+                    if room < len(unwritten):
+                        logger.error("Dropping %d responses, buffer full", len(unwritten) - room)
+                        await self._record_dropped(unwritten[room:])
+                    self._pending = unwritten[:room] + self._pending
+                    break
+                written += stored
+                self.batches += 1
+            self.flushed += written
+            return written
+
+    async def _quarantine(self, item: BufferedResponse) -> None:
+        """Set aside a row the database keeps rejecting"""
+        self.quarantined += 1
+        self.quarantine.append(item)
+        logger.error("Quarantined buffered response %s", asdict(item))
+        await self._record_dropped([item])
+
+    @staticmethod
+    async def _record_dropped(items: List[BufferedResponse]) -> None:
+        """Let complete_assessment stop waiting for answers that will never land"""
+        try:
+            for item in items:
+                await state_store.record_dropped(item.session_id)
+        except Exception:
+            logger.exception("Failed to record %d dropped responses", len(items))
+
+    async def _write(self, batch: List[BufferedResponse]) -> int:
+        """Write one batch in one transaction; returns the responses stored"""
+        async with AsyncSessionLocal() as db:
+            claimed = await db.execute(
+                pg_insert(SessionQuestion)
+                .values([
+                    {"session_id": item.session_id, "question_id": item.question_id}
+                    for item in batch
+                ])
+                .on_conflict_do_nothing()
+                .returning(SessionQuestion.session_id, SessionQuestion.question_id)
+            )
+            new_pairs = {(row.session_id, row.question_id) for row in claimed}
+            fresh = []
+            for item in batch:
+                pair = (item.session_id, item.question_id)
+                if pair in new_pairs:
+                    new_pairs.discard(pair)
+                    fresh.append(item)
+            if len(fresh) < len(batch):
+                logger.warning(
+                    "Skipped %d already stored responses", len(batch) - len(fresh)
+                )
+                self.duplicates += len(batch) - len(fresh)
+            batch = fresh
+            if not batch:
+                await db.commit()
+                return 0
+
+            result = await db.execute(
+                insert(UserResponse).returning(
+                    UserResponse.id, UserResponse.session_id, UserResponse.question_id
+                ),
+                [
+                    {
+                        "session_id": item.session_id,
+                        "question_id": item.question_id,
+                        "response_time": item.response_time,
+                        "time_spent_seconds": item.time_spent_seconds,
+                        "dont_know": item.dont_know,
+                        "score_earned": item.score_earned,
+                    }
+                    for item in batch
+                ]
+            )
+            response_ids = {
+                (row.session_id, row.question_id): row.id for row in result
+            }
+
+            answer_rows = [
+                {
+                    "user_response_id": response_ids[(item.session_id, item.question_id)],
+                    "answer_option_id": option_id,
+                }
+                for item in batch
+                for option_id in item.selected_option_ids
+            ]
+            if answer_rows:
+                await db.execute(insert(ResponseAnswer), answer_rows)
+
+            # Same transaction: progress deltas are applied exactly once
+            await ProgressAggregator.apply(db, batch)
+
+            await db.commit()
+            return len(batch)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "flushed": self.flushed,
+            "batches": self.batches,
+            "failures": self.failures,
+            "quarantined": self.quarantined,
+            "duplicates": self.duplicates,
+        }
+
+response_buffer = ResponseBuffer(
+    batch_size=settings.response_flush_batch_size,
+    flush_interval=settings.response_flush_interval_seconds,
+    max_pending=settings.response_buffer_max_pending,
+)
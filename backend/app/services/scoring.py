@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from app.models import Question, AnswerOption
+
+# A difficulty level earns its bonus when all of these are answered correctly
+BONUS_SINGLE_CHOICE = 2
+BONUS_MULTIPLE_CHOICE = 2
+
+def is_bonus_eligible(single_correct: int, multiple_correct: int, correct: int) -> bool:
+    """Same rule as DifficultyLevelProgress.is_bonus_eligible"""
+    return (single_correct == BONUS_SINGLE_CHOICE and
+            multiple_correct == BONUS_MULTIPLE_CHOICE and
+            correct == BONUS_SINGLE_CHOICE + BONUS_MULTIPLE_CHOICE)
+
+@dataclass(frozen=True)
+class AnswerKey:
+    """Compact answer key: option i (by display order) is bit i"""
+    question_id: int
+    difficulty_level: str
+    question_type: str
+    points: float
+    option_ids: Tuple[int, ...]
+    correct_mask: int
+
+    def mask(self, selected_option_ids: Iterable[int]) -> int:
+        """Bitmask of a selection; raises ValueError for foreign option ids"""
+        mask = 0
+        for option_id in selected_option_ids:
+            mask |= 1 << self.option_ids.index(option_id)
+        return mask
+
+    def score_mask(self, selected_mask: int) -> float:
+        """All-or-nothing: the selection must match the correct options exactly"""
+        return self.points if selected_mask == self.correct_mask else 0.0
+
+    def score(self, selected_option_ids: Iterable[int]) -> float:
+        return self.score_mask(self.mask(selected_option_ids))
+
+class ScoringEngine:
+    """Scores answers by comparing bitmasks against precomputed answer keys
+
+    Keys are built from a single Core query (no ORM relationship loads),
+    so scoring a submission or a whole batch is pure integer comparison.
+    """
+
+    @staticmethod
+    async def load_keys(
+        db: AsyncSession,
+        question_ids: Sequence[int]
+    ) -> Dict[int, AnswerKey]:
+        """Build answer keys for the given questions in one query"""
+        if not question_ids:
+            return {}
+
+        result = await db.execute(
+            select(
+                Question.id,
+                Question.difficulty_level,
+                Question.question_type,
+                AnswerOption.id,
+                AnswerOption.is_correct
+            )
+            .join(AnswerOption, AnswerOption.question_id == Question.id)
+            .where(Question.id.in_(question_ids))
+            .order_by(Question.id, AnswerOption.display_order, AnswerOption.id)
+        )
+
+        collected: Dict[int, list] = {}
+        for question_id, level, question_type, option_id, is_correct in result.all():
+            entry = collected.setdefault(question_id, [level, question_type, [], 0])
+            if is_correct:
+                entry[3] |= 1 << len(entry[2])
+            entry[2].append(option_id)
+
+        return {
+            question_id: AnswerKey(
+                question_id=question_id,
+                difficulty_level=level.value,
+                question_type=question_type.value,
+                points=level.points,
+                option_ids=tuple(option_ids),
+                correct_mask=correct_mask
+            )
+            for question_id, (level, question_type, option_ids, correct_mask)
+            in collected.items()
+        }
+
+    @staticmethod
+    def score_batch(
+        keys: Dict[int, AnswerKey],
+        submissions: Iterable[Tuple[int, int]]
+    ) -> List[float]:
+        """Score (question_id, selected_mask) pairs"""
+        return [
+            keys[question_id].score_mask(selected_mask)
+            for question_id, selected_mask in submissions
+        ]
+
+    @staticmethod
+    def rescore(
+        keys: Dict[int, AnswerKey],
+        question_ids: Sequence[int],
+        selected_option_ids: Sequence[Sequence[int]],
+        dont_know: Optional[Sequence[bool]] = None
+    ) -> np.ndarray:
+        """Vectorized re-scoring of many stored responses at once
+
+        Selections are turned into masks once, then every response is
+        scored with a single NumPy comparison. Selections that reference
+        options no longer on the question score 0.
+        """
+        count = len(question_ids)
+        selected = np.zeros(count, dtype=np.int64)
+        correct = np.empty(count, dtype=np.int64)
+        points = np.empty(count, dtype=np.float64)
+        valid = np.ones(count, dtype=bool)
+
+        for i, (question_id, options) in enumerate(zip(question_ids, selected_option_ids)):
+            key = keys[question_id]
+            correct[i] = key.correct_mask
+            points[i] = key.points
+            try:
+                selected[i] = key.mask(options or ())
+            except ValueError:
+                valid[i] = False
+
+        if dont_know is not None:
+            valid &= ~np.asarray(dont_know, dtype=bool)
+
+        return np.where(valid & (selected == correct), points, 0.0)
@@ -4,7 +4,11 @@ from sqlalchemy import select, func, and_
 from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 from app.models import SubTheme, Category
-from app.schemas import SubThemeCreate, SubThemeUpdate
+from app.schemas import (
+    SubThemeCreate, SubThemeUpdate, SubThemeResponse, SubThemeWithCategory
+)
+from app.cache import get_cache, invalidate
+from app.core.audit import record_audit, audit_diff, audit_snapshot
 
 class SubThemeService:
     @staticmethod
@@ -42,6 +46,7 @@ class SubThemeService:
         db.add(sub_theme)
         await db.commit()
         await db.refresh(sub_theme)
+        await invalidate("sub_themes", "categories", "catalog")
         return sub_theme
     
     @staticmethod
@@ -66,6 +71,31 @@ class SubThemeService:
         result = await db.execute(query)
         return result.scalars().all()
     
+    @staticmethod
+    async def get_cached_sub_themes(
+        db: AsyncSession,
+        category_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100,
+        include_category: bool = False
+    ) -> List[dict]:
+        """Get sub-themes as serialized dicts, through the shared cache"""
+        schema = SubThemeWithCategory if include_category else SubThemeResponse
+        
+        async def load():
+            sub_themes = await SubThemeService.get_sub_themes(
+                db, category_id, skip, limit, include_category
+            )
+            return [
+                schema.model_validate(sub_theme).model_dump(mode="json")
+                for sub_theme in sub_themes
+            ]
+        
+        return await get_cache("sub_themes").get_or_set(
+            get_cache("sub_themes").key("list", category_id, skip, limit, include_category),
+            load
+        )
+    
     @staticmethod
     async def get_sub_theme(
         db: AsyncSession,
@@ -89,6 +119,22 @@ class SubThemeService:
         
         return sub_theme
     
+    @staticmethod
+    async def get_cached_sub_theme(
+        db: AsyncSession,
+        sub_theme_id: int
+    ) -> dict:
+        """Get a single sub-theme with category info, through the shared cache"""
+        async def load():
+            sub_theme = await SubThemeService.get_sub_theme(
+                db, sub_theme_id, include_category=True
+            )
+            return SubThemeWithCategory.model_validate(sub_theme).model_dump(mode="json")
+        
+        return await get_cache("sub_themes").get_or_set(
+            get_cache("sub_themes").key("detail", sub_theme_id), load
+        )
+    
     @staticmethod
     async def update_sub_theme(
         db: AsyncSession,
@@ -101,9 +147,13 @@ class SubThemeService:
         update_data = sub_theme_data.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(sub_theme, field, value)
+        old_values, new_values = audit_diff(sub_theme)
         
         await db.commit()
         await db.refresh(sub_theme)
+        await invalidate("sub_themes", "categories", "question_payloads", "catalog")
+        if new_values:
+            record_audit("sub_theme.update", "sub_theme", sub_theme_id, old_values, new_values)
         return sub_theme
     
     @staticmethod
@@ -114,7 +164,11 @@ class SubThemeService:
         """Delete a sub-theme (cascades to questions)"""
         sub_theme = await SubThemeService.get_sub_theme(db, sub_theme_id)
         
+        old_values = audit_snapshot(sub_theme)
+        
         await db.delete(sub_theme)
         await db.commit()
+        await invalidate("sub_themes", "categories", "questions", "question_payloads", "catalog")
+        record_audit("sub_theme.delete", "sub_theme", sub_theme_id, old_values=old_values)
         
         return {"message": f"Sub-theme '{sub_theme.name}' deleted successfully"}
@@ -0,0 +1,208 @@
+"""End-to-end load scenario against the real API surface
+
+Each virtual user registers, logs in, then for every iteration lists the
+categories and the catalog, pages through the question bank and runs a
+full assessment (start, answer every question, complete). Latencies are
+recorded per step and reported as p50/p95/p99 with requests per second
+over the wall time of the run.
+
+By default the app runs in-process (httpx ASGI transport, same lifespan as
+uvicorn) against DATABASE_URL; ``--url`` targets a running server
+instead, which is the way to measure several workers. Point it at a
+throwaway, seeded PostgreSQL database: users and sessions are left behind.
+SQLite cannot stand in, the schema relies on PostgreSQL partitioning,
+upserts and array aggregates.
+
+The defaults match the stored baseline (10 users x 2 iterations,
+in-process); ``--baseline`` refuses to compare a run with another workload.
+
+    python benchmarks/load.py --baseline
+    python benchmarks/load.py --url http://localhost:8000 --users 50 --output run.json
+"""
+import asyncio
+import argparse
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Optional
+
+import httpx
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from benchmarks.stats import (
+    Measurement, print_results, build_report, write_report, gate, baseline_path
+)
+
+PASSWORD = "benchmark-password"
+
+class Recorder:
+    """Per-step latency samples shared by all virtual users"""
+
+    def __init__(self):
+        self.steps: Dict[str, Measurement] = {}
+
+    async def call(self, name: str, request) -> Optional[httpx.Response]:
+        measurement = self.steps.setdefault(name, Measurement(name))
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            measurement.errors += 1
+            return None
+        measurement.samples_ms.append((time.perf_counter() - started) * 1000)
+        if response.status_code >= 400:
+            measurement.errors += 1
+            return None
+        return response
+
+    def summary(self, elapsed_s: float) -> Dict[str, dict]:
+        total = Measurement("all", elapsed_s=elapsed_s)
+        for measurement in self.steps.values():
+            measurement.elapsed_s = elapsed_s
+            total.samples_ms.extend(measurement.samples_ms)
+            total.errors += measurement.errors
+        results = {name: m.summary() for name, m in sorted(self.steps.items())}
+        results["all"] = total.summary()
+        return results
+
+async def run_assessment(client: httpx.AsyncClient, recorder: Recorder, headers: dict) -> None:
+    response = await recorder.call(
+        "assessment_start", client.post("/api/assessments/", json={}, headers=headers)
+    )
+    if response is None:
+        return
+    progress = response.json()
+    session_id = progress["session_id"]
+
+    while progress["current_question"]:
+        question = progress["current_question"]
+        options = [option["id"] for option in question["options"]]
+        selected = options[:1] if question["question_type"] == "single_choice" else options[:2]
+        response = await recorder.call("assessment_answer", client.post(
+            f"/api/assessments/{session_id}/answers",
+            json={"question_id": question["id"], "selected_option_ids": selected,
+                  "time_spent_seconds": 5},
+            headers=headers
+        ))
+        if response is None:
+            return
+        progress = response.json()
+
+    await recorder.call(
+        "assessment_complete",
+        client.post(f"/api/assessments/{session_id}/complete", headers=headers)
+    )
+
+async def virtual_user(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    username: str,
+    args
+) -> None:
+    await recorder.call("register", client.post("/api/auth/register", json={
+        "username": username, "email": f"{username}@bench.example.com", "password": PASSWORD
+    }))
+    response = await recorder.call("login", client.post(
+        "/api/auth/login", data={"username": username, "password": PASSWORD}
+    ))
+    if response is None:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    for _ in range(args.iterations):
+        await recorder.call("categories", client.get("/api/categories/", headers=headers))
+        await recorder.call("catalog", client.get("/api/catalog/"))
+
+        cursor = None
+        for _ in range(args.pages):
+            params = {"limit": args.page_size}
+            if cursor:
+                params["cursor"] = cursor
+            response = await recorder.call(
+                "questions_page", client.get("/api/questions/page", params=params, headers=headers)
+            )
+            cursor = response.json()["next_cursor"] if response is not None else None
+            if not cursor:
+                break
+
+        await run_assessment(client, recorder, headers)
+
+@asynccontextmanager
+async def api_client(url: Optional[str]):
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+            yield client
+        return
+
+    from app.main import app, lifespan
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            yield client
+
+async def run_load(args) -> int:
+    recorder = Recorder()
+    run_id = uuid.uuid4().hex[:8]
+    target = args.url or "in-process app"
+    print(f"📊 {args.users} users x {args.iterations} iterations against {target}")
+
+    async with api_client(args.url) as client:
+        started = time.perf_counter()
+        users = []
+        for index in range(args.users):
+            users.append(asyncio.create_task(
+                virtual_user(client, recorder, f"bench_{run_id}_{index}", args)
+            ))
+            if args.ramp_up:
+                await asyncio.sleep(args.ramp_up / args.users)
+        await asyncio.gather(*users)
+        elapsed = time.perf_counter() - started
+
+    results = recorder.summary(elapsed)
+    print_results(results)
+    print(f"   {elapsed:.1f}s wall time")
+    if results.get("assessment_start", {}).get("count", 0) == 0:
+        print("⚠️  No assessment could start, seed difficulty levels and questions first")
+
+    report = build_report(
+        "load", results, users=args.users, iterations=args.iterations,
+        target="url" if args.url else "in-process"
+    )
+    if args.output:
+        write_report(Path(args.output), report)
+    if args.save_baseline:
+        write_report(baseline_path("load", args.baseline_file), report)
+        return 0
+    if args.baseline:
+        return gate(
+            baseline_path("load", args.baseline_file), report, args.tolerance, args.metric,
+            workload=("users", "iterations", "target")
+        )
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="End-to-end API load scenario")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process app)")
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--iterations", type=int, default=2,
+                        help="Browse + assessment rounds per user")
+    parser.add_argument("--pages", type=int, default=3, help="Question pages per round")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--ramp-up", type=float, default=0.0,
+                        help="Seconds over which users are started")
+    parser.add_argument("--output", help="Write the results JSON here")
+    parser.add_argument("--baseline", action="store_true",
+                        help="Compare with the stored baseline, exit 1 on regression "
+                             "(2 if the workload differs)")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the new baseline")
+    parser.add_argument("--baseline-file",
+                        help="Baseline to use (defaults to benchmarks/baselines/load.json)")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown before the gate fails (0.25 = 25%%)")
+    parser.add_argument("--metric", default="p95_ms",
+                        choices=["p50_ms", "p95_ms", "p99_ms", "mean_ms"])
+    sys.exit(asyncio.run(run_load(parser.parse_args())))
@@ -0,0 +1,125 @@
+"""Microbenchmarks of the request hot paths, no database needed
+
+Times token handling, answer validation/scoring and question list
+serialization call by call, then reports p50/p95/p99 and calls per second.
+``--baseline`` fails (exit 1) when a benchmark got slower than the stored
+baseline by more than ``--tolerance``.
+
+    python benchmarks/micro.py
+    python benchmarks/micro.py --baseline --tolerance 0.3
+    python benchmarks/micro.py --save-baseline
+"""
+import argparse
+import gc
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.security import create_tokens, verify_token
+from app.models import QuestionType
+from app.services.question_service import QuestionService
+from app.services.scoring import AnswerKey
+from benchmarks.serialization import make_questions, as_rows, orm_path, rows_path
+from benchmarks.stats import (
+    Measurement, print_results, build_report, write_report, gate, baseline_path
+)
+
+def measure(name: str, func: Callable[[], object], iterations: int, inner: int = 1) -> Measurement:
+    """Time ``iterations`` samples of ``inner`` calls each (per-call ms)"""
+    for _ in range(max(iterations // 10, 1)):
+        func()
+    measurement = Measurement(name)
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            started = time.perf_counter()
+            for _ in range(inner):
+                func()
+            measurement.samples_ms.append((time.perf_counter() - started) * 1000 / inner)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return measurement
+
+def benchmarks(iterations: int) -> Dict[str, tuple]:
+    """name -> (callable, samples, calls per sample)"""
+    tokens = create_tokens(42, "benchmark-user")
+    access_token = tokens["access_token"]
+
+    questions = make_questions(100)
+    question_rows, option_rows = as_rows(questions)
+    multiple = make_questions(1)[0]
+    multiple.question_type = QuestionType.MULTIPLE_CHOICE
+    for option in multiple.answer_options[:2]:
+        option.is_correct = True
+
+    # validate_question_answers is a coroutine without awaits: drive it
+    # directly so the numbers are not dominated by event loop overhead
+    def validate(question):
+        coroutine = QuestionService.validate_question_answers(question)
+        try:
+            coroutine.send(None)
+        except StopIteration as done:
+            return done.value
+
+    key = AnswerKey(
+        question_id=1, difficulty_level="novice", question_type="multiple_choice",
+        points=0.5, option_ids=(11, 12, 13, 14), correct_mask=0b0011
+    )
+
+    slow = max(iterations // 10, 20)
+    return {
+        "create_tokens": (lambda: create_tokens(42, "benchmark-user"), iterations, 1),
+        "verify_token": (lambda: verify_token(access_token), iterations, 5),
+        "validate_single_choice": (lambda: validate(questions[0]), iterations, 200),
+        "validate_multiple_choice": (lambda: validate(multiple), iterations, 200),
+        "score_answer": (lambda: key.score([11, 12]), iterations, 500),
+        "serialize_100_rows": (lambda: rows_path(question_rows, option_rows), slow, 1),
+        "serialize_100_orm": (lambda: orm_path(questions), slow, 1),
+    }
+
+def main(args) -> int:
+    print(f"📊 Running microbenchmarks, {args.iterations} samples each")
+    selected = {
+        name: measure(name, func, samples, inner).summary()
+        for name, (func, samples, inner) in benchmarks(args.iterations).items()
+        if not args.only or name in args.only
+    }
+    print_results(selected)
+    report = build_report("micro", selected, iterations=args.iterations)
+
+    if args.output:
+        write_report(Path(args.output), report)
+    if args.save_baseline:
+        write_report(baseline_path("micro", args.baseline_file), report)
+        return 0
+    if args.baseline:
+        return gate(
+            baseline_path("micro", args.baseline_file), report, args.tolerance, args.metric,
+            check_throughput=False
+        )
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hot path microbenchmarks")
+    parser.add_argument("--iterations", type=int, default=2000,
+                        help="Samples per benchmark")
+    parser.add_argument("--only", action="append",
+                        help="Run only this benchmark (repeatable)")
+    parser.add_argument("--output", help="Write the results JSON here")
+    parser.add_argument("--baseline", action="store_true",
+                        help="Compare with the stored baseline, exit 1 on regression")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Store these results as the new baseline")
+    parser.add_argument("--baseline-file",
+                        help="Baseline to use (defaults to benchmarks/baselines/micro.json)")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown before the gate fails (0.25 = 25%%)")
+    parser.add_argument("--metric", default="p50_ms",
+                        choices=["p50_ms", "p95_ms", "p99_ms", "mean_ms"],
+                        help="Latency the gate compares (median is the least noisy here)")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,171 @@
+"""Compare the ORM + Pydantic + json list path with Core rows + orjson
+
+Synthetic mode (default) needs no database: it builds N questions with
+4 options each and times only validation and encoding. ``--db`` runs both
+QuestionService read paths against DATABASE_URL end to end.
+
+    python benchmarks/serialization.py --items 1000 --repeat 20
+    python benchmarks/serialization.py --db --items 1000
+"""
+import asyncio
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+from app.models import Question, AnswerOption, DifficultyLevel, QuestionType
+from app.schemas import QuestionResponse
+from app.core.responses import ORJSONResponse
+
+questions_adapter = TypeAdapter(List[QuestionResponse])
+
+def make_questions(count: int) -> List[Question]:
+    now = datetime.now()
+    levels = list(DifficultyLevel)
+    questions = []
+    for i in range(count):
+        question = Question(
+            id=i + 1,
+            sub_theme_id=1,
+            difficulty_level=levels[i % len(levels)],
+            question_type=QuestionType.SINGLE_CHOICE,
+            question_text=f"Benchmark question number {i} about network security?",
+            rationale="Because the benchmark says so, at some length.",
+            is_active=True,
+            created_at=now,
+            updated_at=now
+        )
+        question.answer_options = [
+            AnswerOption(
+                id=i * 4 + j + 1, question_id=i + 1, option_text=f"Option {j}",
+                is_correct=j == 0, display_order=j
+            )
+            for j in range(4)
+        ]
+        questions.append(question)
+    return questions
+
+def as_rows(questions: List[Question]):
+    """The tuples a Core select would return for the same data"""
+    question_rows = [
+        (q.id, q.sub_theme_id, q.difficulty_level, q.question_type, q.question_text,
+         q.rationale, q.is_active, q.created_at, q.updated_at)
+        for q in questions
+    ]
+    option_rows = [
+        (o.question_id, o.id, o.option_text, o.is_correct, o.display_order)
+        for q in questions for o in q.answer_options
+    ]
+    return question_rows, option_rows
+
+def orm_path(questions) -> bytes:
+    """What a response_model=List[QuestionResponse] route used to do"""
+    validated = questions_adapter.validate_python(questions, from_attributes=True)
+    return JSONResponse(jsonable_encoder(validated)).body
+
+def orm_dump_json_path(questions) -> bytes:
+    """Validation plus Pydantic's own JSON encoder (newer FastAPI releases)"""
+    validated = questions_adapter.validate_python(questions, from_attributes=True)
+    return questions_adapter.dump_json(validated)
+
+def rows_path(question_rows, option_rows) -> bytes:
+    """QuestionService._rows_to_dicts followed by ORJSONResponse"""
+    questions = {}
+    for (question_id, sub_theme_id, level, question_type, question_text,
+         rationale, is_active, created_at, updated_at) in question_rows:
+        questions[question_id] = {
+            "id": question_id,
+            "sub_theme_id": sub_theme_id,
+            "difficulty_level": level.value,
+            "question_type": question_type.value,
+            "question_text": question_text,
+            "rationale": rationale,
+            "is_active": is_active,
+            "points": level.points,
+            "created_at": created_at.isoformat(),
+            "updated_at": updated_at.isoformat(),
+            "answer_options": [],
+        }
+    for question_id, option_id, option_text, is_correct, display_order in option_rows:
+        questions[question_id]["answer_options"].append({
+            "id": option_id,
+            "option_text": option_text,
+            "is_correct": is_correct,
+            "display_order": display_order,
+        })
+    return ORJSONResponse(list(questions.values())).body
+
+def timed(func, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+def report(name: str, samples: List[float]) -> float:
+    median = statistics.median(samples)
+    print(f"   {name:<28} median {median:8.2f} ms   min {min(samples):8.2f} ms")
+    return median
+
+def run_synthetic(items: int, repeat: int) -> None:
+    questions = make_questions(items)
+    question_rows, option_rows = as_rows(questions)
+
+    import orjson
+    assert orjson.loads(orm_path(questions)) == orjson.loads(rows_path(question_rows, option_rows))
+
+    print(f"📊 Serializing {items} questions, {repeat} runs")
+    before = report("ORM + Pydantic + json", timed(lambda: orm_path(questions), repeat))
+    report("ORM + Pydantic dump_json", timed(lambda: orm_dump_json_path(questions), repeat))
+    after = report("Core rows + orjson", timed(lambda: rows_path(question_rows, option_rows), repeat))
+    print(f"✅ {before / after:.1f}x faster")
+
+async def run_db(items: int, repeat: int) -> None:
+    from app.database import AsyncSessionLocal, engine
+    from app.services.question_service import QuestionService
+
+    async def orm_request():
+        async with AsyncSessionLocal() as db:
+            questions = await QuestionService.get_questions(db, is_active=None, limit=items)
+            return orm_path(questions)
+
+    async def rows_request():
+        async with AsyncSessionLocal() as db:
+            rows = await QuestionService.get_question_rows(db, is_active=None, limit=items)
+            return ORJSONResponse(rows).body
+
+    async def timed_async(func):
+        samples = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            await func()
+            samples.append((time.perf_counter() - started) * 1000)
+        return samples
+
+    await rows_request()  # warm up the pool
+    print(f"📊 Loading and serializing up to {items} questions from the database, {repeat} runs")
+    before = report("ORM + Pydantic + json", await timed_async(orm_request))
+    after = report("Core rows + orjson", await timed_async(rows_request))
+    print(f"✅ {before / after:.1f}x faster")
+    await engine.dispose()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Question list serialization benchmark")
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--db", action="store_true",
+                        help="Run both service read paths against DATABASE_URL")
+    args = parser.parse_args()
+    if args.db:
+        asyncio.run(run_db(args.items, args.repeat))
+    else:
+        run_synthetic(args.items, args.repeat)
@@ -0,0 +1,161 @@
+"""Latency percentiles, result files and the baseline regression gate
+
+Both benchmark layers (micro.py, load.py) write the same JSON shape::
+
+    {"kind": "micro", "created_at": ..., "python": ..., "results": {
+        "<name>": {"count", "errors", "mean_ms", "p50_ms", "p95_ms",
+                   "p99_ms", "throughput_per_s"}}}
+
+and ``gate`` compares such a file against a stored baseline, so CI can
+fail a change that slows a hot path down. Reports also carry the workload
+they were measured under (users, iterations, ...); ``gate`` refuses to
+compare runs whose workload differs from the baseline's.
+"""
+import json
+import math
+import platform
+import statistics
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+# Latency differences below this are timer noise, whatever the ratio
+NOISE_FLOOR_MS = 0.001
+
+def percentile(sorted_samples: List[float], q: float) -> float:
+    """q-th percentile (0-100) of sorted samples, linear interpolation"""
+    if not sorted_samples:
+        return 0.0
+    rank = (len(sorted_samples) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return sorted_samples[low] + (sorted_samples[high] - sorted_samples[low]) * (rank - low)
+
+@dataclass
+class Measurement:
+    """Latency samples of one benchmark or endpoint"""
+    name: str
+    samples_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    # Wall time the samples were collected over; throughput is derived from it
+    elapsed_s: float = 0.0
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples_ms)
+        elapsed = self.elapsed_s or sum(ordered) / 1000
+        return {
+            "count": len(ordered),
+            "errors": self.errors,
+            "mean_ms": round(statistics.fmean(ordered), 6) if ordered else 0.0,
+            "p50_ms": round(percentile(ordered, 50), 6),
+            "p95_ms": round(percentile(ordered, 95), 6),
+            "p99_ms": round(percentile(ordered, 99), 6),
+            "throughput_per_s": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+        }
+
+def print_results(results: Dict[str, dict]) -> None:
+    print(f"   {'name':<28}{'count':>8}{'err':>6}{'p50 ms':>11}{'p95 ms':>11}"
+          f"{'p99 ms':>11}{'ops/s':>12}")
+    for name, row in results.items():
+        print(f"   {name:<28}{row['count']:>8}{row['errors']:>6}{row['p50_ms']:>11.3f}"
+              f"{row['p95_ms']:>11.3f}{row['p99_ms']:>11.3f}{row['throughput_per_s']:>12.1f}")
+
+def build_report(kind: str, results: Dict[str, dict], **meta) -> dict:
+    return {
+        "kind": kind,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        **meta,
+        "results": results,
+    }
+
+def write_report(path: Path, report: dict) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"💾 Results written to {path}")
+
+def compare(
+    baseline: dict,
+    current: dict,
+    tolerance: float,
+    metric: str = "p95_ms",
+    check_throughput: bool = True
+) -> List[str]:
+    """Regressions of ``current`` against ``baseline``, as printable lines
+
+    A benchmark regresses when its ``metric`` grows by more than
+    ``tolerance`` (0.25 = 25%) and NOISE_FLOOR_MS, when its throughput
+    drops by more than ``tolerance``, or when it starts reporting errors.
+    Benchmarks missing from either side are ignored.
+    Throughput is only meaningful for load runs, where it is measured over
+    wall time rather than derived from the latencies.
+    """
+    regressions = []
+    for name, base in baseline["results"].items():
+        row = current["results"].get(name)
+        if row is None:
+            continue
+        slower = row[metric] - base[metric]
+        if slower > NOISE_FLOOR_MS and row[metric] > base[metric] * (1 + tolerance):
+            regressions.append(
+                f"{name}: {metric} {base[metric]:.4f} -> {row[metric]:.4f} "
+                f"(+{(row[metric] / base[metric] - 1) * 100:.0f}%)"
+            )
+        base_rate, rate = base["throughput_per_s"], row["throughput_per_s"]
+        if check_throughput and base_rate and rate < base_rate / (1 + tolerance):
+            regressions.append(
+                f"{name}: throughput {base_rate:.1f}/s -> {rate:.1f}/s "
+                f"(-{(1 - rate / base_rate) * 100:.0f}%)"
+            )
+        if row["errors"] > base["errors"]:
+            regressions.append(f"{name}: errors {base['errors']} -> {row['errors']}")
+    return regressions
+
+def workload_mismatches(baseline: dict, current: dict, keys: Sequence[str]) -> List[str]:
+    """Workload settings that differ between two reports, as printable lines"""
+    return [
+        f"{key}: baseline {baseline.get(key)!r}, this run {current.get(key)!r}"
+        for key in keys
+        if baseline.get(key) != current.get(key)
+    ]
+
+def gate(
+    baseline_path: Path,
+    current: dict,
+    tolerance: float,
+    metric: str = "p95_ms",
+    check_throughput: bool = True,
+    workload: Sequence[str] = ()
+) -> int:
+    """Print the comparison with a baseline file; returns a process exit code
+
+    Exits 2 without comparing when any of the ``workload`` report fields
+    differs from the baseline's: latencies and throughput of a different
+    load say nothing about a regression.
+    """
+    if not baseline_path.exists():
+        print(f"⚠️  No baseline at {baseline_path}, nothing to compare")
+        return 0
+    baseline = json.loads(baseline_path.read_text())
+    mismatches = workload_mismatches(baseline, current, workload)
+    if mismatches:
+        print(f"❌ Not comparable with {baseline_path}, the workload differs:")
+        for line in mismatches:
+            print(f"   {line}")
+        print("   Rerun with the baseline's options, or store a new baseline")
+        return 2
+    regressions = compare(baseline, current, tolerance, metric, check_throughput)
+    if regressions:
+        print(f"❌ {len(regressions)} regressions against {baseline_path} "
+              f"(tolerance {tolerance:.0%}):")
+        for line in regressions:
+            print(f"   {line}")
+        return 1
+    print(f"✅ Within {tolerance:.0%} of {baseline_path}")
+    return 0
+
+def baseline_path(kind: str, path: Optional[str] = None) -> Path:
+    return Path(path) if path else BASELINE_DIR / f"{kind}.json"
@@ -0,0 +1,195 @@
+import asyncio
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select, text, func
+from sqlalchemy.dialects import postgresql
+from app.database import AsyncSessionLocal
+from app.models import (
+    Question, AnswerOption, SubTheme, UserResponse, ResponseAnswer,
+    question_tag_mapping, DifficultyLevel, QuestionType
+)
+from app.services.question_service import QuestionService, _QUESTION_COLUMNS
+from app.services.regrade_service import RegradeService
+
+INDEX_SCANS = ("Index Scan", "Index Only Scan", "Bitmap Index Scan")
+
+# A realistic spread (many categories, a bank of ~20k questions, answers
+# from a few hundred sessions) so the planner's choices match production.
+# Everything is rolled back at the end of the check.
+SYNTHETIC_DATA = [
+    "INSERT INTO categories (name, display_order) "
+    "SELECT 'plan-check ' || n, 1000 + n FROM generate_series(1, 20) n",
+    "INSERT INTO sub_themes (category_id, name, display_order) "
+    "SELECT c.id, c.name || ' / ' || n, n FROM categories c, generate_series(1, 5) n "
+    "WHERE c.name LIKE 'plan-check %'",
+    "INSERT INTO questions (sub_theme_id, difficulty_level, question_type, "
+    "question_text, rationale, is_active) "
+    "SELECT s.id, (enum_range(NULL::difficultylevel))[1 + n % 5], "
+    "(enum_range(NULL::questiontype))[1 + n % 2], 'plan check', 'plan check', n % 10 > 0 "
+    "FROM sub_themes s, generate_series(1, 200) n WHERE s.name LIKE 'plan-check %'",
+    "INSERT INTO answer_options (question_id, option_text, is_correct, display_order) "
+    "SELECT q.id, 'option', n = 1, n FROM questions q, generate_series(1, 4) n "
+    "WHERE q.question_text = 'plan check'",
+    "INSERT INTO question_tags (name) "
+    "SELECT 'plan-check ' || n FROM generate_series(1, 50) n",
+    "INSERT INTO question_tag_mapping (question_id, tag_id) "
+    "SELECT q.id, t.id FROM questions q JOIN question_tags t "
+    "ON t.name = 'plan-check ' || (1 + q.id % 50) WHERE q.question_text = 'plan check'",
+    "INSERT INTO users (username, email, password_hash, role, is_active) "
+    "VALUES ('plan-check', 'plan-check@example.invalid', '-', 'STUDENT', false)",
+    "INSERT INTO assessment_sessions (user_id, status, total_score, "
+    "total_possible_score, completion_percentage) "
+    "SELECT u.id, 'COMPLETED', 0, 0, 100 FROM users u, generate_series(1, 300) n "
+    "WHERE u.username = 'plan-check'",
+    "INSERT INTO user_responses (session_id, question_id, time_spent_seconds, "
+    "dont_know, score_earned) "
+    "SELECT s.id, q.id, 10, false, 0 FROM assessment_sessions s "
+    "JOIN users u ON u.id = s.user_id AND u.username = 'plan-check' "
+    "CROSS JOIN LATERAL (SELECT id FROM questions WHERE question_text = 'plan check' "
+    "ORDER BY (id * 7919 + s.id) % 20000 LIMIT 40) q",
+    "INSERT INTO response_answers (user_response_id, answer_option_id) "
+    "SELECT r.id, o.id FROM user_responses r "
+    "JOIN answer_options o ON o.question_id = r.question_id AND o.display_order = 1 "
+    "JOIN assessment_sessions s ON s.id = r.session_id "
+    "JOIN users u ON u.id = s.user_id AND u.username = 'plan-check'",
+    "ANALYZE categories, sub_themes, questions, answer_options, question_tags, "
+    "question_tag_mapping, assessment_sessions, user_responses, response_answers",
+]
+
+# Sample ids to plan with: the newest row of each table
+SAMPLE_IDS = {
+    "category": "SELECT max(id) FROM categories",
+    "sub_theme": "SELECT max(id) FROM sub_themes",
+    "question": "SELECT max(id) FROM questions",
+    "option": "SELECT max(id) FROM answer_options",
+    "tag": "SELECT max(id) FROM question_tags",
+    "session": "SELECT max(id) FROM assessment_sessions",
+    "response": "SELECT max(id) FROM user_responses",
+}
+
+def query_shapes(ids: dict):
+    """(description, statement, index the plan must use)"""
+    active_questions = QuestionService._apply_filters(
+        select(*_QUESTION_COLUMNS), ids["sub_theme"],
+        DifficultyLevel.NOVICE, QuestionType.SINGLE_CHOICE
+    ).order_by(Question.id).limit(100)
+
+    by_category = QuestionService._apply_filters(
+        select(*_QUESTION_COLUMNS)
+        .join(SubTheme, Question.sub_theme_id == SubTheme.id)
+        .where(SubTheme.category_id == ids["category"])
+        .order_by(Question.id)
+    )
+
+    catalog_counts = (
+        select(Question.sub_theme_id, Question.difficulty_level, func.count(Question.id))
+        .where(Question.is_active == True)
+        .group_by(Question.sub_theme_id, Question.difficulty_level)
+    )
+
+    question_ids = [ids["question"] - n for n in range(3)]
+    answer_keys = (
+        select(Question.id, AnswerOption.id, AnswerOption.is_correct)
+        .join(AnswerOption, AnswerOption.question_id == Question.id)
+        .where(Question.id.in_(question_ids))
+        .order_by(Question.id, AnswerOption.display_order, AnswerOption.id)
+    )
+
+    return [
+        ("question list filters", active_questions, "ix_questions_active_lookup"),
+        ("questions by category", by_category, "ix_questions_active_lookup"),
+        ("questions by category (sub-themes)", by_category, "ix_sub_themes_category_id"),
+        ("catalog question counts", catalog_counts, "ix_questions_active_lookup"),
+        ("sub-themes of a category",
+         select(SubTheme)
+         .where(SubTheme.category_id == ids["category"])
+         .order_by(SubTheme.display_order),
+         "ix_sub_themes_category_id"),
+        ("answer keys", answer_keys, "ix_answer_options_question_id"),
+        ("re-grade scan", RegradeService._responses_query(question_ids, 0),
+         "ix_user_responses_question_id"),
+        ("progress by session",
+         select(UserResponse.id).where(UserResponse.session_id.in_([ids["session"]])),
+         "unique_session_question"),
+        ("answers of responses",
+         select(ResponseAnswer.answer_option_id)
+         .where(ResponseAnswer.user_response_id.in_([ids["response"]])),
+         "unique_response_answer"),
+        ("answers referencing an option",
+         select(ResponseAnswer.id).where(ResponseAnswer.answer_option_id == ids["option"]),
+         "ix_response_answers_answer_option_id"),
+        ("questions of a tag",
+         select(question_tag_mapping.c.question_id)
+         .where(question_tag_mapping.c.tag_id == ids["tag"]),
+         "ix_question_tag_mapping_tag_id"),
+    ]
+
+def used_indexes(plan: dict) -> set:
+    found = set()
+    if plan.get("Node Type") in INDEX_SCANS:
+        found.add(plan["Index Name"])
+    for child in plan.get("Plans", ()):
+        found |= used_indexes(child)
+    return found
+
+async def check_query_plans(synthetic=False, verbose=False):
+    async with AsyncSessionLocal() as session:
+        if synthetic:
+            for statement in SYNTHETIC_DATA:
+                await session.execute(text(statement))
+        ids = {
+            name: (await session.execute(text(query))).scalar() or 1
+            for name, query in SAMPLE_IDS.items()
+        }
+
+        # Partition indexes are reported under their own names
+        parents = dict((await session.execute(text(
+            "SELECT c.relname, p.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "JOIN pg_class p ON p.oid = i.inhparent WHERE c.relkind = 'i'"
+        ))).all())
+
+        # With sequential scans disabled a plan only avoids indexes when
+        # none is usable, so small databases still exercise the check
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+
+        failures = 0
+        for description, statement, expected in query_shapes(ids):
+            sql = statement.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+            raw = (await session.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar()
+            plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]["Plan"]
+            indexes = {parents.get(name, name) for name in used_indexes(plan)}
+
+            if expected in indexes:
+                print(f"✅ {description}: {expected}")
+            else:
+                failures += 1
+                print(f"❌ {description}: expected {expected}, "
+                      f"got {', '.join(sorted(indexes)) or 'no index'}")
+            if verbose:
+                print(json.dumps(plan, indent=2))
+        await session.rollback()
+
+    if failures:
+        print(f"❌ {failures} query shapes do not use their index")
+        return 1
+    print("✅ All query shapes use their indexes")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN the service query shapes and check they use the expected indexes"
+    )
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Plan against a generated bank of ~20k questions "
+                             "(rolled back), e.g. on dev/CI databases")
+    parser.add_argument("--verbose", action="store_true", help="Print the plans")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(check_query_plans(args.synthetic, args.verbose)))
@@ -0,0 +1,71 @@
+import asyncio
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+from app.database import AsyncSessionLocal
+from app.models import User
+from app.core.audit import audit_writer
+from app.services.question_import import QuestionImporter, FORMATS
+
+async def import_questions(path, file_format=None, username=None,
+                           dry_run=False, skip_invalid=False):
+    started = time.perf_counter()
+    content = Path(path).read_bytes()
+    records = QuestionImporter.parse(
+        content, file_format or QuestionImporter.detect_format(path)
+    )
+    print(f"📄 Parsed {len(records)} records from {path}")
+
+    async with AsyncSessionLocal() as session:
+        created_by = None
+        if username:
+            result = await session.execute(select(User).where(User.username == username))
+            user = result.scalar_one_or_none()
+            if not user:
+                print(f"❌ User {username} not found")
+                return 1
+            created_by = user.id
+
+        result = await QuestionImporter.import_records(
+            session, records, created_by, dry_run=dry_run, skip_invalid=skip_invalid
+        )
+    # No background flusher in a CLI run
+    await audit_writer.flush()
+
+    for error in result.errors[:50]:
+        print(f"   - record {error.index}: {error.error}")
+    if len(result.errors) > 50:
+        print(f"   ... and {len(result.errors) - 50} more")
+
+    elapsed = time.perf_counter() - started
+    if dry_run:
+        print(f"🔍 Dry run: {result.received - len(result.errors)} valid, "
+              f"{len(result.errors)} invalid ({elapsed:.2f}s)")
+        return 1 if result.errors else 0
+    if result.errors and not skip_invalid:
+        print(f"❌ {len(result.errors)} invalid records, nothing imported "
+              f"(use --skip-invalid to import the rest)")
+        return 1
+    print(f"✅ Imported {result.imported} questions, created {result.tags_created} tags "
+          f"in {elapsed:.2f}s")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import questions from a file")
+    parser.add_argument("path", help="JSON, NDJSON, CSV or YAML file")
+    parser.add_argument("--format", choices=FORMATS, default=None,
+                        help="File format (inferred from the extension by default)")
+    parser.add_argument("--created-by", dest="username", default=None,
+                        help="Username recorded as the questions' author")
+    parser.add_argument("--dry-run", action="store_true", help="Only validate")
+    parser.add_argument("--skip-invalid", action="store_true",
+                        help="Import the valid records even if some are invalid")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(import_questions(
+        args.path, args.format, args.username, args.dry_run, args.skip_invalid
+    )))
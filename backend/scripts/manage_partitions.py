@@ -0,0 +1,59 @@
+import asyncio
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import AsyncSessionLocal
+from app.services.partition_service import (
+    PartitionService, PARTITIONED_TABLES, RETENTION_ACTIONS
+)
+
+async def list_partitions():
+    async with AsyncSessionLocal() as session:
+        for table in PARTITIONED_TABLES:
+            retention = PartitionService.retention_months(table)
+            print(f"📦 {table} (retention: "
+                  f"{f'{retention} months' if retention else 'forever'})")
+            expired = {
+                p.name for p in await PartitionService.expired_partitions(
+                    session, table, retention
+                )
+            }
+            for partition in await PartitionService.get_partitions(session, table):
+                bounds = ("default" if partition.is_default else
+                          f"{partition.start:%Y-%m-%d} → {partition.end:%Y-%m-%d}")
+                flag = "  ⏳ expired" if partition.name in expired else ""
+                print(f"   - {partition.name}: {bounds}, "
+                      f"~{partition.estimated_rows} rows{flag}")
+    return 0
+
+async def maintain_partitions(months_ahead=None, action=None):
+    async with AsyncSessionLocal() as session:
+        report = await PartitionService.maintain(session, months_ahead, action)
+
+    for table, changes in report.items():
+        for name in changes["created"]:
+            print(f"✅ Created {name}")
+        for name in changes["expired"]:
+            print(f"🗑️  Expired {name} ({action or 'configured action'})")
+        if not changes["created"] and not changes["expired"]:
+            print(f"✅ {table} partitions are up to date")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Create upcoming monthly partitions and expire old ones "
+                    "(run daily, e.g. from cron)"
+    )
+    parser.add_argument("--list", action="store_true",
+                        help="Only show partitions and which ones are expired")
+    parser.add_argument("--months-ahead", type=int, default=None,
+                        help="Months of partitions to keep ready (default from settings)")
+    parser.add_argument("--action", choices=RETENTION_ACTIONS, default=None,
+                        help="What to do with expired partitions (default from settings)")
+    args = parser.parse_args()
+    if args.list:
+        sys.exit(asyncio.run(list_partitions()))
+    sys.exit(asyncio.run(maintain_partitions(args.months_ahead, args.action)))
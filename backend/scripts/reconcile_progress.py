@@ -0,0 +1,44 @@
+import asyncio
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import AsyncSessionLocal
+from app.services.progress_service import ProgressAggregator
+
+async def reconcile_progress(session_ids=None, fix=False):
+    async with AsyncSessionLocal() as session:
+        mismatches = await ProgressAggregator.verify(session, session_ids)
+
+        if not mismatches:
+            print("✅ Progress tables match user_responses")
+            return 0
+
+        print(f"❌ Found {len(mismatches)} mismatching rows:")
+        for mismatch in mismatches[:50]:
+            print(f"   - {mismatch}")
+        if len(mismatches) > 50:
+            print(f"   ... and {len(mismatches) - 50} more")
+
+        if not fix:
+            print("Run with --fix to rebuild the affected sessions")
+            return 1
+
+        affected = sorted({mismatch["session_id"] for mismatch in mismatches})
+        await ProgressAggregator.rebuild(session, affected)
+        await session.commit()
+        print(f"✅ Rebuilt progress for {len(affected)} sessions")
+        return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Verify (and optionally rebuild) incremental progress aggregates"
+    )
+    parser.add_argument("--session", type=int, action="append", dest="session_ids",
+                        help="Only check this session id (repeatable)")
+    parser.add_argument("--fix", action="store_true",
+                        help="Rebuild mismatching sessions from user_responses")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(reconcile_progress(args.session_ids, args.fix)))
@@ -0,0 +1,56 @@
+import asyncio
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.database import AsyncSessionLocal
+from app.models import RegradeStatus
+from app.services.regrade_service import RegradeService
+
+def print_progress(job):
+    print(
+        f"   job {job.id}: {job.processed_responses}/{job.total_responses} "
+        f"responses ({job.progress_percentage}%), {job.changed_responses} changed"
+    )
+
+async def regrade(question_ids=None, job_ids=None, chunk_size=None):
+    async with AsyncSessionLocal() as session:
+        if question_ids:
+            job = await RegradeService.create_job(session, question_ids)
+            print(f"📝 Created regrade job {job.id} for questions {job.question_ids}")
+            job_ids = [job.id]
+        elif not job_ids:
+            job_ids = await RegradeService.get_resumable_job_ids(session)
+            if not job_ids:
+                print("✅ No regrade jobs to resume")
+                return 0
+
+    exit_code = 0
+    for job_id in job_ids:
+        print(f"🔄 Running regrade job {job_id}...")
+        job = await RegradeService.run_job(job_id, chunk_size, print_progress)
+        if job is None:
+            print(f"⏭️  Job {job_id} is completed or running elsewhere")
+        elif job.status == RegradeStatus.COMPLETED:
+            print(f"✅ Job {job_id} done: {job.changed_responses} scores changed, "
+                  f"{job.sessions_rebuilt} session rebuilds")
+        else:
+            print(f"❌ Job {job_id} failed: {job.error}")
+            exit_code = 1
+    return exit_code
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Re-grade stored responses after an answer key change. "
+                    "Without arguments, resumes pending, failed and stale jobs."
+    )
+    parser.add_argument("--question", type=int, action="append", dest="question_ids",
+                        help="Queue and run a new job for this question (repeatable)")
+    parser.add_argument("--job", type=int, action="append", dest="job_ids",
+                        help="Resume this job from its checkpoint (repeatable)")
+    parser.add_argument("--chunk-size", type=int, default=None,
+                        help="Responses per chunk (defaults to REGRADE_CHUNK_SIZE)")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(regrade(args.question_ids, args.job_ids, args.chunk_size)))
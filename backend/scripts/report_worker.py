@@ -0,0 +1,45 @@
+import asyncio
+import argparse
+import signal
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.config import get_settings
+from app.services.report_service import ReportWorker
+
+settings = get_settings()
+
+async def run_worker(concurrency, once=False):
+    worker = ReportWorker(concurrency, settings.report_poll_interval_seconds)
+
+    if once:
+        processed = await worker.drain()
+        print(f"✅ Built {processed} reports")
+        return 0
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    print(f"🔄 Report worker running with {concurrency} loops (Ctrl+C to stop)")
+    worker.start()
+    await stop.wait()
+    await worker.stop()
+    stats = worker.stats()
+    print(f"✅ Stopped after {stats['processed']} reports, {stats['errors']} errors")
+    return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build queued assessment reports. Several workers can run "
+                    "side by side; jobs are claimed with SKIP LOCKED."
+    )
+    parser.add_argument("--concurrency", type=int, default=settings.report_worker_concurrency,
+                        help="Reports built at once (defaults to REPORT_WORKER_CONCURRENCY)")
+    parser.add_argument("--once", action="store_true",
+                        help="Drain the queue and exit instead of polling")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run_worker(args.concurrency, args.once)))
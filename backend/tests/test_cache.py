@@ -0,0 +1,29 @@
+import asyncio
+from app.cache import Cache, MemoryBackend
+
+def test_delete_if_equals_only_deletes_own_value():
+    async def scenario():
+        backend = MemoryBackend()
+        await backend.set("lock", b"mine")
+        assert not await backend.delete_if_equals("lock", b"theirs")
+        assert await backend.get("lock") == b"mine"
+        assert await backend.delete_if_equals("lock", b"mine")
+        assert await backend.get("lock") is None
+    asyncio.run(scenario())
+
+def test_slow_loader_keeps_lock_taken_over_by_another_worker():
+    async def scenario():
+        backend = MemoryBackend()
+        cache = Cache(backend, "test", lock_timeout=0.05)
+        full_key = await cache.full_key("item")
+        lock_key = f"{full_key}:lock"
+
+        async def slow_loader():
+            # Our lock expires and another worker takes it meanwhile
+            await asyncio.sleep(0.1)
+            assert await backend.add(lock_key, b"other", 10)
+            return 42
+
+        assert await cache.get_or_set("item", slow_loader) == 42
+        assert await backend.get(lock_key) == b"other"
+    asyncio.run(scenario())
@@ -0,0 +1,53 @@
+import asyncio
+import time
+import uuid
+from app.cache import get_cache_backend
+from app.core.revocation import BloomFilter, TokenDenylist
+
+def make_denylist(prefix: str, **kwargs) -> TokenDenylist:
+    return TokenDenylist(prefix, capacity=1000, error_rate=0.001, sync_interval=1, **kwargs)
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, 0.01)
+    items = [f"jti:{i}" for i in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+
+def test_revocation_reaches_other_worker():
+    async def scenario():
+        prefix = f"test:{uuid.uuid4().hex}"
+        writer, reader = make_denylist(prefix), make_denylist(prefix)
+        await writer.revoke("fam:abc", time.time() + 60)
+        assert not await reader.is_revoked("fam:abc")
+        await reader.sync()
+        assert await reader.is_revoked("fam:abc")
+    asyncio.run(scenario())
+
+def test_sync_between_incr_and_log_write_keeps_entry_pending():
+    async def scenario():
+        prefix = f"test:{uuid.uuid4().hex}"
+        writer, reader = make_denylist(prefix), make_denylist(prefix)
+        backend = get_cache_backend()
+
+        # Replay revoke() step by step with a reader sync in the middle
+        await backend.add(writer._key("fam:abc"), b"1", 60)
+        seq = await backend.incr(writer._seq_key)
+        await reader.sync()
+        assert reader.stats()["pending_entries"] == 1
+
+        await backend.set(writer._log_key(seq), b"fam:abc", 60)
+        await reader.sync()
+        assert await reader.is_revoked("fam:abc")
+        assert reader.stats()["pending_entries"] == 0
+    asyncio.run(scenario())
+
+def test_missing_entry_is_dropped_after_grace_period():
+    async def scenario():
+        prefix = f"test:{uuid.uuid4().hex}"
+        reader = make_denylist(prefix, pending_grace=0)
+        await get_cache_backend().incr(f"{prefix}:seq")
+        await reader.sync()
+        await reader.sync()
+        assert reader.stats()["pending_entries"] == 0
+    asyncio.run(scenario())